@@ -1,21 +1,121 @@
 """
 CPU Scheduling Algorithms Package
-Contains implementations of FCFS, SJF, Priority, and Round Robin algorithms.
+Contains implementations of FCFS, SJF, Priority, Round Robin, MLFQ, CFS, EDF/RM, multi-core algorithms
+and a CPU/I-O burst simulator.
+Engines are imported lazily; see algorithms.registry for the algorithm catalogue.
 """
 
-from .models import Process
-from .fcfs import fcfs_scheduler
-from .sjf_non_preemptive import sjf_non_preemptive
-from .sjf_preemptive import sjf_preemptive
-from .priority import priority_scheduler
-from .round_robin import round_robin_scheduler
-from .priority_p import priority_preemptive
+import importlib
+
+# Public name -> defining module. Modules are imported on first attribute access (PEP 562),
+# so `import algorithms` does not load every engine.
+_EXPORTS = {
+    **dict.fromkeys(['Process', 'Workload', 'ScheduleResult', 'BurstSequences'], '.models'),
+    **dict.fromkeys(['Timeline', 'open_timeline'], '.timeline'),
+    **dict.fromkeys(['fcfs_scheduler', 'run_fcfs', 'run_fcfs_vectorized'], '.fcfs'),
+    **dict.fromkeys(['sjf_non_preemptive', 'run_sjf'], '.sjf_non_preemptive'),
+    **dict.fromkeys(['sjf_preemptive', 'run_srtf'], '.sjf_preemptive'),
+    **dict.fromkeys(['priority_scheduler', 'run_priority'], '.priority'),
+    **dict.fromkeys(['priority_preemptive', 'AgingPolicy', 'run_priority_preemptive'], '.priority_p'),
+    **dict.fromkeys(['round_robin_scheduler', 'round_robin_stats', 'RoundRobinStats', 'run_round_robin'],
+                    '.round_robin'),
+    **dict.fromkeys(['mlfq_scheduler', 'run_mlfq', 'MLFQStats'], '.mlfq'),
+    **dict.fromkeys(['cfs_scheduler', 'run_cfs', 'CFSStats'], '.cfs'),
+    **dict.fromkeys(['edf_scheduler', 'rate_monotonic_scheduler', 'run_edf', 'run_rate_monotonic', 'RealTimeStats',
+                     'schedulability', 'deadline_report', 'analyze'], '.realtime'),
+    **dict.fromkeys(['io_scheduler', 'run_io', 'IOStats', 'io_report'], '.iosim'),
+    **dict.fromkeys(['smp_scheduler', 'run_smp', 'SMPStats', 'CoreStats', 'LoadBalancer', 'WorkStealing',
+                     'PeriodicRebalance', 'Affinity'], '.smp'),
+    **dict.fromkeys(['OnlineScheduler', 'OnlineFCFS', 'OnlineSJF', 'OnlineSRTF', 'OnlinePriority',
+                     'OnlinePriorityPreemptive', 'OnlineRoundRobin'], '.online'),
+    **dict.fromkeys(['iter_csv_batches', 'load_csv_workload', 'load_burst_csv', 'WorkloadFormatError'], '.workload_io'),
+    **dict.fromkeys(['MetricsAggregator', 'QuantileSketch', 'RunningStat'], '.metrics'),
+    **dict.fromkeys(['run_replications', 'Distribution', 'parse_distribution'], '.montecarlo'),
+    **dict.fromkeys(['ResultCache'], '.cache'),
+    **dict.fromkeys(['Algorithm', 'Param', 'register'], '.registry'),
+}
 
 __all__ = [
     'Process',
+    'Workload',
+    'ScheduleResult',
+    'BurstSequences',
+    'Timeline',
+    'open_timeline',
     'fcfs_scheduler',
+    'run_fcfs',
+    'run_fcfs_vectorized',
     'sjf_non_preemptive',
+    'run_sjf',
     'sjf_preemptive',
+    'run_srtf',
     'priority_scheduler',
-    'round_robin_scheduler'
-]
\ No newline at end of file
+    'run_priority',
+    'priority_preemptive',
+    'AgingPolicy',
+    'run_priority_preemptive',
+    'round_robin_scheduler',
+    'round_robin_stats',
+    'RoundRobinStats',
+    'run_round_robin',
+    'mlfq_scheduler',
+    'run_mlfq',
+    'MLFQStats',
+    'cfs_scheduler',
+    'run_cfs',
+    'CFSStats',
+    'edf_scheduler',
+    'rate_monotonic_scheduler',
+    'run_edf',
+    'run_rate_monotonic',
+    'RealTimeStats',
+    'schedulability',
+    'deadline_report',
+    'analyze',
+    'io_scheduler',
+    'run_io',
+    'IOStats',
+    'io_report',
+    'smp_scheduler',
+    'run_smp',
+    'SMPStats',
+    'CoreStats',
+    'LoadBalancer',
+    'WorkStealing',
+    'PeriodicRebalance',
+    'Affinity',
+    'OnlineScheduler',
+    'OnlineFCFS',
+    'OnlineSJF',
+    'OnlineSRTF',
+    'OnlinePriority',
+    'OnlinePriorityPreemptive',
+    'OnlineRoundRobin',
+    'iter_csv_batches',
+    'load_csv_workload',
+    'load_burst_csv',
+    'WorkloadFormatError',
+    'MetricsAggregator',
+    'QuantileSketch',
+    'RunningStat',
+    'run_replications',
+    'Distribution',
+    'parse_distribution',
+    'ResultCache',
+    'Algorithm',
+    'Param',
+    'register'
+]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
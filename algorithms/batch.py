@@ -0,0 +1,214 @@
+# Batch runner: every workload file matched by a set of globs x an algorithm matrix.
+# A job is one file with every algorithm still to run on it, so each file is read once. Jobs are
+# submitted largest file first to a bounded process pool (a few jobs in flight per worker) and the
+# per-run metrics are streamed to one CSV or JSON Lines file as jobs finish. Every row is flushed
+# when written, so an interrupted batch is resumed by skipping the (file, algorithm) pairs already
+# in the output.
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import csv
+import glob
+import json
+import os
+import time
+from .compare import summarize, _run_cached
+from .cache import ResultCache
+from .metrics import DEFAULT_PERCENTILES
+from .workload_io import load_workload, is_burst_workload
+from . import registry
+
+# (spec text, algorithm name, engine parameters), e.g. ('RR q=2', 'RR', {'quantum': 2})
+BatchSpec = Tuple[str, str, Dict[str, Any]]
+
+# Output columns, in order
+FIELDS = (['file', 'algorithm', 'label', 'processes', 'avg_turnaround', 'avg_waiting', 'avg_response',
+           'max_turnaround', 'max_waiting']
+          + [f'p{p:g}_{name}' for name in ('turnaround', 'waiting') for p in DEFAULT_PERCENTILES]
+          + ['busy_time', 'makespan', 'idle_time', 'cpu_utilization', 'throughput', 'elapsed'])
+
+# Jobs kept in flight per worker; bounds the pending work without starving the pool
+JOBS_PER_WORKER = 2
+
+
+# Parse 'ALG key=value ...' with the registry; the spec text is normalized so resumed runs match
+def parse_spec(text: str) -> BatchSpec:
+    words = text.split()
+    if not words:
+        raise ValueError("Empty algorithm spec")
+    algorithm = registry.get(words[0].upper())
+    if not algorithm.cli:
+        raise ValueError(f"Unknown algorithm '{algorithm.name}'")
+    params = algorithm.parse_args(words[1:])
+    return ' '.join([algorithm.name] + words[1:]), algorithm.name, params
+
+
+# Every CLI algorithm with its default parameters (the registry example when some are required)
+def default_specs() -> List[BatchSpec]:
+    specs = []
+    for name in registry.names(cli_only=True):
+        try:
+            specs.append(parse_spec(name))
+        except ValueError:
+            specs.append(parse_spec(registry.get(name).example))
+    return specs
+
+
+# The specs that apply to a file: CPU/I-O burst workloads only run the algorithms the I/O simulator
+# has as CPU disciplines (the others would ignore the I/O bursts)
+def applicable_specs(path: str, specs: Sequence[BatchSpec]) -> List[BatchSpec]:
+    try:
+        bursts = is_burst_workload(path)
+    except (OSError, ValueError):
+        return list(specs)  # unreadable: the job reports the error
+    if not bursts:
+        return list(specs)
+    from .iosim import DISCIPLINES
+    return [spec for spec in specs if spec[1] in DISCIPLINES]
+
+
+# Files matched by the patterns (globs or plain paths, '**' allowed), each once, largest first
+def expand_inputs(patterns: Iterable[str]) -> List[str]:
+    paths = {}
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern, recursive=True)):
+            if os.path.isfile(path):
+                paths.setdefault(os.path.normpath(path), None)
+    return sorted(paths, key=lambda path: -os.path.getsize(path))
+
+
+# (file, algorithm spec) pairs already present in an earlier output file
+def completed_runs(output: str) -> Set[Tuple[str, str]]:
+    done = set()
+    if not os.path.exists(output):
+        return done
+    _truncate_partial_line(output)
+    with open(output, newline='') as file:
+        if _is_jsonl(output):
+            rows = (json.loads(line) for line in file if line.strip())
+        else:
+            rows = csv.DictReader(file)
+        for row in rows:
+            done.add((row['file'], row['algorithm']))
+    return done
+
+
+# Run the matrix and yield (file, rows, error) per file as soon as it finishes.
+# `done` pairs are skipped; with max_workers <= 1 (or a single CPU) everything runs in this process.
+def run_batch(paths: Sequence[str], specs: Sequence[BatchSpec], max_workers: Optional[int] = None,
+              cache: Optional[ResultCache] = None,
+              done: Iterable[Tuple[str, str]] = ()) -> Iterator[Tuple[str, List[Dict[str, Any]], Optional[str]]]:
+    done = set(done)
+    jobs = []
+    for path in expand_inputs(paths):
+        todo = [spec for spec in applicable_specs(path, specs) if (path, spec[0]) not in done]
+        if todo:
+            jobs.append((path, todo))
+
+    workers = max_workers or min(len(jobs), os.cpu_count() or 1)
+    if workers <= 1 or len(jobs) <= 1:
+        for path, todo in jobs:
+            yield _run_job(path, todo, cache)
+        return
+
+    pending = iter(jobs)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        running = set()
+        try:
+            while True:
+                for path, todo in pending:
+                    running.add(pool.submit(_run_job, path, todo, cache))
+                    if len(running) >= workers * JOBS_PER_WORKER:
+                        break
+                if not running:
+                    return
+                finished, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    yield future.result()
+        except BaseException:
+            # Interrupted: drop the queued jobs, the output already holds every finished one
+            for future in running:
+                future.cancel()
+            raise
+
+
+# Errors are reported per spec: a failing algorithm does not stop the others on the same file.
+# Specs that do not apply to a CPU/I-O burst file (see applicable_specs) are skipped, not failed.
+def _run_job(path: str, specs: Sequence[BatchSpec],
+             cache: Optional[ResultCache] = None) -> Tuple[str, List[Dict[str, Any]], Optional[str]]:
+    rows = []
+    try:
+        workload = load_workload(path)
+        workload.arrival_order()  # sorted once for every algorithm
+    except Exception as e:  # reported per file, the rest of the batch goes on
+        return path, rows, f"{type(e).__name__}: {e}"
+    if workload.io is not None:
+        from .iosim import DISCIPLINES
+        specs = [spec for spec in specs if spec[1] in DISCIPLINES]
+
+    errors = []
+    for spec, algorithm, params in specs:
+        try:
+            started = time.perf_counter()
+            result = _run_cached(workload, algorithm, params, cache)
+            label = registry.get(algorithm).describe(params)
+            if workload.io is not None:
+                label += " with I/O bursts"  # run_algorithm ran it on the I/O simulator
+            row = {'file': path, 'algorithm': spec, 'label': label}
+            row.update(summarize(result))
+            row['elapsed'] = time.perf_counter() - started
+            rows.append(row)
+        except Exception as e:
+            errors.append(f"{spec}: {type(e).__name__}: {e}")
+    return path, rows, '; '.join(errors) or None
+
+
+# Streams rows to a CSV or JSON Lines file (chosen by extension), flushing after every write
+class ResultSink:
+    def __init__(self, filename: str, append: bool = False):
+        self.filename = filename
+        self.jsonl = _is_jsonl(filename)
+        header = not (append and os.path.exists(filename) and os.path.getsize(filename) > 0)
+        self.file = open(filename, 'a' if append else 'w', newline='')
+        if not self.jsonl:
+            self.writer = csv.DictWriter(self.file, fieldnames=FIELDS, extrasaction='ignore')
+            if header:
+                self.writer.writeheader()
+
+    def write(self, rows: Iterable[Dict[str, Any]]):
+        for row in rows:
+            if self.jsonl:
+                self.file.write(json.dumps({name: row.get(name) for name in FIELDS}) + '\n')
+            else:
+                self.writer.writerow(row)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self) -> 'ResultSink':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _is_jsonl(filename: str) -> bool:
+    return filename.endswith(('.jsonl', '.ndjson'))
+
+
+# A batch killed mid-write can leave half a row at the end; cut the file back to the last newline
+def _truncate_partial_line(filename: str):
+    with open(filename, 'rb+') as file:
+        file.seek(0, 2)
+        size = file.tell()
+        if size == 0:
+            return
+        file.seek(max(0, size - 65536))
+        tail = file.read()
+        if tail.endswith(b'\n'):
+            return
+        cut = tail.rfind(b'\n')
+        if cut >= 0:
+            file.truncate(size - len(tail) + cut + 1)
+        elif len(tail) == size:
+            file.truncate(0)
@@ -0,0 +1,282 @@
+# Content-addressed on-disk cache of scheduler results.
+# The key hashes the workload columns, the algorithm name, its parameters and ENGINE_VERSION,
+# so a changed trace, parameter or engine never hits a stale entry. Entries are compact binary
+# files loaded with mmap as zero-copy columns; the directory is kept under max_bytes by evicting
+# the least recently used entries (access time is tracked through the file mtime).
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence, Tuple
+from array import array
+from collections.abc import Mapping
+import dataclasses
+import hashlib
+import importlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import weakref
+from .models import Workload, ScheduleResult
+
+# Bump whenever an engine change alters its output, so older entries stop matching
+ENGINE_VERSION = 1
+
+DEFAULT_MAX_BYTES = 1 << 30
+
+# Entry file: a 32-byte little-endian header, magic 'OSRC', version (u16), stats kind (u16),
+# count (u64), stats size (u64), then the start and completion columns as int64 and the stats blob.
+ENTRY_MAGIC = b'OSRC'
+ENTRY_VERSION = 2
+ENTRY_HEADER = struct.Struct('<4sHHQQ8x')
+ENTRY_SUFFIX = '.osrc'
+
+# Stats kinds. Round Robin blob: dispatches, context switches, number of pids, then the pids and
+# their dispatch counts as int64 columns. Counter blob: JSON of a plain stats dataclass.
+STATS_NONE = 0
+STATS_ROUND_ROBIN = 1
+STATS_COUNTERS = 2
+_RR_STATS = struct.Struct('<qqQ')
+# Counter stats class name -> defining module, imported only when an entry of that kind is read
+COUNTER_STATS = {'MLFQStats': '.mlfq', 'CFSStats': '.cfs', 'SMPStats': '.smp', 'RealTimeStats': '.realtime',
+                 'IOStats': '.iosim'}
+
+
+class ResultCache:
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._digests = weakref.WeakKeyDictionary()  # Workload -> content hash, computed once
+        os.makedirs(directory, exist_ok=True)
+
+    # The digest memo holds weak references, so only the settings travel to worker processes
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state['_digests']
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._digests = weakref.WeakKeyDictionary()
+
+    def key(self, workload: Workload, algorithm: str, params: Optional[Dict[str, Any]] = None) -> str:
+        digest = self._digests.get(workload)
+        if digest is None:
+            digest = self._digests[workload] = workload_digest(workload)
+        # Non-JSON parameters (e.g. an AgingPolicy) are keyed on their repr
+        spec = json.dumps([ENGINE_VERSION, algorithm, params or {}], sort_keys=True, default=repr)
+        return hashlib.sha256(spec.encode() + digest).hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def get(self, workload: Workload, algorithm: str,
+            params: Optional[Dict[str, Any]] = None) -> Optional[ScheduleResult]:
+        result = self.load(self.key(workload, algorithm, params), workload)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    # Results over another workload (EDF/RM expand periodic tasks into jobs) are not stored: load()
+    # only accepts entries with the input's rows, so such an entry would never be read
+    def put(self, workload: Workload, algorithm: str, params: Optional[Dict[str, Any]], result: ScheduleResult):
+        if len(result) == len(workload):
+            self.store(self.key(workload, algorithm, params), result)
+
+    # Cached result of (algorithm, params) on workload, or compute() stored for next time.
+    # `key` may be passed when it was already computed (e.g. by the parent of a worker process).
+    def run(self, workload: Workload, algorithm: str, params: Optional[Dict[str, Any]],
+            compute: Callable[[], ScheduleResult], key: Optional[str] = None) -> ScheduleResult:
+        key = key or self.key(workload, algorithm, params)
+        result = self.load(key, workload)
+        if result is not None:
+            self.hits += 1
+            return result
+        self.misses += 1
+        result = compute()
+        if len(result) == len(workload):  # see put()
+            self.store(key, result)
+        return result
+
+    # Map an entry into memory; None when it is missing, unreadable or does not match the workload
+    def load(self, key: str, workload: Workload) -> Optional[ScheduleResult]:
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as file:
+                header = file.read(ENTRY_HEADER.size)
+                if len(header) < ENTRY_HEADER.size:
+                    return None
+                magic, version, stats_kind, n, stats_size = ENTRY_HEADER.unpack(header)
+                if magic != ENTRY_MAGIC or version != ENTRY_VERSION or n != len(workload) or stats_kind > STATS_COUNTERS:
+                    return None
+                size = ENTRY_HEADER.size + 16 * n + stats_size
+                file.seek(0, 2)
+                if file.tell() != size:
+                    return None
+                buffer = mmap.mmap(file.fileno(), size, access=mmap.ACCESS_READ)
+            os.utime(path)  # most recently used
+        except (OSError, ValueError):
+            return None
+
+        view = memoryview(buffer)[ENTRY_HEADER.size:]
+        columns = view[:16 * n].cast('q')
+        start, completion = columns[:n], columns[n:]
+        if sys.byteorder != 'little':
+            start, completion = _swapped(start), _swapped(completion)
+        stats = _decode_stats(stats_kind, view[16 * n:])
+        return ScheduleResult(workload, start, completion, stats)
+
+    # Write an entry atomically, then evict old entries beyond max_bytes.
+    # Results with stats this cache cannot encode are not stored.
+    def store(self, key: str, result: ScheduleResult):
+        encoded = _encode_stats(result.stats)
+        if encoded is None:
+            return
+        stats_kind, stats = encoded
+        n = len(result)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(ENTRY_HEADER.pack(ENTRY_MAGIC, ENTRY_VERSION, stats_kind, n, len(stats)))
+                for column in (result.start, result.completion):
+                    file.write(_little_endian(column))
+                file.write(stats)
+            os.replace(tmp, self.path(key))
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        self.evict(keep=key)
+
+    # Remove least recently used entries until the directory fits in max_bytes
+    def evict(self, keep: Optional[str] = None):
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(ENTRY_SUFFIX):
+                    continue
+                try:
+                    info = entry.stat()
+                except OSError:
+                    continue  # removed by a concurrent writer
+                entries.append((info.st_mtime, entry.name, info.st_size))
+                total += info.st_size
+        entries.sort()
+        for _, name, size in entries:
+            if total <= self.max_bytes:
+                break
+            if keep is not None and name == keep + ENTRY_SUFFIX:
+                continue
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self):
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(ENTRY_SUFFIX):
+                    try:
+                        os.remove(entry.path)
+                    except OSError:
+                        pass
+
+
+# sha256 of the workload columns in little-endian int64; the real-time columns only when present,
+# so plain workloads keep their keys
+def workload_digest(workload: Workload) -> bytes:
+    h = hashlib.sha256(struct.pack('<Q', len(workload)))
+    for column in (workload.pids, workload.arrivals, workload.bursts, workload.priorities):
+        h.update(_little_endian(column))
+    for tag, column in ((b'deadline', workload.deadlines), (b'period', workload.periods)):
+        if column is not None:
+            h.update(tag)
+            h.update(_little_endian(column))
+    if workload.io is not None:
+        for tag, column in ((b'offsets', workload.io.offsets), (b'durations', workload.io.durations),
+                            (b'devices', workload.io.devices)):
+            h.update(tag)
+            h.update(_little_endian(column))
+    return h.digest()
+
+
+# Contiguous little-endian int64 bytes of a column (no copy when it already is one)
+def _little_endian(column) -> Any:
+    if isinstance(column, memoryview) and column.format == 'q' and column.c_contiguous:
+        data = column
+    elif isinstance(column, array) and column.typecode == 'q':
+        data = column
+    else:
+        data = array('q', column)  # strided views, other int types
+    if sys.byteorder != 'little':
+        data = array('q', data)
+        data.byteswap()
+    return data
+
+
+def _swapped(column) -> array:
+    column = array('q', column)
+    column.byteswap()
+    return column
+
+
+# (stats kind, blob), or None when the stats cannot be encoded
+def _encode_stats(stats: Any) -> Optional[Tuple[int, bytes]]:
+    if stats is None:
+        return STATS_NONE, b''
+    if _stats_class('RoundRobinStats', '.round_robin') is type(stats):
+        by_pid = stats.dispatches_by_pid
+        return STATS_ROUND_ROBIN, (_RR_STATS.pack(stats.dispatches, stats.context_switches, len(by_pid))
+                                   + bytes(_little_endian(array('q', by_pid.keys())))
+                                   + bytes(_little_endian(array('q', by_pid.values()))))
+    name = type(stats).__name__
+    if name in COUNTER_STATS and _stats_class(name, COUNTER_STATS[name]) is type(stats):
+        fields = dataclasses.asdict(stats)
+        return STATS_COUNTERS, json.dumps({'type': type(stats).__name__, 'fields': fields}).encode()
+    return None
+
+
+def _decode_stats(kind: int, blob: memoryview) -> Any:
+    if kind == STATS_ROUND_ROBIN:
+        dispatches, context_switches, m = _RR_STATS.unpack_from(blob)
+        columns = blob[_RR_STATS.size:_RR_STATS.size + 16 * m].cast('q')
+        if sys.byteorder != 'little':
+            columns = _swapped(columns)
+        return _stats_class('RoundRobinStats', '.round_robin')(dispatches, context_switches, _LazyCounts(columns[:m], columns[m:]))
+    if kind == STATS_COUNTERS:
+        data = json.loads(bytes(blob))
+        return _stats_class(data['type'], COUNTER_STATS[data['type']])(**data['fields'])
+    return None
+
+
+def _stats_class(name: str, module: str) -> type:
+    return getattr(importlib.import_module(module, __package__), name)
+
+
+# dispatches_by_pid of a cached run, over the mapped columns; the dict is only built when it is read
+class _LazyCounts(Mapping):
+    def __init__(self, pids: Sequence[int], counts: Sequence[int]):
+        self._pids = pids
+        self._counts = counts
+        self._data = None
+
+    def _dict(self) -> Dict[int, int]:
+        if self._data is None:
+            self._data = dict(zip(self._pids, self._counts))
+        return self._data
+
+    def __getitem__(self, pid: int) -> int:
+        return self._dict()[pid]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._dict())
+
+    def __len__(self) -> int:
+        return len(self._pids)
@@ -0,0 +1,167 @@
+# Completely Fair Scheduler (CFS) style policy.
+# Process.priority is used as the nice value (clamped to -20..19, lower = more CPU share) and
+# mapped to the Linux load weights. Runnable processes are ordered by virtual runtime, the
+# CPU time they received scaled by NICE_0_WEIGHT / weight; the one with the smallest vruntime
+# runs next. Slices share the scheduling period (target_latency, stretched to
+# nr_running * min_granularity when there are many processes) in proportion to the weights.
+# New processes start at the queue's min_vruntime and preempt the running process when it is
+# ahead of them by more than wakeup_granularity.
+#
+# The run queue is a binary heap keyed on (vruntime, arrival_time, pid) rather than the
+# kernel's red-black tree: queued vruntimes never change, so pick-next and insertion are
+# O(log n) with the standard library. The running process is kept out of the heap.
+# Event driven: time only advances to arrivals, slice ends and completions.
+from typing import List, Optional
+from array import array
+from dataclasses import dataclass
+from heapq import heappush, heappop, heappushpop
+from .models import (Process, Workload, ScheduleResult, DEFAULT_TARGET_LATENCY, DEFAULT_MIN_GRANULARITY,
+                     DEFAULT_WAKEUP_GRANULARITY)
+from .timeline import Timeline
+from .profiler import Profiler
+
+# Linux sched_prio_to_weight, nice -20 .. 19
+NICE_TO_WEIGHT = (
+    88761, 71755, 56483, 46273, 36291,
+    29154, 23254, 18705, 14949, 11916,
+    9548, 7620, 6100, 4904, 3906,
+    3121, 2501, 1991, 1586, 1277,
+    1024, 820, 655, 526, 423,
+    335, 272, 215, 172, 137,
+    110, 87, 70, 56, 45,
+    36, 29, 23, 18, 15,
+)
+NICE_0_WEIGHT = 1024
+
+# vruntime is kept as an integer in units of 1/VRUNTIME_SCALE time units
+VRUNTIME_SCALE = 1 << 16
+
+
+def nice_to_weight(priority: int) -> int:
+    return NICE_TO_WEIGHT[max(-20, min(19, priority)) + 20]
+
+
+# Dispatch accounting for a CFS run
+@dataclass
+class CFSStats:
+    dispatches: int = 0
+    context_switches: int = 0
+    preemptions: int = 0  # running process preempted by an arrival
+
+
+def cfs_scheduler(processes: List[Process], target_latency: int = DEFAULT_TARGET_LATENCY,
+                  min_granularity: int = DEFAULT_MIN_GRANULARITY,
+                  wakeup_granularity: int = DEFAULT_WAKEUP_GRANULARITY,
+                  timeline: Optional[Timeline] = None) -> List[Process]:
+    return run_cfs(Workload.from_processes(processes), target_latency, min_granularity,
+                   wakeup_granularity, timeline).processes()
+
+
+# The returned ScheduleResult carries a CFSStats in `stats`
+def run_cfs(workload: Workload, target_latency: int = DEFAULT_TARGET_LATENCY,
+            min_granularity: int = DEFAULT_MIN_GRANULARITY,
+            wakeup_granularity: int = DEFAULT_WAKEUP_GRANULARITY,
+            timeline: Optional[Timeline] = None, profiler: Optional[Profiler] = None) -> ScheduleResult:
+    if target_latency <= 0 or min_granularity <= 0:
+        raise ValueError("Target latency and minimum granularity must be positive")
+    if wakeup_granularity < 0:
+        raise ValueError("Wakeup granularity cannot be negative")
+    n = len(workload)
+    pids, arrivals = workload.pids, workload.arrivals
+    remaining = list(workload.bursts)
+    weights = [nice_to_weight(p) for p in workload.priorities]
+    # vruntime per unit of CPU time, precomputed like the kernel's inverse weights
+    inverse = {w: NICE_0_WEIGHT * VRUNTIME_SCALE // w for w in set(weights)}
+    vdelta = [inverse[w] for w in weights]
+    vruntime = [0] * n
+    start = array('q', [-1]) * n
+    completion = array('q', [0]) * n
+    stats = CFSStats()
+    # Above this many runnable processes the period grows to nr_running * min_granularity
+    latency_processes = max(1, target_latency // min_granularity)
+
+    ready = []  # (vruntime, arrival_time, pid, index)
+    total_weight = 0  # weights of every runnable process, running one included
+    min_vruntime = 0
+    running = -1  # -1 when idle, -2 while `requeued` waits to go back to the queue
+    requeued = None
+    slice_end = 0
+    last_pid = None
+
+    order = workload.arrival_order()
+    next_arrival = 0
+    current_time = 0
+    completed_count = 0
+
+    while completed_count < n:
+        # Admit arrivals at min_vruntime; one far enough behind the running process preempts it
+        while next_arrival < n and arrivals[order[next_arrival]] <= current_time:
+            i = order[next_arrival]
+            next_arrival += 1
+            vruntime[i] = min_vruntime
+            heappush(ready, (min_vruntime, arrivals[i], pids[i], i))
+            total_weight += weights[i]
+            if running >= 0:
+                if vruntime[running] - min_vruntime > wakeup_granularity * vdelta[i]:
+                    heappush(ready, (vruntime[running], arrivals[running], pids[running], running))
+                    if profiler is not None:
+                        profiler.stop(pids[running])
+                    running = -1
+                    stats.preemptions += 1
+
+        if running < 0:
+            # CPU idle, jump straight to the next arrival
+            if running == -1 and not ready:
+                current_time = arrivals[order[next_arrival]]
+                if profiler is not None:
+                    profiler.idle_jumps += 1
+                continue
+
+            # Pick next: smallest vruntime (a process whose slice just ended competes in the same step)
+            if running == -1:
+                running = heappop(ready)[3]
+            else:
+                running = heappushpop(ready, requeued)[3]
+            min_vruntime = max(min_vruntime, min(vruntime[running], ready[0][0]) if ready else vruntime[running])
+            pid = pids[running]
+            if profiler is not None:
+                profiler.dispatch(pid, current_time, len(ready))
+            stats.dispatches += 1
+            if last_pid is not None and last_pid != pid:
+                stats.context_switches += 1
+            last_pid = pid
+            if start[running] == -1:
+                start[running] = current_time
+
+            # Weighted share of the scheduling period
+            nr_running = len(ready) + 1
+            period = target_latency if nr_running <= latency_processes else nr_running * min_granularity
+            time_slice = max(min_granularity, period * weights[running] // total_weight)
+            slice_end = current_time + min(time_slice, remaining[running])
+
+        # Run until the slice ends or the next arrival, whichever comes first
+        event = slice_end
+        if next_arrival < n and arrivals[order[next_arrival]] < event:
+            event = arrivals[order[next_arrival]]
+        ran = event - current_time
+        i = running
+        remaining[i] -= ran
+        vruntime[i] += ran * vdelta[i]
+        if timeline is not None:
+            timeline.add(pids[i], current_time, event)
+        current_time = event
+        min_vruntime = max(min_vruntime, min(vruntime[i], ready[0][0]) if ready else vruntime[i])
+
+        if remaining[i] == 0:
+            completion[i] = current_time
+            completed_count += 1
+            total_weight -= weights[i]
+            running = -1
+        elif current_time == slice_end:
+            # Slice used up: back to the queue, pick next decides who runs
+            requeued = (vruntime[i], arrivals[i], pids[i], i)
+            running = -2
+            if profiler is not None:
+                profiler.stop(pids[i])
+
+    return ScheduleResult(workload, start, completion, stats)
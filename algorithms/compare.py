@@ -0,0 +1,271 @@
+# In-process comparison runner: load a workload once, share it with worker
+# processes through shared memory and run every algorithm in parallel.
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Any, Callable
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import os
+import re
+import time
+from .models import Workload, ScheduleResult, BurstSequences, DEFAULT_QUANTA
+from .metrics import MetricsAggregator, DEFAULT_PERCENTILES
+from .cache import ResultCache
+from .registry import Engines
+from .export import export_result, EXTENSIONS
+from . import registry
+
+# Columnar engine per algorithm name (registry.names()), imported on first use
+ENGINES: Mapping[str, Callable[..., ScheduleResult]] = Engines()
+
+# (algorithm name, keyword parameters), e.g. ('RR', {'quantum': 2})
+AlgorithmSpec = Tuple[str, Dict[str, Any]]
+
+
+# Workloads with CPU/I-O burst sequences run on the I/O simulator with the algorithm as the CPU
+# discipline (as scheduler.py does); the other engines would ignore the I/O bursts, so they raise
+def run_algorithm(workload: Workload, algorithm: str, params: Optional[Dict[str, Any]] = None) -> ScheduleResult:
+    if algorithm not in ENGINES:
+        raise ValueError(f"Unknown algorithm '{algorithm}'")
+    if workload.io is not None and algorithm != 'IO':
+        from .iosim import DISCIPLINES
+        if algorithm not in DISCIPLINES:
+            raise ValueError(f"{algorithm} cannot run CPU/I-O burst workloads, use one of {', '.join(DISCIPLINES)}")
+        return ENGINES['IO'](workload, algorithm, params)
+    return ENGINES[algorithm](workload, **(params or {}))
+
+
+# `io`: the run was on CPU/I-O burst sequences (see run_algorithm)
+def algorithm_label(algorithm: str, params: Optional[Dict[str, Any]] = None, io: bool = False) -> str:
+    if io and algorithm != 'IO':
+        return algorithm_label(algorithm, params) + ' + I/O'
+    if algorithm == 'RR' and params and 'quantum' in params:
+        return f"RR (q={params['quantum']})"
+    if algorithm == 'SMP' and params:
+        inner = algorithm_label(params.get('policy', 'FCFS'), params.get('params'))
+        return f"{inner} x{params.get('cores', 4)} ({params.get('balancer', 'steal')})"
+    if algorithm == 'IO' and params:
+        return algorithm_label(params.get('policy', 'FCFS'), params.get('params')) + ' + I/O'
+    if algorithm == 'MLFQ' and params:
+        label = 'q=' + ','.join(str(q) for q in params.get('quanta', DEFAULT_QUANTA))
+        if params.get('boost_interval'):
+            label += f", boost={params['boost_interval']}"
+        return f"MLFQ ({label})"
+    if params:
+        return algorithm + ' (' + ', '.join(f'{k}={v}' for k, v in params.items()) + ')'
+    return algorithm
+
+
+# Metrics of a run, as returned by the comparison API: averages, percentiles, maxima,
+# CPU utilization, throughput and idle time, computed in one pass over the result columns.
+# Utilization and idle time are over `cpus` CPUs, by default the cores of a multi-core run.
+def summarize(result: ScheduleResult, percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+              by_priority: bool = False, cpus: Optional[int] = None) -> Dict[str, Any]:
+    if cpus is None:
+        cpus = len(getattr(result.stats, 'cores', None) or ()) or 1
+    return MetricsAggregator(percentiles, by_priority, cpus=cpus).add_result(result).summary()
+
+
+# Results file name of one run, e.g. output_rr_quantum-2.csv for ('RR', {'quantum': 2})
+def output_filename(algorithm: str, params: Optional[Dict[str, Any]] = None, format: str = 'csv') -> str:
+    stem = os.path.splitext(registry.get(algorithm).output_file or f"output_{algorithm.lower()}.csv")[0]
+    for key, value in sorted((params or {}).items()):
+        if value is None:
+            continue
+        text = ','.join(map(str, value)) if isinstance(value, (tuple, list)) else str(value)
+        stem += '_' + key + '-' + re.sub(r'[^\w.,=-]+', '', text)
+    return stem + EXTENSIONS[format]
+
+
+# Workload copied once into a shared memory block; workers attach to it without copying.
+# Use as a context manager so the block is unlinked when the comparison is done.
+class SharedWorkload:
+    COLUMNS = 5  # pids, arrivals, bursts, priorities, arrival order
+    REALTIME_COLUMNS = 2  # deadlines, periods, after the others when the workload has them
+    # Burst sequences come last: offsets (n + 1), durations and devices (one entry per burst each)
+
+    def __init__(self, workload: Workload):
+        n = len(workload)
+        self.n = n
+        self.realtime = workload.realtime
+        self.bursts = len(workload.io.durations) if workload.io is not None else -1
+        width = self.COLUMNS + (self.REALTIME_COLUMNS if self.realtime else 0)
+        size = 8 * width * n + (8 * (n + 1 + 2 * self.bursts) if self.bursts >= 0 else 0)
+        self.shm = shared_memory.SharedMemory(create=True, size=max(8, size))
+        view = self.shm.buf.cast('q')
+        columns = (workload.pids, workload.arrivals, workload.bursts, workload.priorities)
+        for c, column in enumerate(columns):
+            view[c * n:(c + 1) * n] = _as_int64(column)
+        view[4 * n:5 * n] = _as_int64(workload.arrival_order())
+        if self.realtime:
+            zeros = array('q', bytes(8 * n))
+            view[5 * n:6 * n] = _as_int64(workload.deadlines if workload.deadlines is not None else zeros)
+            view[6 * n:7 * n] = _as_int64(workload.periods if workload.periods is not None else zeros)
+        if self.bursts >= 0:
+            base, m = width * n, self.bursts
+            view[base:base + n + 1] = _as_int64(workload.io.offsets)
+            view[base + n + 1:base + n + 1 + m] = _as_int64(workload.io.durations)
+            view[base + n + 1 + m:base + n + 1 + 2 * m] = _as_int64(workload.io.devices)
+        view.release()
+
+    # Picklable reference passed to the workers; the burst count is -1 without burst sequences
+    @property
+    def handle(self) -> Tuple[str, int, bool, int]:
+        return self.shm.name, self.n, self.realtime, self.bursts
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self) -> 'SharedWorkload':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Attach to a SharedWorkload from a worker; returns the Workload and the block to close afterwards
+def attach_workload(handle: Tuple[str, int, bool, int]) -> Tuple[Workload, shared_memory.SharedMemory]:
+    name, n, realtime, m = handle
+    try:
+        shm = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13 has no track argument
+        shm = shared_memory.SharedMemory(name=name)
+    view = shm.buf.cast('q')
+    extra = {'deadlines': view[5 * n:6 * n], 'periods': view[6 * n:7 * n]} if realtime else {}
+    if m >= 0:
+        base = (SharedWorkload.COLUMNS + (SharedWorkload.REALTIME_COLUMNS if realtime else 0)) * n
+        extra['io'] = BurstSequences(view[base:base + n + 1], view[base + n + 1:base + n + 1 + m],
+                                     view[base + n + 1 + m:base + n + 1 + 2 * m])
+    workload = Workload(view[0:n], view[n:2 * n], view[2 * n:3 * n], view[3 * n:4 * n],
+                        arrival_order=view[4 * n:5 * n], **extra)
+    return workload, shm
+
+
+def _run_shared(handle: Tuple[str, int, bool, int], algorithm: str, params: Dict[str, Any],
+                cache: Optional[ResultCache] = None, key: Optional[str] = None,
+                output: Optional[Tuple[str, str]] = None) -> Dict[str, Any]:
+    workload, shm = attach_workload(handle)
+    try:
+        return _run_and_summarize(workload, algorithm, params, cache, key, output)
+    finally:
+        # Drop every view before closing, the block cannot close while buffers are exported
+        del workload
+        try:
+            shm.close()
+        except BufferError:
+            pass
+
+
+# Run through the cache when one is given; `key` saves hashing the workload again in a worker
+def _run_cached(workload: Workload, algorithm: str, params: Dict[str, Any],
+                cache: Optional[ResultCache] = None, key: Optional[str] = None) -> ScheduleResult:
+    if cache is None:
+        return run_algorithm(workload, algorithm, params)
+    return cache.run(workload, algorithm, params, lambda: run_algorithm(workload, algorithm, params), key)
+
+
+# `output` is an (output directory, format) pair to also export the result there
+def _run_and_summarize(workload: Workload, algorithm: str, params: Dict[str, Any],
+                       cache: Optional[ResultCache] = None, key: Optional[str] = None,
+                       output: Optional[Tuple[str, str]] = None) -> Dict[str, Any]:
+    started = time.perf_counter()
+    result = _run_cached(workload, algorithm, params, cache, key)
+    metrics = summarize(result)
+    if output is not None:
+        directory, format = output
+        metrics['output_file'] = os.path.join(directory, output_filename(algorithm, params, format))
+        export_result(result, metrics['output_file'], format, registry.get(algorithm).has_priority)
+    metrics['algorithm'] = algorithm_label(algorithm, params, workload.io is not None)
+    metrics['elapsed'] = time.perf_counter() - started
+    return metrics
+
+
+# Run every (algorithm, params) spec on the same workload and return their metrics in spec order.
+# With a single worker (or a single CPU) everything runs in this process; otherwise the specs are fanned out over a
+# process pool sharing the workload through shared memory. With a ResultCache, cached runs are not repeated.
+# With output_dir, every run's results are also written there (see output_filename) in output_format.
+def compare_algorithms(workload: Workload, specs: Sequence[AlgorithmSpec], max_workers: Optional[int] = None,
+                       cache: Optional[ResultCache] = None, output_dir: Optional[str] = None,
+                       output_format: str = 'csv') -> List[Dict[str, Any]]:
+    specs = [(algorithm, dict(params or {})) for algorithm, params in specs]
+    for algorithm, _ in specs:
+        if algorithm not in ENGINES:
+            raise ValueError(f"Unknown algorithm '{algorithm}'")
+    output = None
+    if output_dir is not None:
+        if output_format not in EXTENSIONS:
+            raise ValueError(f"Unknown output format '{output_format}'")
+        os.makedirs(output_dir, exist_ok=True)
+        output = (output_dir, output_format)
+
+    workers = max_workers or min(len(specs), os.cpu_count() or 1)
+    if workers <= 1 or len(specs) <= 1:
+        return [_run_and_summarize(workload, algorithm, params, cache, None, output) for algorithm, params in specs]
+
+    keys = [cache.key(workload, algorithm, params) if cache else None for algorithm, params in specs]
+    with SharedWorkload(workload) as shared:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_run_shared, shared.handle, algorithm, params, cache, key, output)
+                       for (algorithm, params), key in zip(specs, keys)]
+            return [future.result() for future in futures]
+
+
+def _as_int64(column: Sequence[int]) -> Sequence[int]:
+    if isinstance(column, memoryview) and column.format == 'q':
+        return column
+    if isinstance(column, array) and column.typecode == 'q':
+        return column
+    return array('q', column)
+
+
+# Evaluate Round Robin for every quantum in `quanta` (a list or range) in one call.
+# The workload and its arrival order are shared once and the quanta are split across workers.
+# Returns one row per quantum with average and percentile turnaround/waiting times.
+def sweep_round_robin(workload: Workload, quanta: Sequence[int], percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+                      max_workers: Optional[int] = None, cache: Optional[ResultCache] = None) -> List[Dict[str, Any]]:
+    quanta = list(quanta)
+    if any(q <= 0 for q in quanta):
+        raise ValueError("Quantum must be positive")
+    if workload.io is not None:
+        raise ValueError("The quantum sweep reports Round Robin context switches, which the I/O simulator does not count")
+    workload.arrival_order()  # sorted once, reused by every quantum
+
+    workers = max_workers or min(len(quanta), os.cpu_count() or 1)
+    if workers <= 1 or len(quanta) <= 1:
+        return [_sweep_row(workload, q, percentiles, cache) for q in quanta]
+
+    # Interleaved slices of (quantum, cache key), a few per worker, so the slow small quanta are spread out
+    keyed = [(q, cache.key(workload, 'RR', {'quantum': q}) if cache else None) for q in quanta]
+    chunks = [keyed[i::workers * 4] for i in range(min(len(quanta), workers * 4))]
+    rows = {}
+    with SharedWorkload(workload) as shared:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_sweep_shared, shared.handle, chunk, tuple(percentiles), cache)
+                       for chunk in chunks]
+            for future in futures:
+                for row in future.result():
+                    rows[row['quantum']] = row
+    return [rows[q] for q in quanta]
+
+
+def _sweep_shared(handle: Tuple[str, int, bool, int], keyed: List[Tuple[int, Optional[str]]], percentiles: Tuple[float, ...],
+                  cache: Optional[ResultCache] = None) -> List[Dict[str, Any]]:
+    workload, shm = attach_workload(handle)
+    try:
+        return [_sweep_row(workload, q, percentiles, cache, key) for q, key in keyed]
+    finally:
+        del workload
+        try:
+            shm.close()
+        except BufferError:
+            pass
+
+
+def _sweep_row(workload: Workload, quantum: int, percentiles: Sequence[float],
+               cache: Optional[ResultCache] = None, key: Optional[str] = None) -> Dict[str, Any]:
+    result = _run_cached(workload, 'RR', {'quantum': quantum}, cache, key)
+    row = {'quantum': quantum}
+    row.update(summarize(result, percentiles))
+    row['dispatches'] = result.stats.dispatches
+    row['context_switches'] = result.stats.context_switches
+    return row
@@ -0,0 +1,164 @@
+# Result export: CSV, JSON Lines and a compact binary format, written straight from the result columns.
+# Rows are in pid order and formatted a chunk at a time (one %-format per row, one join and one
+# buffered write per CHUNK_ROWS) instead of one DictWriter call per process.
+# The pid order itself avoids a comparison sort for the usual traces: already sorted pids are
+# written as they are and a dense pid range (a permutation of low..low+n-1) is placed in O(n).
+from typing import Dict, List, Optional, Sequence, Tuple
+from array import array
+from itertools import islice
+from operator import itemgetter, le
+import mmap
+import os
+import struct
+import sys
+from .models import Workload, ScheduleResult
+
+CHUNK_ROWS = 1 << 16
+BUFFER_SIZE = 1 << 20
+
+FORMATS = ('csv', 'jsonl', 'binary')
+EXTENSIONS = {'csv': '.csv', 'jsonl': '.jsonl', 'binary': '.bin'}
+
+# Binary results: a 32-byte little-endian header, magic 'OSRR', version (u16), flags (u16),
+# record size (u32), count (u64), then one record of int64 fields per process, in pid order:
+# pid, arrival_time, burst_time, priority, start_time, completion_time
+# (version 1 files had a 28-byte header, which left the records misaligned for the int64 view)
+RESULT_MAGIC = b'OSRR'
+RESULT_VERSION = 2
+RESULT_HEADER = struct.Struct('<4sHHIQ12x')
+assert RESULT_HEADER.size == 32
+RESULT_FIELDS = ('pid', 'arrival_time', 'burst_time', 'priority', 'start_time', 'completion_time')
+RESULT_RECORD_SIZE = 8 * len(RESULT_FIELDS)
+FLAG_PID_SORTED = 1
+
+
+# Format from the file extension: .jsonl/.ndjson, .bin, anything else is CSV
+def format_for(filename: str) -> str:
+    extension = os.path.splitext(filename)[1].lower()
+    if extension in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    if extension == '.bin':
+        return 'binary'
+    return 'csv'
+
+
+# Write a result to `filename` in pid order and return the number of rows.
+# The text formats carry the same columns as the console table (priority only when has_priority).
+def export_result(result: ScheduleResult, filename: str, format: Optional[str] = None,
+                  has_priority: bool = False) -> int:
+    format = format or format_for(filename)
+    if format not in FORMATS:
+        raise ValueError(f"Unknown output format '{format}', expected one of {', '.join(FORMATS)}")
+    order = pid_order(result.workload)
+    if format == 'binary':
+        _write_binary(result, filename, order)
+    else:
+        _write_text(result, filename, order, format, has_priority)
+    return len(result)
+
+
+# Indices sorted by pid (equal pids keep index order), without a comparison sort when the pids are
+# already sorted or a permutation of a dense range
+def pid_order(workload: Workload) -> Sequence[int]:
+    pids = workload.pids
+    n = len(pids)
+    if all(map(le, pids, islice(pids, 1, None))):
+        return range(n)
+    low = min(pids)
+    if max(pids) - low == n - 1:
+        order = [-1] * n
+        for i, pid in enumerate(pids):
+            if order[pid - low] != -1:
+                break  # repeated pid, not a permutation
+            order[pid - low] = i
+        else:
+            return order
+    return sorted(range(n), key=pids.__getitem__)
+
+
+def _text_columns(result: ScheduleResult, has_priority: bool) -> List[Tuple[str, Sequence[int]]]:
+    workload = result.workload
+    columns = [('pid', workload.pids), ('arrival_time', workload.arrivals), ('burst_time', workload.bursts)]
+    if has_priority:
+        columns.append(('priority', workload.priorities))
+    columns += [('completion_time', result.completion), ('turnaround_time', result.turnaround),
+                ('waiting_time', result.waiting)]
+    return columns
+
+
+def _write_text(result: ScheduleResult, filename: str, order: Sequence[int], format: str, has_priority: bool):
+    columns = _text_columns(result, has_priority)
+    names = [name for name, _ in columns]
+    if format == 'csv':
+        header = ','.join(names) + '\n'
+        row = ','.join(['%d'] * len(names)) + '\n'
+    else:
+        header = ''
+        row = '{' + ', '.join(f'"{name}": %d' for name in names) + '}\n'
+    values = [column for _, column in columns]
+
+    with open(filename, 'w', buffering=BUFFER_SIZE) as file:
+        file.write(header)
+        for chunk in _chunks(values, order):
+            file.write(''.join([row % fields for fields in zip(*chunk)]))
+
+
+# The columns CHUNK_ROWS rows at a time, in `order`: slices when the order is the index order,
+# otherwise one C-level itemgetter per column
+def _chunks(columns: Sequence[Sequence[int]], order: Sequence[int]):
+    n = len(order)
+    for low in range(0, n, CHUNK_ROWS):
+        high = min(n, low + CHUNK_ROWS)
+        if isinstance(order, range):
+            yield [column[low:high] for column in columns]
+        elif high - low == 1:
+            yield [(column[order[low]],) for column in columns]
+        else:
+            getter = itemgetter(*order[low:high])
+            yield [getter(column) for column in columns]
+
+
+def _write_binary(result: ScheduleResult, filename: str, order: Sequence[int]):
+    workload = result.workload
+    n = len(result)
+    columns = (workload.pids, workload.arrivals, workload.bursts, workload.priorities, result.start, result.completion)
+    fields = len(RESULT_FIELDS)
+    records = array('q', bytes(RESULT_RECORD_SIZE * n))
+    getter = None if isinstance(order, range) else itemgetter(*order)  # order is not a range below 2 rows
+    for field, column in enumerate(columns):
+        records[field::fields] = array('q', column if getter is None else getter(column))
+    if sys.byteorder != 'little':
+        records.byteswap()
+    with open(filename, 'wb') as file:
+        file.write(RESULT_HEADER.pack(RESULT_MAGIC, RESULT_VERSION, FLAG_PID_SORTED, RESULT_RECORD_SIZE, n))
+        records.tofile(file)
+
+
+# Map a binary result file back into a ScheduleResult; the columns are strided int64 views over the mapping
+def load_binary_result(filename: str) -> ScheduleResult:
+    with open(filename, 'rb') as file:
+        header = file.read(RESULT_HEADER.size)
+        if len(header) < RESULT_HEADER.size:
+            raise ValueError(f"{filename}: truncated binary result header")
+        magic, version, flags, record_size, n = RESULT_HEADER.unpack(header)
+        if magic != RESULT_MAGIC:
+            raise ValueError(f"{filename}: not a binary result file")
+        if version != RESULT_VERSION or record_size != RESULT_RECORD_SIZE:
+            raise ValueError(f"{filename}: unsupported binary result version {version}")
+        size = RESULT_HEADER.size + n * RESULT_RECORD_SIZE
+        file.seek(0, 2)
+        if file.tell() < size:
+            raise ValueError(f"{filename}: truncated file, expected {n} records")
+        if n == 0:
+            empty = array('q')
+            return ScheduleResult(Workload(empty, empty, empty), empty, empty)
+        buffer = mmap.mmap(file.fileno(), size, access=mmap.ACCESS_READ)
+
+    records = memoryview(buffer)[RESULT_HEADER.size:].cast('q')
+    if sys.byteorder != 'little':
+        records = array('q', records)
+        records.byteswap()
+    fields = len(RESULT_FIELDS)
+    columns: Dict[str, Sequence[int]] = {name: records[k::fields] for k, name in enumerate(RESULT_FIELDS)}
+    workload = Workload(columns['pid'], columns['arrival_time'], columns['burst_time'], columns['priority'])
+    return ScheduleResult(workload, columns['start_time'], columns['completion_time'])
@@ -1,26 +1,93 @@
 # First Come First Serve (FCFS) scheduling algorithm.
-from typing import List
-from copy import deepcopy
-from .models import Process
+from typing import List, Optional
+from array import array
+from .models import Process, Workload, ScheduleResult
+from .timeline import Timeline
+from .profiler import Profiler
 
 
-def fcfs_scheduler(processes: List[Process]) -> List[Process]:
-    processes = deepcopy(processes)
-    processes.sort(key=lambda p: (p.arrival_time, p.pid)) # Ordena por AT, y si AT es igual, ordena por PID
-    
+def fcfs_scheduler(processes: List[Process], timeline: Optional[Timeline] = None) -> List[Process]:
+    workload = Workload.from_processes(processes)
+    return run_fcfs(workload, timeline).processes(workload.arrival_order())
+
+
+def run_fcfs(workload: Workload, timeline: Optional[Timeline] = None,
+             profiler: Optional[Profiler] = None) -> ScheduleResult:
+    n = len(workload)
+    pids, arrivals, bursts = workload.pids, workload.arrivals, workload.bursts
+    start = array('q', [-1]) * n
+    completion = array('q', [0]) * n
+    order = workload.arrival_order()
+    arrived = 0 # procesos que ya llegaron, solo se lleva con profiler
+
     current_time = 0 # Tiempo actual CPU
-    for process in processes:
+    for dispatched, i in enumerate(order): # Ordenado por AT, y si AT es igual, por PID
         # Si el CPU esta en idle, avanzamos al tiempo de llegada del proceso
-        if current_time < process.arrival_time:
-            current_time = process.arrival_time
+        if current_time < arrivals[i]:
+            current_time = arrivals[i]
+            if profiler is not None:
+                profiler.idle_jumps += 1
+
+        if profiler is not None:
+            # Waiting processes: arrived so far minus the ones already dispatched and this one
+            while arrived < n and arrivals[order[arrived]] <= current_time:
+                arrived += 1
+            profiler.dispatch(pids[i], current_time, arrived - dispatched - 1)
 
         # Registro de inicio y ejecución del proceso completo (sin interrupciones)
-        process.start_time = current_time
-        current_time += process.burst_time
-
-        # Calculo de CT, TTA y WT
-        process.completion_time = current_time
-        process.turnaround_time = process.completion_time - process.arrival_time
-        process.waiting_time = process.turnaround_time - process.burst_time
-    
-    return processes
\ No newline at end of file
+        start[i] = current_time
+        current_time += bursts[i]
+        completion[i] = current_time
+        if timeline is not None:
+            timeline.add(pids[i], start[i], current_time)
+
+    # TTA y WT se calculan en ScheduleResult
+    return ScheduleResult(workload, start, completion)
+
+
+# Closed form FCFS over NumPy arrays. In arrival order, with S = cumulative burst sum:
+#   completion[k] = S[k] + max(0, max_{j<=k} (arrival[j] - S[j-1]))
+# so the whole schedule is one lexsort, two cumsums and a running maximum.
+# The result columns are zero-copy int64 views of the NumPy arrays.
+# Falls back to run_fcfs when NumPy is not installed.
+def run_fcfs_vectorized(workload: Workload, timeline: Optional[Timeline] = None) -> ScheduleResult:
+    try:
+        import numpy as np
+    except ImportError:
+        return run_fcfs(workload, timeline)
+
+    # Zero-copy for arrays and (possibly strided) memoryviews such as mmap'd binary workloads
+    pids = np.asarray(workload.pids, dtype=np.int64)
+    arrivals = np.asarray(workload.arrivals, dtype=np.int64)
+    bursts = np.asarray(workload.bursts, dtype=np.int64)
+    if len(arrivals) == 0:
+        return run_fcfs(workload, timeline)
+
+    # Ordena por AT, y si AT es igual, por PID (lexsort uses the last key as primary)
+    order = np.lexsort((pids, arrivals))
+    sorted_arrivals = arrivals[order]
+    sorted_bursts = bursts[order]
+
+    total = np.cumsum(sorted_bursts)
+    slack = sorted_arrivals - (total - sorted_bursts)
+    np.maximum(slack, 0, out=slack)
+    np.maximum.accumulate(slack, out=slack)
+
+    completion = np.empty_like(arrivals)
+    completion[order] = total + slack
+    start = completion - bursts
+    turnaround = completion - arrivals
+    waiting = turnaround - bursts
+
+    # Segments in execution order (the arrival order)
+    if timeline is not None:
+        for pid, begin, end in zip(pids[order].tolist(), start[order].tolist(), completion[order].tolist()):
+            timeline.add(pid, begin, end)
+
+    return ScheduleResult(workload, _column(start), _column(completion),
+                          turnaround=_column(turnaround), waiting=_column(waiting))
+
+
+# int64 memoryview over a contiguous NumPy array, indexable like array('q')
+def _column(values) -> memoryview:
+    return memoryview(values).cast('B').cast('q')
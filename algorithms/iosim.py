@@ -0,0 +1,252 @@
+# CPU/I-O burst simulator.
+# Every process alternates CPU and I/O bursts (Workload.io; a workload without it is one CPU burst
+# per process). One CPU runs the ready queue under a CPU discipline taken from the single-burst
+# algorithms (FCFS, SJF, SJF_P/SRTF, PS, PS_P, RR) and every I/O device serves its own FIFO queue,
+# one request at a time. When a CPU burst ends the process moves to the device of its next I/O
+# burst, and back to the ready queue when that I/O completes.
+#
+# Discrete-event core: pending I/O completions sit in one time-ordered heap, arrivals come from
+# the sorted arrival order through a cursor (they are already sorted, so they are not pushed), and
+# the CPU has at most one pending event (end of its burst or quantum), kept in a variable so a
+# preemption never leaves a stale heap entry. Each step jumps to the earliest of the three; nothing
+# loops per time unit. Events at the same time are handled as I/O completions, then arrivals, then
+# the CPU event, so as in run_round_robin new arrivals queue ahead of a process whose quantum ran out.
+# Ready queue keys follow the single-burst engines, with the time a process became ready for its
+# current burst in place of the arrival time: with single bursts the results are identical to them.
+from typing import Any, Dict, List, Optional
+from array import array
+from collections import deque
+from dataclasses import dataclass, field
+from heapq import heappush, heappop
+from .models import Process, Workload, ScheduleResult, BurstSequences
+from .timeline import Timeline
+from .profiler import Profiler
+
+# CPU discipline -> (ready queue order, preemptive when a better process becomes ready)
+#   fifo      in the order processes became ready (RR also expires the quantum)
+#   burst     shortest (remaining) CPU burst first
+#   priority  lowest priority number first
+DISCIPLINES = {
+    'FCFS': ('fifo', False),
+    'RR': ('fifo', False),
+    'SJF': ('burst', False),
+    'SJF_P': ('burst', True),
+    'PS': ('priority', False),
+    'PS_P': ('priority', True),
+}
+
+NEVER = 1 << 62
+
+
+# Event and time accounting of a run. Times are totals over every process and burst.
+@dataclass
+class IOStats:
+    events: int = 0             # arrivals, I/O completions, CPU burst/quantum ends and preemptions
+    dispatches: int = 0
+    preemptions: int = 0
+    cpu_bursts: int = 0
+    io_bursts: int = 0
+    cpu_busy: int = 0
+    ready_wait: int = 0         # time spent in the ready queue
+    device_wait: int = 0        # time spent queued behind a busy device
+    response_time: int = 0      # from becoming ready for a CPU burst to its first dispatch, summed
+    device_busy: List[int] = field(default_factory=list)
+
+
+def io_scheduler(processes: List[Process], policy: str = 'FCFS', params: Optional[Dict[str, Any]] = None,
+                 timeline: Optional[Timeline] = None) -> List[Process]:
+    return run_io(Workload.from_processes(processes), policy, params, timeline).processes()
+
+
+# Run the workload's CPU and I/O bursts with `policy` as the CPU discipline; params are the
+# discipline's own ({'quantum': q} for RR). The result's burst_time is each process's CPU total, so
+# waiting time is all the time off the CPU (ready queue, device queues and I/O); the ready queue
+# share is in IOStats.ready_wait.
+def run_io(workload: Workload, policy: str = 'FCFS', params: Optional[Dict[str, Any]] = None,
+           timeline: Optional[Timeline] = None, profiler: Optional[Profiler] = None) -> ScheduleResult:
+    if policy not in DISCIPLINES:
+        raise ValueError(f"Unknown CPU discipline '{policy}', expected one of {', '.join(DISCIPLINES)}")
+    params = dict(params or {})
+    quantum = params.pop('quantum', None) if policy == 'RR' else None
+    if params:
+        raise ValueError(f"Unknown {policy} parameters: {', '.join(params)}")
+    if policy == 'RR' and (quantum is None or quantum <= 0):
+        raise ValueError("RR requires a positive quantum")
+    order_by, preemptive = DISCIPLINES[policy]
+    fifo = order_by == 'fifo'
+    by_burst = order_by == 'burst'
+
+    n = len(workload)
+    pids, arrivals, priorities = workload.pids, workload.arrivals, workload.priorities
+    io = workload.io if workload.io is not None else BurstSequences.single(workload.bursts)
+    offsets, durations, devices = io.offsets, io.durations, io.devices
+    start = array('q', [-1]) * n
+    completion = array('q', [0]) * n
+
+    segment = list(offsets[:n])     # current burst of every process (index into durations)
+    remaining = [0] * n             # left of the current CPU burst
+    ready_since = [0] * n           # when the process became ready for its current CPU burst
+    queued_at = [0] * n             # when it last joined a queue (ready or device)
+    responded = [False] * n         # current CPU burst dispatched at least once
+
+    stats = IOStats()
+    device_count = max(devices, default=-1) + 1
+    device_queues = [deque() for _ in range(device_count)]
+    device_idle = [True] * device_count
+    device_busy = [0] * device_count
+
+    # Pending I/O completions (time, sequence, process); the sequence keeps equal times in FIFO order
+    io_events = []
+    io_sequence = 0
+    ready = deque() if fifo else []  # fifo: indices; otherwise a heap of (key, ready_since, pid, index)
+
+    order = workload.arrival_order()
+    next_arrival = 0
+    running = -1
+    run_start = cpu_end = 0
+    now = 0
+    completed = 0
+    events = dispatches = preemptions = io_bursts = cpu_busy = 0
+    ready_wait = device_wait = response_time = 0
+
+    while completed < n:
+        # Next event: the CPU's, the earliest I/O completion or the next arrival
+        t = cpu_end if running >= 0 else NEVER
+        if io_events and io_events[0][0] < t:
+            t = io_events[0][0]
+        if next_arrival < n and arrivals[order[next_arrival]] < t:
+            t = arrivals[order[next_arrival]]
+        if running < 0 and not ready and t > now and profiler is not None:
+            profiler.idle_jumps += 1
+        now = t
+
+        # I/O completions: the device starts its next request and the process is ready for its next CPU burst
+        while io_events and io_events[0][0] <= now:
+            i = heappop(io_events)[2]
+            events += 1
+            queue = device_queues[devices[segment[i]]]
+            if queue:
+                j = queue.popleft()
+                device_wait += now - queued_at[j]
+                duration = durations[segment[j]]
+                device_busy[devices[segment[j]]] += duration
+                heappush(io_events, (now + duration, io_sequence, j))
+                io_sequence += 1
+            else:
+                device_idle[devices[segment[i]]] = True
+            segment[i] += 1
+            remaining[i] = durations[segment[i]]
+            ready_since[i] = queued_at[i] = now
+            responded[i] = False
+            if fifo:
+                ready.append(i)
+            else:
+                heappush(ready, (remaining[i] if by_burst else priorities[i], now, pids[i], i))
+
+        # Arrivals: ready for the first CPU burst
+        while next_arrival < n and arrivals[order[next_arrival]] <= now:
+            i = order[next_arrival]
+            next_arrival += 1
+            events += 1
+            remaining[i] = durations[segment[i]]
+            ready_since[i] = queued_at[i] = now
+            if fifo:
+                ready.append(i)
+            else:
+                heappush(ready, (remaining[i] if by_burst else priorities[i], now, pids[i], i))
+
+        if running >= 0 and cpu_end <= now:
+            # CPU event: the burst ended or the quantum ran out
+            i = running
+            running = -1
+            events += 1
+            ran = now - run_start
+            remaining[i] -= ran
+            cpu_busy += ran
+            if timeline is not None and ran:
+                timeline.add(pids[i], run_start, now)
+            if remaining[i] > 0:
+                queued_at[i] = now
+                ready.append(i)  # only RR has a quantum, and RR is fifo
+                if profiler is not None:
+                    profiler.stop(pids[i])
+            elif segment[i] == offsets[i + 1] - 1:
+                completion[i] = now
+                completed += 1
+            else:
+                # On to the device of the next I/O burst, or its queue when the device is busy
+                segment[i] += 1
+                io_bursts += 1
+                device = devices[segment[i]]
+                queued_at[i] = now
+                if device_idle[device]:
+                    device_idle[device] = False
+                    duration = durations[segment[i]]
+                    device_busy[device] += duration
+                    heappush(io_events, (now + duration, io_sequence, i))
+                    io_sequence += 1
+                else:
+                    device_queues[device].append(i)
+
+        elif running >= 0 and preemptive and ready:
+            # A process that became ready may take the CPU: same comparison as the single-burst engines
+            i = running
+            key = remaining[i] - (now - run_start) if by_burst else priorities[i]
+            if ready[0][:3] < (key, ready_since[i], pids[i]):
+                running = -1
+                events += 1
+                preemptions += 1
+                ran = now - run_start
+                remaining[i] -= ran
+                cpu_busy += ran
+                if timeline is not None and ran:
+                    timeline.add(pids[i], run_start, now)
+                if profiler is not None:
+                    profiler.stop(pids[i])
+                queued_at[i] = now
+                heappush(ready, (key, ready_since[i], pids[i], i))
+
+        # Dispatch when the CPU is free
+        if running < 0 and ready:
+            i = ready.popleft() if fifo else heappop(ready)[3]
+            running = i
+            run_start = now
+            cpu_end = now + (remaining[i] if quantum is None or remaining[i] < quantum else quantum)
+            dispatches += 1
+            ready_wait += now - queued_at[i]
+            if not responded[i]:
+                responded[i] = True
+                response_time += now - ready_since[i]
+            if start[i] == -1:
+                start[i] = now
+            if profiler is not None:
+                profiler.dispatch(pids[i], now, len(ready))
+
+    stats.events = events
+    stats.dispatches = dispatches
+    stats.preemptions = preemptions
+    stats.cpu_bursts = len(durations) - io_bursts
+    stats.io_bursts = io_bursts
+    stats.cpu_busy = cpu_busy
+    stats.ready_wait = ready_wait
+    stats.device_wait = device_wait
+    stats.response_time = response_time
+    stats.device_busy = device_busy
+    return ScheduleResult(workload, start, completion, stats)
+
+
+# Response time and utilization of a run: mean response per CPU burst (ready -> first dispatch),
+# mean ready queue and device queue waits per process, and CPU and per-device utilization over the
+# span from the first arrival to the last completion
+def io_report(result: ScheduleResult) -> Dict[str, Any]:
+    stats = result.stats
+    n = len(result)
+    span = (max(result.completion) - min(result.workload.arrivals)) if n else 0
+    return {
+        'avg_response': stats.response_time / stats.cpu_bursts if stats.cpu_bursts else 0.0,
+        'avg_ready_wait': stats.ready_wait / n if n else 0.0,
+        'avg_device_wait': stats.device_wait / n if n else 0.0,
+        'cpu_utilization': stats.cpu_busy / span if span > 0 else (1.0 if n else 0.0),
+        'device_utilization': [busy / span if span > 0 else 0.0 for busy in stats.device_busy],
+        'events': stats.events,
+    }
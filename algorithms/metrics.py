@@ -0,0 +1,274 @@
+# Single-pass metrics over completed processes: means, maxima, tail percentiles,
+# per-priority breakdowns, CPU utilization, throughput and idle time.
+# Memory stays bounded: percentiles come from a mergeable quantile sketch.
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+from statistics import NormalDist
+import math
+from .models import Process, ScheduleResult
+
+DEFAULT_PERCENTILES = (50, 95, 99)
+
+
+# Log-bucket quantile sketch (DDSketch style) for non-negative values.
+# Exact while it has seen at most exact_limit values; after that every quantile is
+# within relative_accuracy of the true value. Sketches with the same accuracy can be merged.
+class QuantileSketch:
+    def __init__(self, relative_accuracy: float = 0.01, exact_limit: int = 2048):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.exact_limit = exact_limit
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.count = 0
+        self._values = []       # exact mode
+        self._buckets = None    # sketch mode: bucket index -> count
+        self._zeros = 0         # values <= 0 in sketch mode
+
+    def add(self, value: float):
+        self.count += 1
+        if self._buckets is None:
+            self._values.append(value)
+            if len(self._values) > self.exact_limit:
+                self._to_buckets()
+        elif value <= 0:
+            self._zeros += 1
+        else:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self._buckets[index] = self._buckets.get(index, 0) + 1
+
+    def merge(self, other: 'QuantileSketch'):
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        if other._buckets is None:
+            for value in other._values:
+                self.add(value)
+            return
+        if self._buckets is None:
+            self._to_buckets()
+        self.count += other.count
+        self._zeros += other._zeros
+        for index, count in other._buckets.items():
+            self._buckets[index] = self._buckets.get(index, 0) + count
+
+    # Nearest-rank percentile, p in [0, 100]
+    def quantile(self, p: float) -> Optional[float]:
+        if self.count == 0:
+            return None
+        rank = min(self.count, max(1, math.ceil(p / 100 * self.count)))
+        if self._buckets is None:
+            self._values.sort()
+            return self._values[rank - 1]
+        seen = self._zeros
+        if rank <= seen:
+            return 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if rank <= seen:
+                return 2 * self._gamma ** index / (self._gamma + 1)
+        return None  # unreachable: counts always add up
+
+    def _to_buckets(self):
+        values, self._values = self._values, []
+        self._buckets = {}
+        self.count -= len(values)
+        for value in values:
+            self.add(value)
+
+
+# Two-sided Student t critical value for `confidence` with `df` degrees of freedom.
+# Cornish-Fisher expansion around the normal quantile: within 1% from 3 degrees of freedom,
+# and the normal quantile itself for large df.
+def t_quantile(confidence: float, df: int) -> float:
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    if df <= 0:
+        return math.inf
+    z2 = z * z
+    g1 = z * (z2 + 1) / 4
+    g2 = z * ((5 * z2 + 16) * z2 + 3) / 96
+    g3 = z * (((3 * z2 + 19) * z2 + 17) * z2 - 15) / 384
+    g4 = z * ((((79 * z2 + 776) * z2 + 1482) * z2 - 1920) * z2 - 945) / 92160
+    return z + g1 / df + g2 / df ** 2 + g3 / df ** 3 + g4 / df ** 4
+
+
+# Mean and variance of a stream of non-negative values (Welford), with min/max and a quantile sketch.
+# Mergeable (Chan et al.), so partial statistics from several workers combine exactly.
+class RunningStat:
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = None
+        self.max = None
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        self.sketch.add(value)
+
+    def merge(self, other: 'RunningStat') -> 'RunningStat':
+        if other.count == 0:
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.count = count
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+        return self
+
+    # Sample variance (n - 1 denominator)
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    # Confidence interval of the mean (Student t); a single value gives an empty-width interval
+    def interval(self, confidence: float = 0.95) -> Tuple[float, float]:
+        if self.count < 2:
+            return self.mean, self.mean
+        half = t_quantile(confidence, self.count - 1) * self.std / math.sqrt(self.count)
+        return self.mean - half, self.mean + half
+
+
+# Running statistics of one group of processes (all of them, or one priority level)
+class _Group:
+    def __init__(self, percentiles: Sequence[float], relative_accuracy: float):
+        self.percentiles = percentiles
+        self.count = 0
+        self.turnaround_sum = 0
+        self.waiting_sum = 0
+        self.response_sum = 0
+        self.turnaround_max = None
+        self.waiting_max = None
+        self.busy_time = 0
+        self.first_arrival = None
+        self.last_completion = None
+        self.turnaround = QuantileSketch(relative_accuracy)
+        self.waiting = QuantileSketch(relative_accuracy)
+
+    def add(self, arrival: int, burst: int, start: int, completion: int):
+        turnaround = completion - arrival
+        waiting = turnaround - burst
+        self.count += 1
+        self.turnaround_sum += turnaround
+        self.waiting_sum += waiting
+        self.response_sum += start - arrival
+        if self.turnaround_max is None or turnaround > self.turnaround_max:
+            self.turnaround_max = turnaround
+        if self.waiting_max is None or waiting > self.waiting_max:
+            self.waiting_max = waiting
+        self.busy_time += burst
+        if self.first_arrival is None or arrival < self.first_arrival:
+            self.first_arrival = arrival
+        if self.last_completion is None or completion > self.last_completion:
+            self.last_completion = completion
+        self.turnaround.add(turnaround)
+        self.waiting.add(waiting)
+
+    def merge(self, other: '_Group'):
+        self.count += other.count
+        self.turnaround_sum += other.turnaround_sum
+        self.waiting_sum += other.waiting_sum
+        self.response_sum += other.response_sum
+        self.busy_time += other.busy_time
+        for name, pick in (('turnaround_max', max), ('waiting_max', max),
+                           ('first_arrival', min), ('last_completion', max)):
+            values = [v for v in (getattr(self, name), getattr(other, name)) if v is not None]
+            setattr(self, name, pick(values) if values else None)
+        self.turnaround.merge(other.turnaround)
+        self.waiting.merge(other.waiting)
+
+    def summary(self, cpus: int) -> Dict[str, Any]:
+        n = self.count
+        span = (self.last_completion - self.first_arrival) if n else 0
+        summary = {
+            'processes': n,
+            'avg_turnaround': self.turnaround_sum / n if n else 0.0,
+            'avg_waiting': self.waiting_sum / n if n else 0.0,
+            'avg_response': self.response_sum / n if n else 0.0,
+            'max_turnaround': self.turnaround_max or 0,
+            'max_waiting': self.waiting_max or 0,
+        }
+        for p in self.percentiles:
+            summary[f'p{p:g}_turnaround'] = self.turnaround.quantile(p) if n else 0
+            summary[f'p{p:g}_waiting'] = self.waiting.quantile(p) if n else 0
+        summary.update({
+            'busy_time': self.busy_time,
+            'makespan': self.last_completion or 0,
+            'idle_time': max(0, span * cpus - self.busy_time),
+            'cpu_utilization': self.busy_time / (span * cpus) if span > 0 else (1.0 if n else 0.0),
+            'throughput': n / span if span > 0 else 0.0,
+        })
+        return summary
+
+
+# Streaming aggregator. Feed it completions one by one (add / add_process), a whole
+# columnar result (add_result) or an iterable of completed processes (e.g. an online
+# scheduler's drain()). Utilization, throughput and idle time are measured over the span
+# from the first arrival to the last completion, on `cpus` CPUs.
+class MetricsAggregator:
+    def __init__(self, percentiles: Sequence[float] = DEFAULT_PERCENTILES, by_priority: bool = True,
+                 relative_accuracy: float = 0.01, cpus: int = 1):
+        self.percentiles = tuple(percentiles)
+        self.relative_accuracy = relative_accuracy
+        self.cpus = cpus
+        self.by_priority = by_priority
+        self._all = _Group(self.percentiles, relative_accuracy)
+        self._priorities: Dict[int, _Group] = {}
+
+    def __len__(self) -> int:
+        return self._all.count
+
+    def add(self, arrival: int, burst: int, start: int, completion: int, priority: int = 0):
+        self._all.add(arrival, burst, start, completion)
+        if self.by_priority:
+            group = self._priorities.get(priority)
+            if group is None:
+                group = self._priorities[priority] = _Group(self.percentiles, self.relative_accuracy)
+            group.add(arrival, burst, start, completion)
+
+    def add_process(self, p: Process):
+        self.add(p.arrival_time, p.burst_time, p.start_time, p.completion_time, p.priority)
+
+    def add_processes(self, processes: Iterable[Process]) -> 'MetricsAggregator':
+        for p in processes:
+            self.add_process(p)
+        return self
+
+    def add_result(self, result: ScheduleResult) -> 'MetricsAggregator':
+        w = result.workload
+        add = self.add
+        for row in zip(w.arrivals, w.bursts, result.start, result.completion, w.priorities):
+            add(*row)
+        return self
+
+    def merge(self, other: 'MetricsAggregator') -> 'MetricsAggregator':
+        self._all.merge(other._all)
+        for priority, group in other._priorities.items():
+            if priority in self._priorities:
+                self._priorities[priority].merge(group)
+            else:
+                mine = self._priorities[priority] = _Group(self.percentiles, self.relative_accuracy)
+                mine.merge(group)
+        return self
+
+    # Flat dict of metrics; per-priority summaries under 'by_priority' when enabled
+    def summary(self) -> Dict[str, Any]:
+        summary = self._all.summary(self.cpus)
+        if self.by_priority:
+            summary['by_priority'] = {priority: self._priorities[priority].summary(self.cpus)
+                                      for priority in sorted(self._priorities)}
+        return summary
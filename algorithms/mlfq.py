@@ -0,0 +1,155 @@
+# Multilevel Feedback Queue (MLFQ) scheduling algorithm.
+# Level 0 has the highest priority. Every level is a Round Robin deque with its own quantum:
+#   - new processes enter level 0
+#   - a process that uses up its level quantum is demoted one level (the last level keeps it)
+#   - an arrival preempts a process running below level 0; the preempted process resumes
+#     first in its level with the rest of its quantum
+#   - every boost_interval time units all processes move back to level 0 with a fresh quantum
+# A bitmap of non-empty levels finds the highest ready level in O(1).
+from typing import List, Optional, Sequence
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from .models import Process, Workload, ScheduleResult, DEFAULT_QUANTA
+from .timeline import Timeline
+from .profiler import Profiler
+
+
+# Dispatch accounting for an MLFQ run
+@dataclass
+class MLFQStats:
+    dispatches: int = 0
+    context_switches: int = 0
+    preemptions: int = 0  # slices cut short by an arrival
+    demotions: int = 0
+    boosts: int = 0
+
+
+def mlfq_scheduler(processes: List[Process], quanta: Sequence[int] = DEFAULT_QUANTA,
+                   boost_interval: Optional[int] = None, timeline: Optional[Timeline] = None) -> List[Process]:
+    return run_mlfq(Workload.from_processes(processes), quanta, boost_interval, timeline).processes()
+
+
+# The returned ScheduleResult carries an MLFQStats in `stats`
+def run_mlfq(workload: Workload, quanta: Sequence[int] = DEFAULT_QUANTA, boost_interval: Optional[int] = None,
+             timeline: Optional[Timeline] = None, profiler: Optional[Profiler] = None) -> ScheduleResult:
+    quanta = tuple(quanta)
+    if not quanta or any(q <= 0 for q in quanta):
+        raise ValueError("Every level needs a positive quantum")
+    if boost_interval is not None and boost_interval <= 0:
+        raise ValueError("Boost interval must be positive")
+    bottom = len(quanta) - 1
+
+    n = len(workload)
+    pids, arrivals = workload.pids, workload.arrivals
+    remaining = list(workload.bursts)
+    used = [0] * n  # time used of the current level quantum
+    start = array('q', [-1]) * n
+    completion = array('q', [0]) * n
+    queues = [deque() for _ in quanta]
+    nonempty = 0  # bit k set when queues[k] has processes
+    stats = MLFQStats()
+    last_pid = None
+
+    # A boost moves the queued processes with one deque extend per level; their used time is
+    # reset lazily, on dispatch, when they have not been dispatched since the last boost
+    boost_epoch = 0
+    epoch = [0] * n
+    next_boost = boost_interval
+
+    order = workload.arrival_order()
+    next_arrival = 0
+    current_time = 0
+    completed_count = 0
+    top = queues[0]
+
+    while completed_count < n:
+        # New arrivals enter the top level
+        if next_arrival < n and arrivals[order[next_arrival]] <= current_time:
+            while next_arrival < n and arrivals[order[next_arrival]] <= current_time:
+                top.append(order[next_arrival])
+                next_arrival += 1
+            nonempty |= 1
+
+        # Priority boost: every level is appended to level 0, in level order
+        if next_boost is not None and current_time >= next_boost:
+            for queue in queues[1:]:
+                top.extend(queue)
+                queue.clear()
+            nonempty = 1 if top else 0
+            boost_epoch += 1
+            stats.boosts += 1
+            next_boost += boost_interval * ((current_time - next_boost) // boost_interval + 1)
+
+        # CPU idle, jump straight to the next arrival
+        if not nonempty:
+            current_time = arrivals[order[next_arrival]]
+            if profiler is not None:
+                profiler.idle_jumps += 1
+            continue
+
+        # Highest non-empty level: lowest set bit
+        level = (nonempty & -nonempty).bit_length() - 1
+        queue = queues[level]
+        i = queue.popleft()
+        if not queue:
+            nonempty &= ~(1 << level)
+        if epoch[i] != boost_epoch:
+            epoch[i] = boost_epoch
+            used[i] = 0
+
+        pid = pids[i]
+        if profiler is not None:
+            profiler.dispatch(pid, current_time, sum(map(len, queues)))
+        stats.dispatches += 1
+        if last_pid is not None and last_pid != pid:
+            stats.context_switches += 1
+        last_pid = pid
+        if start[i] == -1:
+            start[i] = current_time
+
+        # Run until completion, end of the quantum, a preempting arrival or the next boost
+        slice_end = current_time + min(remaining[i], quanta[level] - used[i])
+        preempted = False
+        if level > 0 and next_arrival < n and arrivals[order[next_arrival]] < slice_end:
+            slice_end = arrivals[order[next_arrival]]
+            preempted = True
+        if next_boost is not None and next_boost < slice_end:
+            slice_end = next_boost
+            preempted = False
+        run = slice_end - current_time
+        remaining[i] -= run
+        used[i] += run
+        if timeline is not None:
+            timeline.add(pid, current_time, slice_end)
+        current_time = slice_end
+
+        # Processes arriving during the slice go ahead of the one that just ran, as in Round Robin
+        if next_arrival < n and arrivals[order[next_arrival]] <= current_time:
+            while next_arrival < n and arrivals[order[next_arrival]] <= current_time:
+                top.append(order[next_arrival])
+                next_arrival += 1
+            nonempty |= 1
+
+        if remaining[i] == 0:
+            completion[i] = current_time
+            completed_count += 1
+            continue
+        if profiler is not None:
+            profiler.stop(pid)
+        if used[i] >= quanta[level]:
+            # Quantum used up: demote (the last level is plain Round Robin)
+            if level < bottom:
+                level += 1
+                stats.demotions += 1
+            used[i] = 0
+            queues[level].append(i)
+            nonempty |= 1 << level
+        else:
+            # Interrupted by an arrival or a boost: resume first in its level
+            if preempted:
+                stats.preemptions += 1
+            queue.appendleft(i)
+            nonempty |= 1 << level
+
+    return ScheduleResult(workload, start, completion, stats)
@@ -1,7 +1,15 @@
 # Shared models and data structures for CPU scheduling algorithms.
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional, Sequence, Any
 from dataclasses import dataclass, field
-from copy import deepcopy
+from array import array
+from operator import sub
+
+# Default MLFQ level quanta and CFS parameters; here rather than in mlfq.py and cfs.py so callers
+# that only need the defaults (registry, compare, smp) do not import the engines
+DEFAULT_QUANTA = (8, 16, 32)
+DEFAULT_TARGET_LATENCY = 24
+DEFAULT_MIN_GRANULARITY = 3
+DEFAULT_WAKEUP_GRANULARITY = 4
 
 # Represents a process with scheduling attributes.
 @dataclass
@@ -10,6 +18,11 @@ class Process:
     arrival_time: int
     burst_time: int
     priority: int = 0
+    deadline: int = 0       # relative to arrival_time; 0 = none (the period for periodic tasks)
+    period: int = 0         # release period of a periodic task; 0 = one-shot
+    # Alternating CPU and I/O bursts (CPU first and last); burst_time is then their CPU total
+    burst_sequence: Optional[List[int]] = None
+    io_devices: Optional[List[int]] = None   # device of each I/O burst, 0 when omitted
     remaining_time: int = field(init=False)
     completion_time: int = 0
     turnaround_time: int = 0
@@ -18,4 +31,263 @@ class Process:
     
     # To preemptive algorithms
     def __post_init__(self):
+        if self.burst_sequence is not None:
+            self.burst_time = sum(self.burst_sequence[0::2])
         self.remaining_time = self.burst_time
+
+# Columnar workload: one compact int64 array per attribute (struct of arrays).
+# Schedulers only read it, so it is never copied; Process objects are built on demand.
+# arrival_order may be passed when the source is already sorted by (arrival_time, pid).
+# The real-time columns (deadlines, periods) and the CPU/I-O burst sequences (io, with bursts
+# holding each process's CPU total) are optional and stay None for plain workloads.
+class Workload:
+    def __init__(self, pids: Sequence[int], arrivals: Sequence[int], bursts: Sequence[int],
+                 priorities: Optional[Sequence[int]] = None, arrival_order: Optional[Sequence[int]] = None,
+                 deadlines: Optional[Sequence[int]] = None, periods: Optional[Sequence[int]] = None,
+                 io: Optional['BurstSequences'] = None):
+        n = len(pids)
+        if len(arrivals) != n or len(bursts) != n or any(column is not None and len(column) != n
+                                                         for column in (priorities, deadlines, periods, io)):
+            raise ValueError("Workload columns must have the same length")
+        self.pids = _int_column(pids)
+        self.arrivals = _int_column(arrivals)
+        self.bursts = _int_column(bursts)
+        self.priorities = _int_column(priorities) if priorities is not None else array('q', bytes(8 * n))
+        self.deadlines = _int_column(deadlines) if deadlines is not None else None
+        self.periods = _int_column(periods) if periods is not None else None
+        self.io = io
+        self._arrival_order = arrival_order
+
+    @classmethod
+    def from_processes(cls, processes: List[Process]) -> 'Workload':
+        realtime = any(p.deadline or p.period for p in processes)
+        io = None
+        if any(p.burst_sequence is not None for p in processes):
+            io = BurstSequences.from_lists([p.burst_sequence if p.burst_sequence is not None else [p.burst_time]
+                                            for p in processes], [p.io_devices for p in processes])
+        return cls(
+            array('q', [p.pid for p in processes]),
+            array('q', [p.arrival_time for p in processes]),
+            array('q', [p.burst_time for p in processes]),
+            array('q', [p.priority for p in processes]),
+            deadlines=array('q', [p.deadline for p in processes]) if realtime else None,
+            periods=array('q', [p.period for p in processes]) if realtime else None,
+            io=io,
+        )
+
+    # True when the workload carries deadline or period columns
+    @property
+    def realtime(self) -> bool:
+        return self.deadlines is not None or self.periods is not None
+
+    def __len__(self) -> int:
+        return len(self.pids)
+
+    # Indices sorted by (arrival_time, pid); computed once and shared by every scheduler run
+    def arrival_order(self) -> Sequence[int]:
+        if self._arrival_order is None:
+            self._arrival_order = array('q', [i for _, _, i in sorted(zip(self.arrivals, self.pids, range(len(self))))])
+        return self._arrival_order
+
+    def process(self, i: int) -> Process:
+        p = Process(pid=self.pids[i], arrival_time=self.arrivals[i],
+                    burst_time=self.bursts[i], priority=self.priorities[i])
+        if self.deadlines is not None:
+            p.deadline = self.deadlines[i]
+        if self.periods is not None:
+            p.period = self.periods[i]
+        if self.io is not None:
+            p.burst_sequence = self.io.sequence(i)
+            p.io_devices = self.io.io_devices(i)
+        return p
+
+    def processes(self) -> List[Process]:
+        return [self.process(i) for i in range(len(self))]
+
+
+# Columnar output of a scheduler run, aligned index by index with its workload.
+# `stats` holds algorithm specific extras (e.g. RoundRobinStats).
+class ScheduleResult:
+    def __init__(self, workload: Workload, start: Sequence[int], completion: Sequence[int], stats: Any = None,
+                 turnaround: Optional[Sequence[int]] = None, waiting: Optional[Sequence[int]] = None):
+        self.workload = workload
+        self.start = _int_column(start)
+        self.completion = _int_column(completion)
+        # Derived from completion on first use unless the engine already computed them (e.g. vectorized FCFS)
+        self._turnaround = _int_column(turnaround) if turnaround is not None else None
+        self._waiting = _int_column(waiting) if waiting is not None else None
+        self.stats = stats
+
+    @property
+    def turnaround(self) -> Sequence[int]:
+        if self._turnaround is None:
+            self._turnaround = array('q', map(sub, self.completion, self.workload.arrivals))
+        return self._turnaround
+
+    @property
+    def waiting(self) -> Sequence[int]:
+        if self._waiting is None:
+            self._waiting = array('q', map(sub, self.turnaround, self.workload.bursts))
+        return self._waiting
+
+    def __len__(self) -> int:
+        return len(self.completion)
+
+    # Process with the metrics of this run filled in
+    def process(self, i: int) -> Process:
+        p = self.workload.process(i)
+        p.remaining_time = 0
+        p.start_time = self.start[i]
+        p.completion_time = self.completion[i]
+        p.turnaround_time = self.turnaround[i]
+        p.waiting_time = self.waiting[i]
+        return p
+
+    # Processes in index order, or in the given order of indices
+    def processes(self, order: Optional[Sequence[int]] = None) -> List[Process]:
+        if order is None:
+            order = range(len(self))
+        return [self.process(i) for i in order]
+
+    # Indices in the order the processes completed (ties keep index order)
+    def completion_order(self) -> List[int]:
+        return sorted(range(len(self)), key=self.completion.__getitem__)
+
+
+# Alternating CPU and I/O bursts of every process, flattened (CSR layout): the bursts of process i are
+# durations[offsets[i]:offsets[i + 1]], CPU first and last (CPU, I/O, CPU, ..., CPU), and devices[k]
+# is the I/O device of burst k (0 for CPU bursts).
+class BurstSequences:
+    def __init__(self, offsets: Sequence[int], durations: Sequence[int], devices: Optional[Sequence[int]] = None):
+        self.offsets = _int_column(offsets)
+        self.durations = _int_column(durations)
+        self.devices = _int_column(devices) if devices is not None else array('q', bytes(8 * len(self.durations)))
+        m = len(self.durations)
+        if not self.offsets or self.offsets[0] != 0 or self.offsets[-1] != m or len(self.devices) != m:
+            raise ValueError("Burst sequence offsets do not match the bursts")
+        if any((high - low) % 2 == 0 for low, high in zip(self.offsets, self.offsets[1:])):
+            raise ValueError("Burst sequences must alternate CPU and I/O bursts, starting and ending with CPU")
+
+    # `devices[i]` lists the device of each I/O burst of process i (None: all on device 0)
+    @classmethod
+    def from_lists(cls, sequences: Sequence[Sequence[int]],
+                   devices: Optional[Sequence[Optional[Sequence[int]]]] = None) -> 'BurstSequences':
+        offsets, durations, flat_devices = array('q', [0]), array('q'), array('q')
+        for i, sequence in enumerate(sequences):
+            io_devices = devices[i] if devices is not None and devices[i] is not None else [0] * (len(sequence) // 2)
+            if len(io_devices) != len(sequence) // 2:
+                raise ValueError("Every I/O burst needs exactly one device")
+            durations.extend(sequence)
+            for device in io_devices:
+                flat_devices.extend((0, device))
+            flat_devices.append(0)
+            offsets.append(len(durations))
+        return cls(offsets, durations, flat_devices)
+
+    # Every process a single CPU burst
+    @classmethod
+    def single(cls, bursts: Sequence[int]) -> 'BurstSequences':
+        return cls(range(len(bursts) + 1), bursts)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def sequence(self, i: int) -> List[int]:
+        return list(self.durations[self.offsets[i]:self.offsets[i + 1]])
+
+    def io_devices(self, i: int) -> List[int]:
+        return list(self.devices[self.offsets[i] + 1:self.offsets[i + 1]:2])
+
+    # CPU time of every process (the sum of its even bursts)
+    def cpu_totals(self) -> array:
+        durations = self.durations
+        return array('q', [sum(durations[low:high:2]) for low, high in zip(self.offsets, self.offsets[1:])])
+
+
+# Arrays and memoryviews are kept as they are (no copy); anything else becomes an int64 array
+def _int_column(values: Sequence[int]) -> Sequence[int]:
+    if isinstance(values, (array, memoryview)):
+        return values
+    return array('q', values)
+
+
+# Binary min-heap that tracks the position of every item, so the key of a
+# queued item can be changed in O(log n) (used by aging in priority_p).
+class IndexedHeap:
+    def __init__(self):
+        self._heap: List[int] = []          # items in heap order
+        self._keys: Dict[int, Tuple] = {}   # item -> key
+        self._pos: Dict[int, int] = {}      # item -> index in _heap
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, item: int) -> bool:
+        return item in self._pos
+
+    def key(self, item: int) -> Tuple:
+        return self._keys[item]
+
+    def peek(self) -> Tuple[Tuple, int]:
+        item = self._heap[0]
+        return self._keys[item], item
+
+    def push(self, item: int, key: Tuple):
+        self._keys[item] = key
+        self._pos[item] = len(self._heap)
+        self._heap.append(item)
+        self._sift_up(len(self._heap) - 1)
+
+    def pop(self) -> Tuple[Tuple, int]:
+        heap = self._heap
+        top = heap[0]
+        last = heap.pop()
+        if heap:
+            heap[0] = last
+            self._pos[last] = 0
+            self._sift_down(0)
+        del self._pos[top]
+        return self._keys.pop(top), top
+
+    # Change the key of a queued item, moving it up or down as needed
+    def update(self, item: int, key: Tuple):
+        old = self._keys[item]
+        self._keys[item] = key
+        if key < old:
+            self._sift_up(self._pos[item])
+        else:
+            self._sift_down(self._pos[item])
+
+    def _sift_up(self, i: int):
+        heap, keys, pos = self._heap, self._keys, self._pos
+        item = heap[i]
+        key = keys[item]
+        while i > 0:
+            parent = (i - 1) >> 1
+            parent_item = heap[parent]
+            if not key < keys[parent_item]:
+                break
+            heap[i] = parent_item
+            pos[parent_item] = i
+            i = parent
+        heap[i] = item
+        pos[item] = i
+
+    def _sift_down(self, i: int):
+        heap, keys, pos = self._heap, self._keys, self._pos
+        n = len(heap)
+        item = heap[i]
+        key = keys[item]
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            if child + 1 < n and keys[heap[child + 1]] < keys[heap[child]]:
+                child += 1
+            if not keys[heap[child]] < key:
+                break
+            heap[i] = heap[child]
+            pos[heap[i]] = i
+            i = child
+        heap[i] = item
+        pos[item] = i
@@ -0,0 +1,270 @@
+# Monte Carlo replications: burst and arrival times are treated as random around the trace values
+# and an algorithm is run on many seeded replications of the workload.
+# Replication r draws from its own Random('<seed>:<r>'), so the results do not depend on how the
+# replications are split across workers. Each worker attaches to the shared base workload once and
+# writes every replication into the same pair of int64 buffers (no Process lists, the untouched
+# columns are never copied). Metrics are folded in as replications finish: a Welford mean/variance
+# and a quantile sketch per metric, plus one pooled aggregator over every process of every
+# replication. Workers return these partial aggregates, so memory does not grow with the replications.
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import math
+import os
+import random
+from .models import Workload
+from .metrics import MetricsAggregator, RunningStat, DEFAULT_PERCENTILES
+from .compare import ENGINES, SharedWorkload, attach_workload, run_algorithm, algorithm_label
+
+DISTRIBUTIONS = ('fixed', 'jitter', 'lognormal', 'empirical')
+
+# Per-process fields of the pooled aggregator; spans, utilization and throughput only make sense per replication
+POOLED_FIELDS = ('avg_turnaround', 'avg_waiting', 'avg_response', 'max_turnaround', 'max_waiting')
+
+# Replication blocks per worker, so a slow block does not leave the other workers idle
+BLOCKS_PER_WORKER = 4
+
+
+# How one column varies between replications:
+#   fixed      the trace value
+#   jitter     the trace value plus a uniform integer in [-scale, scale]
+#   lognormal  the trace value times a lognormal factor with mean 1 and log standard deviation `scale`
+#   empirical  a value drawn from `samples` (by default the column's own values in the trace)
+# For arrivals, lognormal and empirical apply to the gaps between consecutive arrivals, so the
+# arrival process keeps its shape; jitter moves each arrival on its own. Bursts stay >= 1, arrivals >= 0.
+@dataclass(frozen=True)
+class Distribution:
+    kind: str = 'fixed'
+    scale: float = 0.0
+    samples: Optional[Tuple[int, ...]] = None
+
+    def __post_init__(self):
+        if self.kind not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown distribution '{self.kind}', expected one of {', '.join(DISTRIBUTIONS)}")
+        if self.scale < 0:
+            raise ValueError("Distribution scale must not be negative")
+        if self.samples is not None and (not self.samples or min(self.samples) < 0):
+            raise ValueError("Empirical samples must be a non-empty list of non-negative integers")
+
+    def __str__(self) -> str:
+        if self.kind in ('jitter', 'lognormal'):
+            return f"{self.kind}:{self.scale:g}"
+        if self.kind == 'empirical' and self.samples is not None:
+            return f"empirical({len(self.samples)} samples)"
+        return self.kind
+
+
+# 'fixed', 'jitter:2', 'lognormal:0.3', 'empirical' or 'empirical:FILE' (integers separated by
+# commas, spaces or newlines)
+def parse_distribution(text: str) -> Distribution:
+    kind, _, arg = text.partition(':')
+    kind = kind.strip().lower()
+    if kind in ('jitter', 'lognormal'):
+        try:
+            return Distribution(kind, float(arg))
+        except ValueError:
+            raise ValueError(f"{kind} needs a non-negative scale, e.g. {kind}:{2 if kind == 'jitter' else 0.3}")
+    if kind == 'empirical' and arg:
+        with open(arg) as file:
+            try:
+                samples = tuple(int(value) for value in file.read().replace(',', ' ').split())
+            except ValueError:
+                raise ValueError(f"{arg}: empirical samples must be integers") from None
+        return Distribution(kind, samples=samples)
+    if arg:
+        raise ValueError(f"Distribution '{kind}' takes no argument")
+    return Distribution(kind)
+
+
+# Writes replications of a base workload into reusable buffers
+class Replicator:
+    def __init__(self, workload: Workload, arrival: Distribution = Distribution(),
+                 burst: Distribution = Distribution()):
+        if burst.kind != 'fixed' and workload.io is not None:
+            raise ValueError("Burst distributions do not apply to CPU/I-O burst sequences; use --burst fixed")
+        self.workload = workload
+        self.arrival = arrival
+        self.burst = burst
+        self.order = workload.arrival_order()
+        # The buffers every replication is written into; columns without a distribution are the base ones
+        self.arrivals = array('q', workload.arrivals) if arrival.kind != 'fixed' else workload.arrivals
+        self.bursts = array('q', workload.bursts) if burst.kind != 'fixed' else workload.bursts
+        # Base values in arrival order, and the gaps between them (the first from time 0)
+        self._arrivals = [workload.arrivals[i] for i in self.order]
+        self._gaps = [b - a for a, b in zip([0] + self._arrivals, self._arrivals)]
+        self._burst_samples = burst.samples or tuple(workload.bursts)
+        self._gap_samples = arrival.samples or tuple(self._gaps)
+
+    # Replication `index` of the workload; valid until the next call (the buffers are overwritten)
+    def replicate(self, seed: Any, index: int) -> Workload:
+        rng = random.Random(f'{seed}:{index}')
+        w = self.workload
+        if self.burst.kind != 'fixed':
+            self.bursts[:] = array('q', _draw(self.burst, w.bursts, self._burst_samples, rng, 1))
+        if self.arrival.kind == 'fixed':
+            return Workload(w.pids, w.arrivals, self.bursts, w.priorities, arrival_order=self.order,
+                            deadlines=w.deadlines, periods=w.periods, io=w.io)
+
+        if self.arrival.kind == 'jitter':
+            values = _draw(self.arrival, self._arrivals, None, rng, 0)
+        else:
+            values = _accumulate(_draw(self.arrival, self._gaps, self._gap_samples, rng, 0))
+        arrivals = self.arrivals
+        for i, value in zip(self.order, values):
+            arrivals[i] = value
+        return Workload(w.pids, arrivals, self.bursts, w.priorities, deadlines=w.deadlines, periods=w.periods,
+                        io=w.io)
+
+
+# One draw per base value, never below `minimum`
+def _draw(dist: Distribution, values: Sequence[int], samples: Optional[Sequence[int]],
+          rng: random.Random, minimum: int) -> List[int]:
+    if dist.kind == 'jitter':
+        scale = int(dist.scale)
+        width = 2 * scale + 1
+        uniform = rng.random
+        return [max(minimum, v + int(uniform() * width) - scale) for v in values]
+    if dist.kind == 'lognormal':
+        sigma = dist.scale
+        mu = -sigma * sigma / 2  # mean factor of 1
+        gauss, exp = rng.gauss, math.exp
+        return [max(minimum, int(v * exp(gauss(mu, sigma)) + 0.5)) for v in values]
+    k = len(samples)
+    uniform = rng.random
+    return [max(minimum, samples[int(uniform() * k)]) for _ in range(len(values))]
+
+
+def _accumulate(gaps: Sequence[int]) -> List[int]:
+    total = 0
+    values = []
+    for gap in gaps:
+        total += gap
+        values.append(total)
+    return values
+
+
+# Partial aggregate of a set of replications; merged across workers
+class ReplicationSummary:
+    def __init__(self, percentiles: Sequence[float] = DEFAULT_PERCENTILES, relative_accuracy: float = 0.01):
+        self.percentiles = tuple(percentiles)
+        self.relative_accuracy = relative_accuracy
+        self.replications = 0
+        self.metrics: Dict[str, RunningStat] = {}
+        self.pooled = MetricsAggregator(self.percentiles, by_priority=False, relative_accuracy=relative_accuracy)
+
+    # Fold in one replication's metrics
+    def add(self, aggregator: MetricsAggregator):
+        self.replications += 1
+        for name, value in aggregator.summary().items():
+            if name == 'processes':
+                continue
+            stat = self.metrics.get(name)
+            if stat is None:
+                stat = self.metrics[name] = RunningStat(self.relative_accuracy)
+            stat.add(value)
+        self.pooled.merge(aggregator)
+
+    def merge(self, other: 'ReplicationSummary') -> 'ReplicationSummary':
+        self.replications += other.replications
+        for name, stat in other.metrics.items():
+            if name in self.metrics:
+                self.metrics[name].merge(stat)
+            else:
+                self.metrics[name] = stat
+        self.pooled.merge(other.pooled)
+        return self
+
+    # Per metric: mean, standard deviation, confidence interval of the mean, min/max and the
+    # 5th/50th/95th percentile across replications. 'pooled' has the per-process distribution over
+    # every replication (e.g. the p99 waiting time of any process in any replication).
+    def summary(self, confidence: float = 0.95) -> Dict[str, Any]:
+        metrics = {}
+        for name, stat in self.metrics.items():
+            low, high = stat.interval(confidence)
+            metrics[name] = {
+                'mean': stat.mean,
+                'std': stat.std,
+                'ci_low': low,
+                'ci_high': high,
+                'min': stat.min,
+                'max': stat.max,
+                'p5': stat.sketch.quantile(5),
+                'p50': stat.sketch.quantile(50),
+                'p95': stat.sketch.quantile(95),
+            }
+        pooled = self.pooled.summary()
+        fields = POOLED_FIELDS + tuple(f'p{p:g}_{name}' for name in ('turnaround', 'waiting')
+                                       for p in self.percentiles)
+        return {
+            'replications': self.replications,
+            'confidence': confidence,
+            'metrics': metrics,
+            'pooled': {name: pooled[name] for name in fields},
+        }
+
+
+# Run `replications` seeded replications of `algorithm` on `workload` and return the summary
+# (see ReplicationSummary.summary) with the algorithm label and the distributions used.
+# With a single worker (or a single CPU) everything runs in this process; otherwise the replications
+# are split in contiguous blocks over a process pool sharing the base workload through shared memory.
+def run_replications(workload: Workload, algorithm: str, params: Optional[Dict[str, Any]] = None,
+                     replications: int = 1000, arrival: Distribution = Distribution(),
+                     burst: Distribution = Distribution(), seed: Any = 0, max_workers: Optional[int] = None,
+                     confidence: float = 0.95, percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+                     relative_accuracy: float = 0.01) -> Dict[str, Any]:
+    if algorithm not in ENGINES:
+        raise ValueError(f"Unknown algorithm '{algorithm}'")
+    if replications < 1:
+        raise ValueError("replications must be at least 1")
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+    params = dict(params or {})
+    options = (algorithm, params, seed, tuple(percentiles), relative_accuracy)
+    workload.arrival_order()  # sorted once, shared by every replication without arrival noise
+
+    workers = max_workers or min(replications, os.cpu_count() or 1)
+    if workers <= 1 or replications <= 1:
+        total = _run_block(Replicator(workload, arrival, burst), range(replications), *options)
+    else:
+        blocks = min(replications, workers * BLOCKS_PER_WORKER)
+        bounds = [replications * b // blocks for b in range(blocks + 1)]
+        total = None
+        with SharedWorkload(workload) as shared:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(shared.handle, arrival, burst)) as pool:
+                futures = [pool.submit(_run_worker_block, range(low, high), *options)
+                           for low, high in zip(bounds, bounds[1:])]
+                for future in futures:
+                    partial = future.result()
+                    total = partial if total is None else total.merge(partial)
+
+    summary = total.summary(confidence)
+    summary.update({'algorithm': algorithm_label(algorithm, params, workload.io is not None), 'seed': seed,
+                    'arrival': str(arrival), 'burst': str(burst)})
+    return summary
+
+
+def _run_block(replicator: Replicator, indices: range, algorithm: str, params: Dict[str, Any], seed: Any,
+               percentiles: Tuple[float, ...], relative_accuracy: float) -> ReplicationSummary:
+    summary = ReplicationSummary(percentiles, relative_accuracy)
+    for index in indices:
+        result = run_algorithm(replicator.replicate(seed, index), algorithm, params)
+        summary.add(MetricsAggregator(percentiles, by_priority=False,
+                                      relative_accuracy=relative_accuracy).add_result(result))
+    return summary
+
+
+# Worker state: the attached base workload and its replication buffers, built once per worker process
+_replicator: Optional[Replicator] = None
+_shm = None
+
+
+def _init_worker(handle: Tuple[str, int, bool, int], arrival: Distribution, burst: Distribution):
+    global _replicator, _shm
+    workload, _shm = attach_workload(handle)
+    _replicator = Replicator(workload, arrival, burst)
+
+
+def _run_worker_block(indices: range, *options: Any) -> ReplicationSummary:
+    return _run_block(_replicator, indices, *options)
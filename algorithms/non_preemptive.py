@@ -0,0 +1,55 @@
+# Shared dispatch engine for non-preemptive schedulers (SJF, Priority).
+# Arrivals are walked in sorted order with a pointer and arrived processes wait
+# in a heap ordered by a key column, so each dispatch costs O(log n).
+from typing import Optional, Sequence
+from array import array
+from heapq import heappush, heappop
+from .models import Workload, ScheduleResult
+from .timeline import Timeline
+from .profiler import Profiler
+
+
+def non_preemptive_dispatch(workload: Workload, key: Sequence[int], timeline: Optional[Timeline] = None,
+                            profiler: Optional[Profiler] = None) -> ScheduleResult:
+    n = len(workload)
+    pids, arrivals, bursts = workload.pids, workload.arrivals, workload.bursts
+    start = array('q', [-1]) * n
+    completion = array('q', [0]) * n
+    current_time = 0
+
+    # Arrival order walked with a single cursor
+    order = workload.arrival_order()
+    next_arrival = 0
+
+    # Ready heap of (key, arrival_time, pid, index); the index keeps entries comparable when pids repeat
+    ready = []
+    dispatched = 0
+
+    while dispatched < n:
+        # Move every process that has arrived into the ready heap
+        while next_arrival < n and arrivals[order[next_arrival]] <= current_time:
+            i = order[next_arrival]
+            heappush(ready, (key[i], arrivals[i], pids[i], i))
+            next_arrival += 1
+
+        if not ready:
+            # No process available, jump to next arrival
+            current_time = arrivals[order[next_arrival]]
+            if profiler is not None:
+                profiler.idle_jumps += 1
+            continue
+
+        # Select the process with the smallest key
+        i = heappop(ready)[3]
+        if profiler is not None:
+            profiler.dispatch(pids[i], current_time, len(ready))
+
+        # Log of the start and execution of the entire process (without interruptions)
+        start[i] = current_time
+        current_time += bursts[i]
+        completion[i] = current_time
+        dispatched += 1
+        if timeline is not None:
+            timeline.add(pids[i], start[i], current_time)
+
+    return ScheduleResult(workload, start, completion)
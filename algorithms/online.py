@@ -0,0 +1,203 @@
+# Online (incremental) schedulers: submit processes as they are known and advance
+# the clock; completions are yielded as they happen instead of replaying a batch.
+#
+#   scheduler = OnlineSRTF()
+#   scheduler.submit(Process(pid=1, arrival_time=0, burst_time=5))
+#   for done in scheduler.advance_to(3): ...
+#   for done in scheduler.drain(): ...
+#
+# advance_to(t) simulates every decision before t. Decisions at exactly t are deferred,
+# so a process arriving at t can still be submitted afterwards and is treated exactly
+# like in the batch schedulers. Completed processes are the submitted Process objects
+# with their metrics filled in. advance_to/drain are generators: iterate them to advance.
+# Each submit and dispatch costs O(log n).
+from typing import Iterator, Optional
+from collections import deque
+from heapq import heappush, heappop
+from .models import Process
+from .timeline import Timeline
+
+
+class OnlineScheduler:
+    def __init__(self, timeline: Optional[Timeline] = None):
+        self.clock = 0
+        self.timeline = timeline
+        self._pending = []  # future arrivals: (arrival_time, pid, seq, process)
+        self._seq = 0
+        self._running: Optional[Process] = None
+        self._slice_start = 0
+        self.completed_count = 0
+
+    # Number of submitted processes that have not completed yet
+    def __len__(self) -> int:
+        return len(self._pending) + self._ready_size() + (self._running is not None)
+
+    def submit(self, process: Process):
+        if process.arrival_time < self.clock:
+            raise ValueError(f"Process {process.pid} arrives at {process.arrival_time}, "
+                             f"before the scheduler clock ({self.clock})")
+        process.remaining_time = process.burst_time
+        process.start_time = -1
+        heappush(self._pending, (process.arrival_time, process.pid, self._seq, process))
+        self._seq += 1
+
+    def advance_to(self, time: int) -> Iterator[Process]:
+        if time < self.clock:
+            raise ValueError(f"Cannot move the clock back from {self.clock} to {time}")
+        return self._simulate(time)
+
+    # Run until every submitted process has completed
+    def drain(self) -> Iterator[Process]:
+        return self._simulate(None)
+
+    def _simulate(self, until: Optional[int]) -> Iterator[Process]:
+        pending = self._pending
+        while True:
+            running = self._running
+            if running is not None and running.remaining_time == 0:
+                self._running = None
+                yield self._complete(running)
+                running = None
+
+            # Decisions at `until` wait for the next call
+            if until is not None and self.clock >= until:
+                return
+
+            # Admit arrivals up to now
+            while pending and pending[0][0] <= self.clock:
+                self._enqueue(heappop(pending)[3])
+
+            if running is not None and self._should_requeue(running):
+                self._enqueue(running)
+                running = self._running = None
+
+            if running is None:
+                if not self._ready_size():
+                    if not pending:
+                        if until is not None:
+                            self.clock = until
+                        return
+                    # CPU idle, jump to the next arrival (or stop at `until`)
+                    next_arrival = pending[0][0]
+                    self.clock = next_arrival if until is None else min(next_arrival, until)
+                    continue
+                running = self._running = self._dequeue()
+                self._slice_start = self.clock
+                if running.start_time == -1:
+                    running.start_time = self.clock
+
+            # Run until the next point where the decision could change
+            event = self.clock + running.remaining_time
+            if pending and pending[0][0] < event:
+                event = pending[0][0]
+            slice_end = self._slice_end()
+            if slice_end is not None and slice_end < event:
+                event = slice_end
+            if until is not None and event > until:
+                event = until
+            running.remaining_time -= event - self.clock
+            if self.timeline is not None:
+                self.timeline.add(running.pid, self.clock, event)
+            self.clock = event
+
+    def _complete(self, process: Process) -> Process:
+        process.completion_time = self.clock
+        process.turnaround_time = process.completion_time - process.arrival_time
+        process.waiting_time = process.turnaround_time - process.burst_time
+        self.completed_count += 1
+        return process
+
+    # Ready queue discipline, implemented by each policy
+    def _enqueue(self, process: Process):
+        raise NotImplementedError
+
+    def _dequeue(self) -> Process:
+        raise NotImplementedError
+
+    def _ready_size(self) -> int:
+        raise NotImplementedError
+
+    # Whether the running process goes back to the ready queue now (preemption / quantum expiry)
+    def _should_requeue(self, running: Process) -> bool:
+        return False
+
+    # Time at which the current slice ends, None when slices are unbounded (only Round Robin limits them)
+    def _slice_end(self) -> Optional[int]:
+        return None
+
+
+# Ready queue kept in a heap ordered by _key(process); ties end on the submission sequence
+class _HeapScheduler(OnlineScheduler):
+    preemptive = False
+
+    def __init__(self, timeline: Optional[Timeline] = None):
+        super().__init__(timeline)
+        self._ready = []
+
+    def _key(self, p: Process):
+        raise NotImplementedError
+
+    def _enqueue(self, process: Process):
+        heappush(self._ready, (self._key(process), self._seq, process))
+        self._seq += 1
+
+    def _dequeue(self) -> Process:
+        return heappop(self._ready)[2]
+
+    def _ready_size(self) -> int:
+        return len(self._ready)
+
+    def _should_requeue(self, running: Process) -> bool:
+        return self.preemptive and bool(self._ready) and self._ready[0][0] < self._key(running)
+
+
+class OnlineFCFS(OnlineScheduler):
+    def __init__(self, timeline: Optional[Timeline] = None):
+        super().__init__(timeline)
+        self._ready = deque()
+
+    # Arrivals are admitted in (arrival_time, pid) order, so a FIFO queue is enough
+    def _enqueue(self, process: Process):
+        self._ready.append(process)
+
+    def _dequeue(self) -> Process:
+        return self._ready.popleft()
+
+    def _ready_size(self) -> int:
+        return len(self._ready)
+
+
+class OnlineSJF(_HeapScheduler):
+    def _key(self, p: Process):
+        return (p.burst_time, p.arrival_time, p.pid)
+
+
+class OnlineSRTF(_HeapScheduler):
+    preemptive = True
+
+    def _key(self, p: Process):
+        return (p.remaining_time, p.arrival_time, p.pid)
+
+
+class OnlinePriority(_HeapScheduler):
+    def _key(self, p: Process):
+        return (p.priority, p.arrival_time, p.pid)
+
+
+class OnlinePriorityPreemptive(OnlinePriority):
+    preemptive = True
+
+
+class OnlineRoundRobin(OnlineFCFS):
+    def __init__(self, quantum: int, timeline: Optional[Timeline] = None):
+        if quantum <= 0:
+            raise ValueError("Quantum must be positive")
+        super().__init__(timeline)
+        self.quantum = quantum
+
+    # Quantum used up: back to the tail, behind anything that arrived during the slice
+    def _should_requeue(self, running: Process) -> bool:
+        return self.clock - self._slice_start >= self.quantum
+
+    def _slice_end(self) -> Optional[int]:
+        return self._slice_start + self.quantum
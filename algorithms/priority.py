@@ -1,41 +1,19 @@
 # Priority Scheduling (Non-Preemptive) algorithm.
 # Lower priority number = Higher priority.
-from typing import List
-from copy import deepcopy
-from .models import Process
+from typing import List, Optional
+from .models import Process, Workload, ScheduleResult
+from .non_preemptive import non_preemptive_dispatch
+from .timeline import Timeline
+from .profiler import Profiler
 
 
-def priority_scheduler(processes: List[Process]) -> List[Process]:
-    processes = deepcopy(processes)
-    n = len(processes)
-    completed = []
-    current_time = 0
-    completed_count = 0
-    
-    while completed_count < n:
-        # Find available processes
-        available = [p for p in processes if p.arrival_time <= current_time and p not in completed]
+def priority_scheduler(processes: List[Process], timeline: Optional[Timeline] = None) -> List[Process]:
+    result = run_priority(Workload.from_processes(processes), timeline)
+    return result.processes(result.completion_order())
 
-        if not available:
-            # No process available, jump to next arrival
-            current_time = min(p.arrival_time for p in processes if p not in completed)
-            continue
-        
-        # Select process with highest priority (lowest number)
-        # Tie-break: arrival_time, then pid
-        selected = min(available, key=lambda p: (p.priority, p.arrival_time, p.pid))
-        
-        # Log of the start and execution of the entire process (without interruptions)
-        selected.start_time = current_time
-        current_time += selected.burst_time
 
-        # Calculate CT, TTA and WT
-        selected.completion_time = current_time
-        selected.turnaround_time = selected.completion_time - selected.arrival_time
-        selected.waiting_time = selected.turnaround_time - selected.burst_time
-        
-        # Add the process to the completed list
-        completed.append(selected)
-        completed_count += 1
-    
-    return completed
\ No newline at end of file
+def run_priority(workload: Workload, timeline: Optional[Timeline] = None,
+                 profiler: Optional[Profiler] = None) -> ScheduleResult:
+    # Select process with highest priority (lowest number)
+    # Tie-break: arrival_time, then pid
+    return non_preemptive_dispatch(workload, key=workload.priorities, timeline=timeline, profiler=profiler)
@@ -1,49 +1,146 @@
-# Priority Scheduling (Non-Preemptive) algorithm.
+# Priority Scheduling (Preemptive) algorithm.
 # Lower priority number = Higher priority.
-from typing import List
-from copy import deepcopy
-from .models import Process
-def priority_preemptive(processes: List[Process]) -> List[Process]:
-    processes = deepcopy(processes)
-    n = len(processes)
+from typing import List, Optional
+from array import array
+from dataclasses import dataclass
+from heapq import heappush, heappop
+from .models import Process, Workload, ScheduleResult, IndexedHeap
+from .timeline import Timeline
+from .profiler import Profiler
+
+
+# Aging policy: every `interval` time units a process spends waiting in the
+# ready queue, its priority is raised by `step` (never past `floor`; a priority
+# already better than `floor` is left as it is).
+# Subclass and override `age` for other policies.
+@dataclass
+class AgingPolicy:
+    interval: int
+    step: int = 1
+    floor: int = 0
+
+    def __post_init__(self):
+        if self.interval <= 0:
+            raise ValueError("Aging interval must be positive")
+
+    # Priority after one more aging interval
+    def age(self, priority: int) -> int:
+        if priority <= self.floor:
+            return priority
+        return max(self.floor, priority - self.step)
+
+
+def priority_preemptive(processes: List[Process], aging: Optional[AgingPolicy] = None,
+                        timeline: Optional[Timeline] = None) -> List[Process]:
+    return run_priority_preemptive(Workload.from_processes(processes), aging, timeline).processes()
+
+
+def run_priority_preemptive(workload: Workload, aging: Optional[AgingPolicy] = None,
+                            timeline: Optional[Timeline] = None,
+                            profiler: Optional[Profiler] = None) -> ScheduleResult:
+    n = len(workload)
+    pids, arrivals = workload.pids, workload.arrivals
+    remaining = list(workload.bursts)
+    start = array('q', [-1]) * n
+    completion = array('q', [0]) * n
     current_time = 0
     completed_count = 0
 
+    # Arrival order (tie-break by pid) walked with a single cursor
+    order = workload.arrival_order()
+    next_arrival = 0
+
+    # Ready queue keyed on (priority, arrival_time, pid); indexed so aging can change a key in place
+    ready = IndexedHeap()
+    priority = list(workload.priorities)  # effective priority, the workload keeps the original one
+
+    # Aging events (time, index); an event is stale unless aging_due[index] still matches it
+    aging_events = []
+    aging_due = [-1] * n
+    running = None  # index of the process on the CPU
+
+    def make_ready(idx: int):
+        ready.push(idx, (priority[idx], arrivals[idx], pids[idx]))
+        if aging is not None and aging.age(priority[idx]) != priority[idx]:
+            aging_due[idx] = current_time + aging.interval
+            heappush(aging_events, (aging_due[idx], idx))
+
     while completed_count < n:
 
-        # Processes that have arrived and are not finished
-        available = [
-            p for p in processes
-            if p.arrival_time <= current_time and p.remaining_time > 0
-        ]
+        # Processes that have arrived by now join the ready queue
+        while next_arrival < n and arrivals[order[next_arrival]] <= current_time:
+            make_ready(order[next_arrival])
+            next_arrival += 1
 
-        # If no process available, CPU idle → advance time
-        if not available:
-            current_time += 1
-            continue
+        # Apply every aging event that is due, scheduling the next one for the same process
+        while aging_events and aging_events[0][0] <= current_time:
+            due, idx = heappop(aging_events)
+            if aging_due[idx] != due:
+                continue
+            priority[idx] = aging.age(priority[idx])
+            ready.update(idx, (priority[idx], arrivals[idx], pids[idx]))
+            if aging.age(priority[idx]) != priority[idx]:
+                aging_due[idx] = due + aging.interval
+                heappush(aging_events, (aging_due[idx], idx))
+            else:
+                aging_due[idx] = -1
 
-        # Select process with:
-        # 1. Highest priority (smallest priority number)
-        # 2. If tie → earlier arrival
-        # 3. If tie → smaller PID
-        selected = min(
-            available,
-            key=lambda p: (p.priority, p.arrival_time, p.pid)
-        )
+        if running is None:
+            # If no process available, CPU idle → jump to the next arrival
+            if not ready:
+                current_time = arrivals[order[next_arrival]]
+                if profiler is not None:
+                    profiler.idle_jumps += 1
+                continue
+
+            # Select process with:
+            # 1. Highest priority (smallest priority number)
+            # 2. If tie → earlier arrival
+            # 3. If tie → smaller PID
+            _, running = ready.pop()
+            aging_due[running] = -1  # running processes do not age
+            if profiler is not None:
+                profiler.dispatch(pids[running], current_time, len(ready))
+
+        elif ready and ready.peek()[0] < (priority[running], arrivals[running], pids[running]):
+            # Preempted by an arrival or an aged process with a better key
+            make_ready(running)
+            if profiler is not None:
+                profiler.stop(pids[running])
+            _, running = ready.pop()
+            aging_due[running] = -1
+            if profiler is not None:
+                profiler.dispatch(pids[running], current_time, len(ready))
 
         # First time the process is ever executed
-        if selected.start_time == -1:
-            selected.start_time = current_time
+        if start[running] == -1:
+            start[running] = current_time
 
-        # Execute 1 time unit
-        selected.remaining_time -= 1
-        current_time += 1
+        # Next point where the choice could change: an arrival or a valid aging event
+        while aging_events and aging_due[aging_events[0][1]] != aging_events[0][0]:
+            heappop(aging_events)
+        finish_time = current_time + remaining[running]
+        next_event = finish_time
+        if next_arrival < n:
+            next_event = min(next_event, arrivals[order[next_arrival]])
+        if aging_events:
+            next_event = min(next_event, aging_events[0][0])
+
+        # Interrupted before finishing: keep running until the choice is re-evaluated
+        if next_event < finish_time:
+            remaining[running] -= next_event - current_time
+            if timeline is not None:
+                timeline.add(pids[running], current_time, next_event)
+            current_time = next_event
+            continue
 
-        # If finished
-        if selected.remaining_time == 0:
-            selected.completion_time = current_time
-            selected.turnaround_time = selected.completion_time - selected.arrival_time
-            selected.waiting_time = selected.turnaround_time - selected.burst_time
-            completed_count += 1
+        # Finished
+        remaining[running] = 0
+        if timeline is not None:
+            timeline.add(pids[running], current_time, finish_time)
+        current_time = finish_time
+        completion[running] = current_time
+        completed_count += 1
+        running = None
 
-    return processes
+    return ScheduleResult(workload, start, completion)
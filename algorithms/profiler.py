@@ -0,0 +1,72 @@
+# Opt-in instrumentation for the scheduler engines.
+# Engines take `profiler=None` and only touch it behind `if profiler is not None`, as they do with a
+# Timeline, so a run without a profiler pays one None check per dispatch and nothing else.
+# Counted per run:
+#   decisions    processes picked from the ready set (one per dispatch)
+#   preemptions  a CPU given to another process while the previous one still had work left
+#   idle_jumps   times the CPU was idle and the clock jumped to the next arrival
+#   ready queue  processes left waiting at each decision (mean and max)
+# Phases time coarse steps (reading, sorting, scheduling, metrics, ...) with `phase(name)`.
+from typing import Any, Callable, Dict, Iterator, Optional
+from contextlib import contextmanager
+import json
+from time import perf_counter
+
+# on_dispatch(pid, time, ready, cpu): the process dispatched, the simulated time, the number of
+# processes left waiting and the CPU (always 0 for single-CPU engines)
+DispatchHook = Callable[[int, int, int, int], None]
+
+
+class Profiler:
+    def __init__(self, on_dispatch: Optional[DispatchHook] = None):
+        self.on_dispatch = on_dispatch
+        self.decisions = 0
+        self.preemptions = 0
+        self.idle_jumps = 0
+        self.ready_total = 0
+        self.ready_max = 0
+        self.phases: Dict[str, float] = {}
+        self._stopped: Dict[int, int] = {}  # cpu -> pid taken off it unfinished, until its next decision
+
+    # A scheduling decision: `pid` starts running on `cpu` at `time` with `ready` processes still waiting
+    def dispatch(self, pid: int, time: int, ready: int, cpu: int = 0):
+        self.decisions += 1
+        self.ready_total += ready
+        if ready > self.ready_max:
+            self.ready_max = ready
+        if self._stopped:
+            stopped = self._stopped.pop(cpu, None)
+            if stopped is not None and stopped != pid:
+                self.preemptions += 1
+        if self.on_dispatch is not None:
+            self.on_dispatch(pid, time, ready, cpu)
+
+    # `pid` leaves `cpu` before finishing; a preemption if the next decision there picks someone else
+    def stop(self, pid: int, cpu: int = 0):
+        self._stopped[cpu] = pid
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + perf_counter() - started
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            'decisions': self.decisions,
+            'preemptions': self.preemptions,
+            'idle_jumps': self.idle_jumps,
+            'ready_queue': {
+                'mean': self.ready_total / self.decisions if self.decisions else 0.0,
+                'max': self.ready_max,
+            },
+            'phases': dict(self.phases),
+            'total_time': sum(self.phases.values()),
+        }
+
+    def dump(self, filename: str, **extra: Any):
+        with open(filename, 'w') as file:
+            json.dump({**extra, **self.report()}, file, indent=2)
+            file.write('\n')
@@ -0,0 +1,314 @@
+# Real-time scheduling: Earliest Deadline First (EDF) and Rate Monotonic (RM).
+# Workload.deadlines holds relative deadlines (absolute deadline = arrival_time + deadline) and
+# Workload.periods the release period of periodic tasks. A deadline of 0 means the period; a job
+# with neither has no deadline and only runs when no job with one is ready.
+# A row with a period is a periodic task, expanded into one job per release up to the horizon
+# (expand_periodic), so the result has one row per job, with the task's pid.
+# Both policies are preemptive and event driven: the ready heap is keyed on (absolute deadline,
+# arrival_time, pid) for EDF and (period, arrival_time, pid) for RM. Queued keys never change, the
+# running job is kept out of the heap and time only advances to arrivals and completions.
+# schedulability() is the O(n) utilization test (U <= 1 for EDF, the Liu & Layland and hyperbolic
+# bounds for RM); analyze() only simulates when that test is inconclusive.
+from typing import Any, Dict, List, Optional, Sequence
+from array import array
+from dataclasses import dataclass
+from heapq import heappush, heappop, heappushpop
+import math
+from .models import Process, Workload, ScheduleResult
+from .metrics import QuantileSketch, DEFAULT_PERCENTILES
+from .timeline import Timeline
+from .profiler import Profiler
+
+# Key of jobs without a deadline (EDF) or period (RM): after every job that has one
+NO_DEADLINE = 1 << 62
+
+# Default horizon of periodic tasks: the hyperperiod after the last first release, but at most
+# this many periods of the slowest task
+MAX_HORIZON_PERIODS = 100
+
+# Verdicts of the schedulability test
+FEASIBLE = 'feasible'
+INFEASIBLE = 'infeasible'
+UNKNOWN = 'unknown'
+
+# Utilization sums are floating point; a set at exactly U = 1 must not fail on rounding
+EPSILON = 1e-9
+
+
+@dataclass
+class RealTimeStats:
+    jobs: int               # jobs released (rows after expanding the periodic tasks)
+    dispatches: int
+    preemptions: int
+    deadline_misses: int
+
+
+@dataclass
+class Schedulability:
+    verdict: str            # FEASIBLE, INFEASIBLE or UNKNOWN (simulate to find out)
+    utilization: float      # sum of burst / period over the periodic tasks
+    bound: Optional[float]  # the bound the utilization was compared with, if any
+    reason: str
+
+
+def edf_scheduler(processes: List[Process], horizon: Optional[int] = None,
+                  timeline: Optional[Timeline] = None) -> List[Process]:
+    return run_edf(Workload.from_processes(processes), horizon, timeline).processes()
+
+
+def rate_monotonic_scheduler(processes: List[Process], horizon: Optional[int] = None,
+                             timeline: Optional[Timeline] = None) -> List[Process]:
+    return run_rate_monotonic(Workload.from_processes(processes), horizon, timeline).processes()
+
+
+def run_edf(workload: Workload, horizon: Optional[int] = None, timeline: Optional[Timeline] = None,
+            profiler: Optional[Profiler] = None) -> ScheduleResult:
+    return _run_realtime(workload, 'EDF', horizon, timeline, profiler)
+
+
+def run_rate_monotonic(workload: Workload, horizon: Optional[int] = None, timeline: Optional[Timeline] = None,
+                       profiler: Optional[Profiler] = None) -> ScheduleResult:
+    return _run_realtime(workload, 'RM', horizon, timeline, profiler)
+
+
+# Relative deadline of every row: the deadline column, else the period, else 0 (no deadline)
+def relative_deadlines(workload: Workload) -> List[int]:
+    deadlines, periods = workload.deadlines, workload.periods
+    if deadlines is None:
+        return list(periods) if periods is not None else [0] * len(workload)
+    if periods is None:
+        return list(deadlines)
+    return [d or p for d, p in zip(deadlines, periods)]
+
+
+# One row per job: every periodic task releases a job at arrival_time + k * period for as long as the
+# release is before `horizon` (at least its first one). Jobs keep the task's pid, burst, priority,
+# relative deadline and period. Workloads without periodic tasks are returned as they are.
+def expand_periodic(workload: Workload, horizon: Optional[int] = None) -> Workload:
+    periods = workload.periods
+    if periods is None or not any(periods):
+        return workload
+    if horizon is None:
+        horizon = default_horizon(workload)
+    elif horizon <= 0:
+        raise ValueError("Horizon must be positive")
+
+    relative = relative_deadlines(workload)
+    pids, arrivals, bursts, priorities = array('q'), array('q'), array('q'), array('q')
+    deadlines, job_periods = array('q'), array('q')
+    for i in range(len(workload)):
+        first, period = workload.arrivals[i], periods[i]
+        releases = range(first, max(horizon, first + 1), period) if period else (first,)
+        count = len(releases)
+        pids.extend(array('q', [workload.pids[i]]) * count)
+        arrivals.extend(array('q', releases))
+        bursts.extend(array('q', [workload.bursts[i]]) * count)
+        priorities.extend(array('q', [workload.priorities[i]]) * count)
+        deadlines.extend(array('q', [relative[i]]) * count)
+        job_periods.extend(array('q', [period]) * count)
+    return Workload(pids, arrivals, bursts, priorities, deadlines=deadlines, periods=job_periods)
+
+
+# The hyperperiod (lcm of the periods) after the last first release, capped at MAX_HORIZON_PERIODS
+# times the longest period
+def default_horizon(workload: Workload) -> int:
+    periods = [p for p in workload.periods if p] if workload.periods is not None else []
+    if not periods:
+        return max(workload.arrivals, default=0) + 1
+    longest = max(periods)
+    hyperperiod = 1
+    for period in set(periods):
+        hyperperiod = hyperperiod * period // math.gcd(hyperperiod, period)
+        if hyperperiod > longest * MAX_HORIZON_PERIODS:
+            hyperperiod = longest * MAX_HORIZON_PERIODS
+            break
+    last_release = max(a for a, p in zip(workload.arrivals, workload.periods) if p)
+    return last_release + hyperperiod
+
+
+# With periodic tasks the result is over the expanded job workload, not the input: it has one row
+# per job (more rows than the input) and result.workload is that job workload. Consumers must read
+# the columns from result.workload (as metrics, export and compare do), never zip the result with
+# the input rows, and the result cache does not store it (it could not be matched to the input).
+def _run_realtime(workload: Workload, policy: str, horizon: Optional[int], timeline: Optional[Timeline],
+                  profiler: Optional[Profiler]) -> ScheduleResult:
+    workload = expand_periodic(workload, horizon)
+    n = len(workload)
+    pids, arrivals = workload.pids, workload.arrivals
+    remaining = list(workload.bursts)
+    start = array('q', [-1]) * n
+    completion = array('q', [0]) * n
+    current_time = 0
+    completed_count = 0
+
+    deadline = [a + d if d else NO_DEADLINE for a, d in zip(arrivals, relative_deadlines(workload))]
+    if policy == 'EDF':
+        key = deadline
+    elif workload.periods is not None:
+        key = [p or NO_DEADLINE for p in workload.periods]
+    else:
+        key = [NO_DEADLINE] * n  # no periodic tasks: plain preemptive FCFS
+
+    # Arrival order (tie-break by pid) walked with a single cursor
+    order = workload.arrival_order()
+    next_arrival = 0
+
+    # Ready heap of (key, arrival_time, pid, index); the running job is not in it
+    ready = []
+    running = -1
+    dispatches = preemptions = misses = 0
+
+    while completed_count < n:
+
+        # Jobs released by now join the ready heap
+        while next_arrival < n and arrivals[order[next_arrival]] <= current_time:
+            i = order[next_arrival]
+            heappush(ready, (key[i], arrivals[i], pids[i], i))
+            next_arrival += 1
+
+        if running < 0:
+            # CPU idle, jump straight to the next release
+            if not ready:
+                current_time = arrivals[order[next_arrival]]
+                if profiler is not None:
+                    profiler.idle_jumps += 1
+                continue
+            running = heappop(ready)[3]
+            dispatches += 1
+            if profiler is not None:
+                profiler.dispatch(pids[running], current_time, len(ready))
+
+        elif ready and ready[0][:3] < (key[running], arrivals[running], pids[running]):
+            # A released job with an earlier deadline (EDF) or shorter period (RM) takes the CPU
+            if profiler is not None:
+                profiler.stop(pids[running])
+            running = heappushpop(ready, (key[running], arrivals[running], pids[running], running))[3]
+            dispatches += 1
+            preemptions += 1
+            if profiler is not None:
+                profiler.dispatch(pids[running], current_time, len(ready))
+
+        # First time the job is ever executed
+        if start[running] == -1:
+            start[running] = current_time
+
+        # Run until it finishes or the next job is released, whichever comes first
+        finish_time = current_time + remaining[running]
+        if next_arrival < n and arrivals[order[next_arrival]] < finish_time:
+            release = arrivals[order[next_arrival]]
+            remaining[running] -= release - current_time
+            if timeline is not None:
+                timeline.add(pids[running], current_time, release)
+            current_time = release
+            continue
+
+        # Finished
+        remaining[running] = 0
+        if timeline is not None:
+            timeline.add(pids[running], current_time, finish_time)
+        current_time = finish_time
+        completion[running] = current_time
+        if current_time > deadline[running]:
+            misses += 1
+        completed_count += 1
+        running = -1
+
+    return ScheduleResult(workload, start, completion, RealTimeStats(n, dispatches, preemptions, misses))
+
+
+# O(n) schedulability test of `workload` under 'EDF' or 'RM' on one CPU.
+#   - a job with more burst than time to its deadline can never make it: infeasible
+#   - only periodic task sets are tested further (UNKNOWN with any one-shot job that has a deadline)
+#   - U = sum(burst / period) > 1: the CPU is overloaded, infeasible under any policy
+#   - EDF: density sum(burst / min(deadline, period)) <= 1 is enough (exact when deadlines are the periods)
+#   - RM, deadlines not shorter than the periods: U <= m(2^(1/m) - 1) (Liu & Layland) or
+#     prod(U_i + 1) <= 2 (hyperbolic bound) is enough
+def schedulability(workload: Workload, policy: str = 'EDF') -> Schedulability:
+    if policy not in ('EDF', 'RM'):
+        raise ValueError(f"No schedulability test for '{policy}', expected EDF or RM")
+    relative = relative_deadlines(workload)
+    pids, bursts = workload.pids, workload.bursts
+    periods = workload.periods if workload.periods is not None else [0] * len(workload)
+
+    aperiodic = False
+    for pid, burst, deadline, period in zip(pids, bursts, relative, periods):
+        if deadline and burst > deadline:
+            return Schedulability(INFEASIBLE, math.nan, None,
+                                  f"pid {pid} needs {burst} ms but its deadline is {deadline} ms after arrival")
+        if deadline and not period:
+            aperiodic = True
+    utilization = math.fsum(b / p for b, p in zip(bursts, periods) if p)
+    if not any(relative):
+        return Schedulability(FEASIBLE, utilization, None, "no deadlines")
+    if aperiodic:
+        return Schedulability(UNKNOWN, utilization, None, "one-shot jobs with deadlines need a simulation")
+    if utilization > 1 + EPSILON:
+        return Schedulability(INFEASIBLE, utilization, 1.0, f"U = {utilization:.4f} > 1")
+
+    if policy == 'EDF':
+        density = math.fsum(b / min(d, p) for b, d, p in zip(bursts, relative, periods) if p)
+        if density <= 1 + EPSILON:
+            name = "U" if density == utilization else "density"
+            return Schedulability(FEASIBLE, utilization, 1.0, f"{name} = {density:.4f} <= 1")
+        return Schedulability(UNKNOWN, utilization, 1.0, f"density = {density:.4f} > 1 with constrained deadlines")
+
+    if any(d < p for d, p in zip(relative, periods) if p):
+        return Schedulability(UNKNOWN, utilization, None, "the RM bounds need deadlines of at least the period")
+    m = sum(1 for p in periods if p)
+    bound = m * (2 ** (1 / m) - 1)
+    if utilization <= bound + EPSILON:
+        return Schedulability(FEASIBLE, utilization, bound, f"U = {utilization:.4f} <= {bound:.4f} (Liu & Layland)")
+    product = 1.0
+    for b, p in zip(bursts, periods):
+        if p:
+            product *= 1 + b / p
+    if product <= 2 + EPSILON:
+        return Schedulability(FEASIBLE, utilization, bound, f"prod(U_i + 1) = {product:.4f} <= 2 (hyperbolic bound)")
+    return Schedulability(UNKNOWN, utilization, bound, f"U = {utilization:.4f} is above the RM bound {bound:.4f}")
+
+
+# Deadline misses and lateness (completion - absolute deadline) of the jobs that have a deadline in
+# any result, whatever the algorithm; tardiness is the lateness of late jobs and 0 otherwise.
+def deadline_report(result: ScheduleResult, percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> Dict[str, Any]:
+    w = result.workload
+    tardiness = QuantileSketch()
+    jobs = misses = 0
+    lateness_sum = 0
+    max_lateness = None
+    for arrival, deadline, completion in zip(w.arrivals, relative_deadlines(w), result.completion):
+        if not deadline:
+            continue
+        lateness = completion - arrival - deadline
+        jobs += 1
+        lateness_sum += lateness
+        if max_lateness is None or lateness > max_lateness:
+            max_lateness = lateness
+        if lateness > 0:
+            misses += 1
+        tardiness.add(max(0, lateness))
+    report = {
+        'jobs': jobs,
+        'deadline_misses': misses,
+        'miss_ratio': misses / jobs if jobs else 0.0,
+        'avg_lateness': lateness_sum / jobs if jobs else 0.0,
+        'max_lateness': max_lateness or 0,
+    }
+    for p in percentiles:
+        report[f'p{p:g}_tardiness'] = tardiness.quantile(p) if jobs else 0
+    return report
+
+
+# Schedulability test first; the policy is only simulated when the test is inconclusive.
+# For sweeps over many task sets this skips the simulation of every clearly (in)feasible one.
+def analyze(workload: Workload, policy: str = 'EDF', horizon: Optional[int] = None) -> Dict[str, Any]:
+    test = schedulability(workload, policy)
+    analysis = {'verdict': test.verdict, 'method': 'utilization', 'utilization': test.utilization,
+                'bound': test.bound, 'reason': test.reason}
+    if test.verdict != UNKNOWN:
+        return analysis
+    engine = run_edf if policy == 'EDF' else run_rate_monotonic
+    report = deadline_report(engine(workload, horizon))
+    analysis.update(report)
+    analysis['method'] = 'simulation'
+    analysis['verdict'] = INFEASIBLE if report['deadline_misses'] else FEASIBLE
+    return analysis
@@ -0,0 +1,198 @@
+# Algorithm registry.
+# Every algorithm declares its CLI name, where its engine lives, its parameters and capabilities.
+# The engine module is only imported when the algorithm is selected, so the CLI starts without
+# loading the engines it does not use. Third-party policies register through the
+# 'cpu_scheduler.algorithms' entry point group: each entry is named after the algorithm and points
+# to an Algorithm (or a callable returning one), e.g. in pyproject.toml
+#   [project.entry-points."cpu_scheduler.algorithms"]
+#   LOTTERY = "my_policies:LOTTERY"
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from collections.abc import Mapping
+from dataclasses import dataclass
+import importlib
+from .models import DEFAULT_QUANTA, DEFAULT_TARGET_LATENCY, DEFAULT_MIN_GRANULARITY, DEFAULT_WAKEUP_GRANULARITY
+
+ENTRY_POINT_GROUP = 'cpu_scheduler.algorithms'
+
+
+# Comma separated positive integers, e.g. q=8,16,32
+def int_list(value: str) -> Tuple[int, ...]:
+    return tuple(int(v) for v in value.split(','))
+
+
+# A key=value CLI parameter passed to the engine as keyword `name`
+@dataclass(frozen=True)
+class Param:
+    key: str                                # CLI name, e.g. 'q' in q=2
+    name: str                               # engine keyword argument
+    parse: Callable[[str], Any] = int
+    default: Any = None                     # None: not passed to the engine
+    required: bool = False
+    minimum: Optional[int] = 1              # lower bound of the value (of every item for lists)
+
+    def convert(self, value: str) -> Any:
+        parsed = self.parse(value)
+        if self.minimum is not None:
+            for item in (parsed if isinstance(parsed, tuple) else (parsed,)):
+                if item < self.minimum:
+                    raise ValueError(f"{self.key} must be at least {self.minimum}")
+        return parsed
+
+
+@dataclass(frozen=True)
+class Algorithm:
+    name: str
+    engine: str                             # 'module:function', modules relative to this package start with '.'
+    title: Union[str, Callable[[Dict[str, Any]], str]]  # format string over the params, or a callable
+    params: Tuple[Param, ...] = ()
+    output_file: str = ''
+    example: str = ''                       # CLI arguments after the input file, shown on errors
+    has_priority: bool = False              # reads Process.priority
+    preemptive: bool = False
+    smp: bool = True                        # usable as a per-core policy with --cores
+    timeline: bool = True                   # engine accepts timeline=
+    profile: bool = True                    # engine accepts profiler= (an algorithms.profiler.Profiler)
+    realtime: bool = False                  # has an algorithms.realtime.schedulability test (--check)
+    cli: bool = True                        # selectable from scheduler.py
+
+    def load(self) -> Callable[..., Any]:
+        module, _, function = self.engine.partition(':')
+        return getattr(importlib.import_module(module, __package__), function)
+
+    # Engine keyword arguments from the key=value CLI arguments; raises ValueError on bad input
+    def parse_args(self, args: Sequence[str]) -> Dict[str, Any]:
+        by_key = {param.key: param for param in self.params}
+        values = {}
+        for arg in args:
+            key, sep, value = arg.partition('=')
+            if not sep or key not in by_key:
+                raise ValueError(f"Unknown {self.name} parameter '{arg}'")
+            values[key] = by_key[key].convert(value)
+        params = {}
+        for param in self.params:
+            if param.key in values:
+                params[param.name] = values[param.key]
+            elif param.required:
+                raise ValueError(f"{self.name} requires the {param.key}=value parameter")
+            elif param.default is not None:
+                params[param.name] = param.default
+        return params
+
+    def describe(self, params: Dict[str, Any]) -> str:
+        if callable(self.title):
+            return self.title(params)
+        return self.title.format(**params)
+
+
+def _mlfq_title(params: Dict[str, Any]) -> str:
+    quanta = ','.join(map(str, params['quanta']))
+    boost = f", Boost = {params['boost_interval']} ms" if params.get('boost_interval') else ""
+    return f"Multilevel Feedback Queue (Quanta = {quanta} ms{boost})"
+
+
+BUILTIN = (
+    Algorithm('FCFS', '.fcfs:run_fcfs', "First Come First Serve (FCFS)", output_file="output_fcfs.csv"),
+    Algorithm('SJF', '.sjf_non_preemptive:run_sjf', "Shortest Job First (Non-Preemptive)",
+              output_file="output_sjf.csv"),
+    Algorithm('SJF_P', '.sjf_preemptive:run_srtf', "Shortest Job First (Preemptive/SRTF)",
+              output_file="output_sjf_preemptive.csv", preemptive=True),
+    Algorithm('PS', '.priority:run_priority', "Priority Scheduling", output_file="output_priority.csv",
+              has_priority=True),
+    Algorithm('PS_P', '.priority_p:run_priority_preemptive', "Priority Scheduling (Preemptive)",
+              output_file="output_priority_preemptive.csv", has_priority=True, preemptive=True),
+    Algorithm('RR', '.round_robin:run_round_robin', "Round Robin (Quantum = {quantum} ms)",
+              (Param('q', 'quantum', required=True),), output_file="output_rr.csv", example="RR q=2",
+              preemptive=True),
+    Algorithm('MLFQ', '.mlfq:run_mlfq', _mlfq_title,
+              (Param('q', 'quanta', int_list, default=DEFAULT_QUANTA), Param('boost', 'boost_interval')),
+              output_file="output_mlfq.csv", example="MLFQ q=8,16,32 boost=100", preemptive=True),
+    Algorithm('CFS', '.cfs:run_cfs',
+              "Completely Fair Scheduler (Latency = {target_latency} ms, Granularity = {min_granularity} ms)",
+              (Param('latency', 'target_latency', default=DEFAULT_TARGET_LATENCY),
+               Param('granularity', 'min_granularity', default=DEFAULT_MIN_GRANULARITY),
+               Param('wakeup', 'wakeup_granularity', default=DEFAULT_WAKEUP_GRANULARITY, minimum=0)),
+              output_file="output_cfs.csv", example="CFS latency=24 granularity=3 wakeup=4",
+              has_priority=True, preemptive=True, smp=False),
+    Algorithm('EDF', '.realtime:run_edf', "Earliest Deadline First (EDF)", (Param('horizon', 'horizon'),),
+              output_file="output_edf.csv", example="EDF horizon=1000", preemptive=True, smp=False, realtime=True),
+    Algorithm('RM', '.realtime:run_rate_monotonic', "Rate Monotonic (RM)", (Param('horizon', 'horizon'),),
+              output_file="output_rm.csv", example="RM horizon=1000", preemptive=True, smp=False, realtime=True),
+    Algorithm('SMP', '.smp:run_smp', "Multi-core ({cores} cores)", smp=False, timeline=False, cli=False),
+    Algorithm('IO', '.iosim:run_io', "CPU/I-O bursts ({policy})", smp=False, cli=False),
+)
+
+_registry: Dict[str, Algorithm] = {algorithm.name: algorithm for algorithm in BUILTIN}
+_plugins = None  # entry point name -> EntryPoint, read on first lookup of an unknown name
+
+
+def register(algorithm: Algorithm, replace: bool = False):
+    if algorithm.name in _registry and not replace:
+        raise ValueError(f"Algorithm '{algorithm.name}' is already registered")
+    _registry[algorithm.name] = algorithm
+
+
+def get(name: str) -> Algorithm:
+    algorithm = _registry.get(name)
+    if algorithm is None:
+        entry_point = _entry_points().get(name)
+        if entry_point is None:
+            raise ValueError(f"Unknown algorithm '{name}'")
+        loaded = entry_point.load()
+        algorithm = loaded() if callable(loaded) and not isinstance(loaded, Algorithm) else loaded
+        if not isinstance(algorithm, Algorithm) or algorithm.name != name:
+            raise ValueError(f"Entry point '{name}' does not provide an Algorithm named '{name}'")
+        _registry[name] = algorithm
+    return algorithm
+
+
+# Registered and entry point algorithm names (plugins are listed without being imported)
+def names(cli_only: bool = False) -> List[str]:
+    result = [name for name, algorithm in _registry.items() if algorithm.cli or not cli_only]
+    result.extend(name for name in _entry_points() if name not in _registry)
+    return result
+
+
+def load_engine(name: str) -> Callable[..., Any]:
+    return get(name).load()
+
+
+def _entry_points() -> Dict[str, Any]:
+    global _plugins
+    if _plugins is None:
+        from importlib.metadata import entry_points
+        try:
+            found = entry_points(group=ENTRY_POINT_GROUP)
+        except TypeError:  # Python < 3.10
+            found = entry_points().get(ENTRY_POINT_GROUP, [])
+        _plugins = {entry_point.name: entry_point for entry_point in found}
+    return _plugins
+
+
+# Read-only name -> engine mapping that imports each engine on first access
+class Engines(Mapping):
+    def __init__(self):
+        self._loaded = {}
+
+    def __getitem__(self, name: str) -> Callable[..., Any]:
+        engine = self._loaded.get(name)
+        if engine is None:
+            try:
+                engine = self._loaded[name] = load_engine(name)
+            except ValueError:
+                raise KeyError(name) from None
+        return engine
+
+    def __contains__(self, name: object) -> bool:
+        if name in _registry:
+            return True
+        try:
+            get(name)
+        except (ValueError, TypeError):
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(names())
+
+    def __len__(self) -> int:
+        return len(names())
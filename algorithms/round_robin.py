@@ -1,62 +1,100 @@
 # Round Robin scheduling algorithm with time quantum.
-from typing import List
-from copy import deepcopy
-from .models import Process
+from typing import List, Dict, Tuple, Optional
+from array import array
+from collections import deque
+from dataclasses import dataclass, field
+from .models import Process, Workload, ScheduleResult
+from .timeline import Timeline
+from .profiler import Profiler
 
 
-def round_robin_scheduler(processes: List[Process], quantum: int) -> List[Process]:
-    processes = deepcopy(processes)
-    n = len(processes)
+# Dispatch accounting for a Round Robin run.
+# A context switch is counted whenever the CPU loads a different process than the one that ran last.
+@dataclass
+class RoundRobinStats:
+    dispatches: int = 0
+    context_switches: int = 0
+    dispatches_by_pid: Dict[int, int] = field(default_factory=dict)
+
+
+def round_robin_scheduler(processes: List[Process], quantum: int, timeline: Optional[Timeline] = None) -> List[Process]:
+    return round_robin_stats(processes, quantum, timeline)[0]
+
+
+def round_robin_stats(processes: List[Process], quantum: int,
+                      timeline: Optional[Timeline] = None) -> Tuple[List[Process], RoundRobinStats]:
+    result = run_round_robin(Workload.from_processes(processes), quantum, timeline)
+    return result.processes(), result.stats
+
+
+# The returned ScheduleResult carries a RoundRobinStats in `stats`
+def run_round_robin(workload: Workload, quantum: int, timeline: Optional[Timeline] = None,
+                    profiler: Optional[Profiler] = None) -> ScheduleResult:
+    n = len(workload)
+    pids, arrivals = workload.pids, workload.arrivals
+    remaining = list(workload.bursts)
+    start = array('q', [-1]) * n
+    completion = array('q', [0]) * n
     current_time = 0 # initial time CPU
-    queue = [] # ready queue
+    queue = deque() # ready queue of indices
     completed_count = 0
-    arrived_indices = set() # indices of processes that have arrived
-    
-    # Sort by arrival time for initial processing
-    # enumerate make a list of tuples (index, process)
-    sorted_processes = sorted(enumerate(processes), key=lambda x: (x[1].arrival_time, x[1].pid))
-    
+    stats = RoundRobinStats()
+    last_pid = None # pid of the last process that ran
+
+    # Arrival order (by arrival time, then pid); next_arrival is the first process that has not arrived yet
+    order = workload.arrival_order()
+    next_arrival = 0
+
     while completed_count < n:
-        # View if there are arrived processes that are not in queue
-        for idx, process in sorted_processes:
-            if process.arrival_time <= current_time and idx not in arrived_indices:
-                queue.append(process)
-                arrived_indices.add(idx)
-        
-        # No process in queue, jump to next arrival time       
+        # Enqueue arrived processes by moving the arrival cursor
+        while next_arrival < n and arrivals[order[next_arrival]] <= current_time:
+            queue.append(order[next_arrival])
+            next_arrival += 1
+
+        # No process in queue, jump to next arrival time
         if not queue:
-            next_arrival = min((p.arrival_time for i, p in sorted_processes if i not in arrived_indices), default=current_time)
-            current_time = next_arrival
+            current_time = arrivals[order[next_arrival]]
+            if profiler is not None:
+                profiler.idle_jumps += 1
             continue
-        
+
         # Get next process from queue (FIFO)
-        current_process = queue.pop(0)
-        
+        i = queue.popleft()
+        pid = pids[i]
+        if profiler is not None:
+            profiler.dispatch(pid, current_time, len(queue))
+
+        # Dispatch accounting
+        stats.dispatches += 1
+        stats.dispatches_by_pid[pid] = stats.dispatches_by_pid.get(pid, 0) + 1
+        if last_pid is not None and last_pid != pid:
+            stats.context_switches += 1
+        last_pid = pid
+
         # This only hapens once, when process have never been executed
-        if current_process.start_time == -1:
-            current_process.start_time = current_time
-        
+        if start[i] == -1:
+            start[i] = current_time
+
         # Choose the minimun execution time between quantum or remaining time
-        execution_time = min(quantum, current_process.remaining_time)
-        current_process.remaining_time -= execution_time
+        execution_time = min(quantum, remaining[i])
+        remaining[i] -= execution_time
         current_time += execution_time # Add this execution time to the CPU time
-        
-
-        # This second scan ensures that no process arriving in the middle of the quantum is lost.
-        for idx, process in sorted_processes:
-            if process.arrival_time <= current_time and idx not in arrived_indices:
-                queue.append(process)
-                arrived_indices.add(idx)
-        
+        if timeline is not None:
+            timeline.add(pid, current_time - execution_time, current_time)
+
+        # Processes arriving in the middle of the quantum go ahead of the preempted one.
+        while next_arrival < n and arrivals[order[next_arrival]] <= current_time:
+            queue.append(order[next_arrival])
+            next_arrival += 1
+
         # Check if process is not finished, add back to queue
-        if current_process.remaining_time > 0:
-            queue.append(current_process)
+        if remaining[i] > 0:
+            queue.append(i)
+            if profiler is not None:
+                profiler.stop(pid)
         else:
-            # Process completed - Calculate CT, TTA and WT
-            current_process.completion_time = current_time
-            current_process.turnaround_time = current_process.completion_time - current_process.arrival_time
-            current_process.waiting_time = current_process.turnaround_time - current_process.burst_time
-
+            # Process completed (TTA and WT are derived by ScheduleResult)
+            completion[i] = current_time
             completed_count += 1
-    
-    return processes
\ No newline at end of file
+
+    return ScheduleResult(workload, start, completion, stats)
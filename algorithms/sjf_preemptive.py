@@ -1,42 +1,79 @@
 # Shortest Job First (Preemptive/SRTF) scheduling algorithm.
-from typing import List
-from copy import deepcopy
-from .models import Process
+from typing import List, Optional
+from array import array
+from heapq import heappush, heappop
+from .models import Process, Workload, ScheduleResult
+from .timeline import Timeline
+from .profiler import Profiler
 
 
-def sjf_preemptive(processes: List[Process]) -> List[Process]:
-    processes = deepcopy(processes)
-    n = len(processes)
+def sjf_preemptive(processes: List[Process], timeline: Optional[Timeline] = None) -> List[Process]:
+    return run_srtf(Workload.from_processes(processes), timeline).processes()
+
+
+def run_srtf(workload: Workload, timeline: Optional[Timeline] = None,
+             profiler: Optional[Profiler] = None) -> ScheduleResult:
+    n = len(workload)
+    pids, arrivals = workload.pids, workload.arrivals
+    remaining = list(workload.bursts)
+    start = array('q', [-1]) * n
+    completion = array('q', [0]) * n
     current_time = 0
     completed_count = 0
 
-    # SRTF: simulate time unit by unit
+    # Arrival order (tie-break by pid) walked with a single cursor
+    order = workload.arrival_order()
+    next_arrival = 0
+
+    # Ready heap keyed on (remaining_time, arrival_time, pid), same tie-break as the unit-tick version
+    ready = []
+
+    # SRTF: event driven, the CPU only wakes up on an arrival or a completion
     while completed_count < n:
 
-        # Step A: find available processes BEFORE executing
-        available = [p for p in processes if p.arrival_time <= current_time and p.remaining_time > 0]
+        # Step A: admit every process that has arrived BEFORE selecting
+        while next_arrival < n and arrivals[order[next_arrival]] <= current_time:
+            i = order[next_arrival]
+            heappush(ready, (remaining[i], arrivals[i], pids[i], i))
+            next_arrival += 1
 
-        # CPU idle, move time forward
-        if not available:
-            current_time += 1
+        # CPU idle, jump straight to the next arrival
+        if not ready:
+            current_time = arrivals[order[next_arrival]]
+            if profiler is not None:
+                profiler.idle_jumps += 1
             continue
 
         # Select process with shortest remaining_time
-        selected = min(available, key=lambda p: (p.remaining_time, p.arrival_time, p.pid))
+        i = heappop(ready)[3]
+        if profiler is not None:
+            profiler.dispatch(pids[i], current_time, len(ready))
 
         # Set start_time only the first time process is executed
-        if selected.start_time == -1:
-            selected.start_time = current_time
+        if start[i] == -1:
+            start[i] = current_time
+
+        # Step B: run until it finishes or the next process arrives, whichever comes first
+        finish_time = current_time + remaining[i]
+        if next_arrival < n and arrivals[order[next_arrival]] < finish_time:
+            arrival = arrivals[order[next_arrival]]
+            remaining[i] -= arrival - current_time
+            if timeline is not None:
+                timeline.add(pids[i], current_time, arrival)
+            current_time = arrival
 
-        # Execute for exactly 1 time unit
-        selected.remaining_time -= 1
-        current_time += 1
+            # Back to the ready heap, the new arrival decides whether it is preempted
+            heappush(ready, (remaining[i], arrivals[i], pids[i], i))
+            if profiler is not None:
+                profiler.stop(pids[i])
+            continue
 
-        # Step C: AFTER executing 1 time unit, check if finished
-        if selected.remaining_time == 0:
-            selected.completion_time = current_time
-            selected.turnaround_time = selected.completion_time - selected.arrival_time
-            selected.waiting_time = selected.turnaround_time - selected.burst_time
-            completed_count += 1
+        # Step C: the process ran to completion
+        remaining[i] = 0
+        if timeline is not None:
+            timeline.add(pids[i], current_time, finish_time)
+        current_time = finish_time
+        completion[i] = current_time
+        completed_count += 1
 
-    return processes
+    return ScheduleResult(workload, start, completion)
@@ -0,0 +1,472 @@
+# Multi-core (SMP) simulation: N cores, each with its own ready queue run by one of the
+# single-CPU policies, driven by a global event heap of slice ends (completions, quantum
+# expiries). Arrivals are read from the sorted arrival order with a cursor and placed on a
+# core by the load balancer, which may also migrate queued processes between cores.
+#
+#   result = run_smp(workload, cores=8, policy='RR', params={'quantum': 4}, balancer='steal')
+#   result.stats.cores[0].utilization, result.stats.migrations
+#
+# Every decision touches only the cores involved, so the cost per event is O(log cores)
+# plus the queue operation of the policy; work stealing scans the cores only when a core
+# runs out of work while others still have processes queued.
+from typing import Any, Dict, List, Optional, Sequence, Union
+from array import array
+from collections import deque
+from dataclasses import dataclass, field
+from heapq import heappush, heappop
+from .models import Process, Workload, ScheduleResult, DEFAULT_QUANTA
+from .timeline import Timeline
+from .profiler import Profiler
+
+
+# Per-core accounting; utilization is busy time over the span from first arrival to last completion
+@dataclass
+class CoreStats:
+    busy_time: int = 0
+    dispatches: int = 0
+    context_switches: int = 0
+    completed: int = 0
+    migrations_in: int = 0
+    utilization: float = 0.0
+
+
+@dataclass
+class SMPStats:
+    cores: List[CoreStats] = field(default_factory=list)
+    dispatches: int = 0
+    context_switches: int = 0
+    preemptions: int = 0
+    migrations: int = 0  # processes moved from one core's queue to another's
+    steals: int = 0
+    rebalances: int = 0
+
+    # Cores may come back as plain dicts (e.g. from the result cache)
+    def __post_init__(self):
+        self.cores = [c if isinstance(c, CoreStats) else CoreStats(**c) for c in self.cores]
+
+
+# Ready queues holding workload indices
+class _FifoQueue:
+    def __init__(self):
+        self._items = deque()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def push(self, i: int):
+        self._items.append(i)
+
+    def push_front(self, i: int):
+        self._items.appendleft(i)
+
+    def pop(self) -> int:
+        return self._items.popleft()
+
+
+# Heap ordered by the policy key; ties follow insertion order (front insertions come first)
+class _KeyedQueue:
+    def __init__(self, key):
+        self._heap = []
+        self._key = key
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, i: int):
+        self._seq += 1
+        heappush(self._heap, (self._key(i), self._seq, i))
+
+    def push_front(self, i: int):
+        self._seq += 1
+        heappush(self._heap, (self._key(i), -self._seq, i))
+
+    def pop(self) -> int:
+        return heappop(self._heap)[2]
+
+
+# Single-CPU policies as per-core disciplines. `key(i)` orders a keyed queue and decides
+# preemption (a queued process preempts when its key is lower than the running one's);
+# `quantum(i)` bounds a slice and `expire(i)` runs when a process uses its quantum up.
+class _Policy:
+    preemptive = False
+    keyed = True
+
+    def __init__(self, workload: Workload, remaining: List[int]):
+        self.workload = workload
+        self.remaining = remaining
+
+    def new_queue(self):
+        return _KeyedQueue(self.key) if self.keyed else _FifoQueue()
+
+    def key(self, i: int):
+        return 0
+
+    def quantum(self, i: int) -> Optional[int]:
+        return None
+
+    def expire(self, i: int):
+        pass
+
+
+class _FCFS(_Policy):
+    keyed = False
+
+
+class _SJF(_Policy):
+    def key(self, i):
+        w = self.workload
+        return (w.bursts[i], w.arrivals[i], w.pids[i])
+
+
+class _SRTF(_Policy):
+    preemptive = True
+
+    def key(self, i):
+        w = self.workload
+        return (self.remaining[i], w.arrivals[i], w.pids[i])
+
+
+class _Priority(_Policy):
+    def key(self, i):
+        w = self.workload
+        return (w.priorities[i], w.arrivals[i], w.pids[i])
+
+
+class _PriorityPreemptive(_Priority):
+    preemptive = True
+
+
+class _RoundRobin(_Policy):
+    keyed = False
+
+    def __init__(self, workload, remaining, quantum: int):
+        super().__init__(workload, remaining)
+        if quantum <= 0:
+            raise ValueError("Quantum must be positive")
+        self._quantum = quantum
+
+    def quantum(self, i):
+        return self._quantum
+
+
+# MLFQ without the periodic boost: key is the level, FIFO within a level
+class _MLFQ(_Policy):
+    preemptive = True
+
+    def __init__(self, workload, remaining, quanta: Sequence[int] = DEFAULT_QUANTA,
+                 boost_interval: Optional[int] = None):
+        super().__init__(workload, remaining)
+        if boost_interval is not None:
+            raise ValueError("The SMP engine does not support the MLFQ priority boost")
+        self.quanta = tuple(quanta)
+        if not self.quanta or any(q <= 0 for q in self.quanta):
+            raise ValueError("Every level needs a positive quantum")
+        self.level = bytearray(len(workload)) if len(self.quanta) <= 256 else [0] * len(workload)
+
+    def key(self, i):
+        return self.level[i]
+
+    def quantum(self, i):
+        return self.quanta[self.level[i]]
+
+    def expire(self, i):
+        if self.level[i] < len(self.quanta) - 1:
+            self.level[i] += 1
+
+
+POLICIES = {
+    'FCFS': _FCFS,
+    'SJF': _SJF,
+    'SJF_P': _SRTF,
+    'PS': _Priority,
+    'PS_P': _PriorityPreemptive,
+    'RR': _RoundRobin,
+    'MLFQ': _MLFQ,
+}
+
+
+# Load balancers: where arrivals go and how queued processes move between cores.
+# The base class places arrivals round robin over the cores and never migrates.
+class LoadBalancer:
+    interval: Optional[int] = None  # rebalance period, None when not periodic
+    steals = False                  # idle cores take work from the busiest queue
+
+    def __init__(self):
+        self._next = 0
+
+    def place(self, engine: '_SMPEngine', i: int) -> int:
+        core = self._next
+        self._next = (core + 1) % engine.cores
+        return core
+
+    def rebalance(self, engine: '_SMPEngine'):
+        pass
+
+
+# Arrivals go to an idle core when there is one; a core that runs out of work steals the
+# next process of the core with the longest queue
+class WorkStealing(LoadBalancer):
+    steals = True
+
+    def place(self, engine, i):
+        if engine.free:
+            return min(engine.free)
+        return super().place(engine, i)
+
+
+# Round robin placement; every `interval` time units queued processes move from the most
+# to the least loaded cores until their loads differ by at most one
+class PeriodicRebalance(LoadBalancer):
+    def __init__(self, interval: int = 100):
+        super().__init__()
+        if interval <= 0:
+            raise ValueError("Rebalance interval must be positive")
+        self.interval = interval
+
+    def rebalance(self, engine):
+        queues, running = engine.queues, engine.running
+        loads = [len(q) + (r != -1) for q, r in zip(queues, running)]
+        while True:
+            src = max(range(engine.cores), key=loads.__getitem__)
+            dst = min(range(engine.cores), key=loads.__getitem__)
+            if loads[src] - loads[dst] <= 1 or not queues[src]:
+                return
+            engine.migrate(src, dst)
+            loads[src] -= 1
+            loads[dst] += 1
+
+
+# Processes are pinned to a core (pid modulo the number of cores, or an explicit pid -> core
+# mapping) and never migrate
+class Affinity(LoadBalancer):
+    def __init__(self, cores_by_pid: Optional[Dict[int, int]] = None):
+        super().__init__()
+        self.cores_by_pid = cores_by_pid
+
+    def place(self, engine, i):
+        pid = engine.workload.pids[i]
+        if self.cores_by_pid is not None and pid in self.cores_by_pid:
+            return self.cores_by_pid[pid] % engine.cores
+        return pid % engine.cores
+
+
+BALANCERS = {
+    'none': LoadBalancer,
+    'steal': WorkStealing,
+    'rebalance': PeriodicRebalance,
+    'affinity': Affinity,
+}
+
+
+def make_balancer(balancer: Union[str, LoadBalancer]) -> LoadBalancer:
+    if isinstance(balancer, LoadBalancer):
+        return balancer
+    if balancer not in BALANCERS:
+        raise ValueError(f"Unknown load balancer '{balancer}', expected one of {sorted(BALANCERS)}")
+    return BALANCERS[balancer]()
+
+
+def smp_scheduler(processes: List[Process], cores: int = 4, policy: str = 'FCFS',
+                  params: Optional[Dict[str, Any]] = None,
+                  balancer: Union[str, LoadBalancer] = 'steal') -> List[Process]:
+    return run_smp(Workload.from_processes(processes), cores, policy, params, balancer).processes()
+
+
+# The returned ScheduleResult carries an SMPStats in `stats`.
+# `policy` is a single-CPU algorithm name and `params` its parameters (e.g. {'quantum': 4} for RR).
+# With one core the result is the same as the single-CPU engine of the policy.
+# `timelines` (one per core) record the Gantt segments of every core.
+def run_smp(workload: Workload, cores: int = 4, policy: str = 'FCFS', params: Optional[Dict[str, Any]] = None,
+            balancer: Union[str, LoadBalancer] = 'steal', timelines: Optional[Sequence[Timeline]] = None,
+            profiler: Optional[Profiler] = None) -> ScheduleResult:
+    return _SMPEngine(workload, cores, policy, params, make_balancer(balancer), timelines, profiler).run()
+
+
+class _SMPEngine:
+    def __init__(self, workload: Workload, cores: int, policy: str, params: Optional[Dict[str, Any]],
+                 balancer: LoadBalancer, timelines: Optional[Sequence[Timeline]] = None,
+                 profiler: Optional[Profiler] = None):
+        if cores <= 0:
+            raise ValueError("Number of cores must be positive")
+        if timelines is not None and len(timelines) != cores:
+            raise ValueError("Expected one timeline per core")
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy '{policy}', expected one of {sorted(POLICIES)}")
+        n = len(workload)
+        self.workload = workload
+        self.cores = cores
+        self.balancer = balancer
+        self.remaining = list(workload.bursts)
+        self.policy = POLICIES[policy](workload, self.remaining, **(params or {}))
+        self.queues = [self.policy.new_queue() for _ in range(cores)]
+        self.running = [-1] * cores       # index running on each core, -1 when idle
+        self.slice_start = [0] * cores
+        self.version = [0] * cores        # invalidates the pending slice end of a preempted core
+        self.free = set(range(cores))     # idle cores with an empty queue
+        self.queued = 0                   # processes waiting in any queue
+        self.used = [0] * n               # time used of the current quantum
+        self.last_pid = [None] * cores
+        self.start = array('q', [-1]) * n
+        self.completion = array('q', [0]) * n
+        self.events = []                  # (slice end, core, version)
+        self.stats = SMPStats([CoreStats() for _ in range(cores)])
+        self.timelines = timelines
+        self.profiler = profiler
+        self.time = 0
+
+    # Queue a process on a core; with a preemptive policy it may take the core right away
+    def push(self, core: int, i: int):
+        policy = self.policy
+        running = self.running[core]
+        if policy.preemptive and running != -1:
+            self._account(core)  # bring the running process's remaining time up to date
+            if policy.key(i) < policy.key(running):
+                if self.profiler is not None:
+                    self.profiler.stop(self.workload.pids[running], core)
+                self._stop(core)
+                self.queues[core].push_front(running)
+                self.queued += 1
+                self.stats.preemptions += 1
+        self.queues[core].push(i)
+        self.queued += 1
+        self.free.discard(core)
+
+    # Move the next queued process of src to dst
+    def migrate(self, src: int, dst: int):
+        i = self.queues[src].pop()
+        self.queued -= 1
+        self.stats.migrations += 1
+        self.stats.cores[dst].migrations_in += 1
+        if not self.queues[src] and self.running[src] == -1:
+            self.free.add(src)
+        self.push(dst, i)
+
+    # Charge the time the running process has used since the slice (or the last update) started
+    def _account(self, core: int):
+        i = self.running[core]
+        ran = self.time - self.slice_start[core]
+        if ran:
+            self.remaining[i] -= ran
+            self.used[i] += ran
+            self.stats.cores[core].busy_time += ran
+            if self.timelines is not None:
+                self.timelines[core].add(self.workload.pids[i], self.slice_start[core], self.time)
+            self.slice_start[core] = self.time
+
+    def _stop(self, core: int):
+        self.running[core] = -1
+        self.version[core] += 1
+
+    # Take the next process of the core with the longest queue
+    def _steal(self, core: int):
+        victim = max(range(self.cores), key=lambda c: len(self.queues[c]))
+        self.migrate(victim, core)
+        self.stats.steals += 1
+        self._dispatch(core)
+
+    # Start the next process of an idle core's queue
+    def _dispatch(self, core: int):
+        queue = self.queues[core]
+        if not queue:
+            self.free.add(core)
+            return
+        i = queue.pop()
+        self.queued -= 1
+        self.free.discard(core)
+        t = self.time
+        stats, core_stats = self.stats, self.stats.cores[core]
+        pid = self.workload.pids[i]
+        stats.dispatches += 1
+        core_stats.dispatches += 1
+        if self.last_pid[core] is not None and self.last_pid[core] != pid:
+            stats.context_switches += 1
+            core_stats.context_switches += 1
+        self.last_pid[core] = pid
+        if self.start[i] == -1:
+            self.start[i] = t
+        if self.profiler is not None:
+            self.profiler.dispatch(pid, t, self.queued, core)
+
+        self.running[core] = i
+        self.slice_start[core] = t
+        length = self.remaining[i]
+        quantum = self.policy.quantum(i)
+        if quantum is not None and quantum - self.used[i] < length:
+            length = quantum - self.used[i]
+        heappush(self.events, (t + length, core, self.version[core]))
+
+    def run(self) -> ScheduleResult:
+        workload, policy, balancer = self.workload, self.policy, self.balancer
+        n = len(workload)
+        arrivals = workload.arrivals
+        order = workload.arrival_order()
+        next_arrival = 0
+        events, running, version, remaining, used = self.events, self.running, self.version, self.remaining, self.used
+        profiler = self.profiler
+        next_rebalance = balancer.interval
+        completed_count = 0
+
+        while completed_count < n:
+            # Next point in time: an arrival, a slice end or a rebalance with work queued
+            t = arrivals[order[next_arrival]] if next_arrival < n else None
+            if events and (t is None or events[0][0] < t):
+                t = events[0][0]
+            if next_rebalance is not None and self.queued and (t is None or next_rebalance < t):
+                t = next_rebalance
+            if profiler is not None and t > self.time and len(self.free) == self.cores:
+                profiler.idle_jumps += 1  # every core idle, the clock jumps to the next arrival
+            self.time = t
+            touched = []
+
+            # Slice ends: completions and quantum expiries (stale entries of preempted slices are skipped)
+            expired = []
+            while events and events[0][0] == t:
+                _, core, v = heappop(events)
+                if v != version[core]:
+                    continue
+                i = running[core]
+                self._account(core)
+                self._stop(core)
+                touched.append(core)
+                if remaining[i] == 0:
+                    self.completion[i] = t
+                    self.stats.cores[core].completed += 1
+                    completed_count += 1
+                else:
+                    expired.append((core, i))
+                    if profiler is not None:
+                        profiler.stop(workload.pids[i], core)
+
+            # Arrivals go ahead of the processes that just used up their quantum, as in Round Robin
+            while next_arrival < n and arrivals[order[next_arrival]] <= t:
+                i = order[next_arrival]
+                next_arrival += 1
+                core = balancer.place(self, i)
+                self.push(core, i)
+                touched.append(core)
+            for core, i in expired:
+                policy.expire(i)
+                used[i] = 0
+                self.push(core, i)
+
+            if next_rebalance is not None and t >= next_rebalance:
+                balancer.rebalance(self)
+                self.stats.rebalances += 1
+                next_rebalance += balancer.interval * ((t - next_rebalance) // balancer.interval + 1)
+                touched = range(self.cores)
+
+            for core in sorted(set(touched)):
+                if running[core] == -1:
+                    self._dispatch(core)
+            # Idle cores steal whatever is still queued elsewhere
+            if balancer.steals and self.queued and self.free:
+                for core in sorted(self.free):
+                    if not self.queued:
+                        break
+                    self._steal(core)
+
+        span = max(self.completion, default=0) - min(arrivals, default=0)
+        for core_stats in self.stats.cores:
+            core_stats.utilization = core_stats.busy_time / span if span > 0 else 0.0
+        return ScheduleResult(workload, self.start, self.completion, self.stats)
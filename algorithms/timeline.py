@@ -0,0 +1,107 @@
+# Gantt timeline capture: run-length (pid, start, end) segments in array buffers.
+# Adjacent slices of the same pid are merged as they are added. With a writer
+# attached, full buffers are streamed out so long timelines never sit in memory.
+from typing import Iterator, Optional, Sequence, Tuple, TextIO
+from array import array
+
+DEFAULT_BUFFER_SEGMENTS = 65536
+
+
+class Timeline:
+    def __init__(self, writer: Optional['TimelineWriter'] = None, buffer_segments: int = DEFAULT_BUFFER_SEGMENTS):
+        self.pids = array('q')
+        self.starts = array('q')
+        self.ends = array('q')
+        self.writer = writer
+        self.buffer_segments = max(2, buffer_segments)
+        self.segments_written = 0
+
+    def __len__(self) -> int:
+        return self.segments_written + len(self.pids)
+
+    # Buffered segments (those not streamed to the writer yet)
+    def __iter__(self) -> Iterator[Tuple[int, int, int]]:
+        return zip(self.pids, self.starts, self.ends)
+
+    # Record that `pid` ran from start to end; merges with the previous segment when contiguous
+    def add(self, pid: int, start: int, end: int):
+        if end <= start:
+            return
+        pids, ends = self.pids, self.ends
+        if pids and pids[-1] == pid and ends[-1] == start:
+            ends[-1] = end
+            return
+        pids.append(pid)
+        self.starts.append(start)
+        ends.append(end)
+        if self.writer is not None and len(pids) >= self.buffer_segments:
+            self.flush(keep_last=True)
+
+    # Stream buffered segments to the writer; the last one can be kept so it may still be merged
+    def flush(self, keep_last: bool = False):
+        if self.writer is None:
+            return
+        count = len(self.pids) - (1 if keep_last else 0)
+        if count <= 0:
+            return
+        self.writer.write_segments(self.pids[:count], self.starts[:count], self.ends[:count])
+        self.segments_written += count
+        del self.pids[:count]
+        del self.starts[:count]
+        del self.ends[:count]
+
+    # Flush everything and close the writer
+    def close(self):
+        self.flush()
+        if self.writer is not None:
+            self.writer.close()
+
+    def __enter__(self) -> 'Timeline':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Base writer: formats whole buffers with one join and one write call
+class TimelineWriter:
+    def __init__(self, file: TextIO, owns_file: bool = False):
+        self.file = file
+        self.owns_file = owns_file
+
+    @classmethod
+    def open(cls, filename: str) -> 'TimelineWriter':
+        writer = cls(open(filename, 'w', newline=''), owns_file=True)
+        writer.write_header()
+        return writer
+
+    def write_header(self):
+        pass
+
+    def write_segments(self, pids: Sequence[int], starts: Sequence[int], ends: Sequence[int]):
+        raise NotImplementedError
+
+    def close(self):
+        if self.owns_file:
+            self.file.close()
+        else:
+            self.file.flush()
+
+
+class CsvTimelineWriter(TimelineWriter):
+    def write_header(self):
+        self.file.write('pid,start,end\n')
+
+    def write_segments(self, pids, starts, ends):
+        self.file.write(''.join(f'{p},{s},{e}\n' for p, s, e in zip(pids, starts, ends)))
+
+
+class JsonlTimelineWriter(TimelineWriter):
+    def write_segments(self, pids, starts, ends):
+        self.file.write(''.join(f'{{"pid": {p}, "start": {s}, "end": {e}}}\n' for p, s, e in zip(pids, starts, ends)))
+
+
+# Timeline streaming to a file; the format comes from the extension (.jsonl, otherwise CSV)
+def open_timeline(filename: str, buffer_segments: int = DEFAULT_BUFFER_SEGMENTS) -> Timeline:
+    writer_class = JsonlTimelineWriter if filename.endswith('.jsonl') else CsvTimelineWriter
+    return Timeline(writer_class.open(filename), buffer_segments)
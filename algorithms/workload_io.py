@@ -0,0 +1,369 @@
+# Workload loaders: streaming CSV parser producing columnar batches, and a
+# compact binary format that is loaded with mmap as zero-copy columns.
+from typing import Iterator, List, Optional, Tuple
+from array import array
+import csv
+import mmap
+import struct
+import sys
+from .models import Workload, BurstSequences
+
+
+# Malformed input; carries the file name and 1-based line number when known.
+class WorkloadFormatError(ValueError):
+    def __init__(self, message: str, filename: Optional[str] = None, line: Optional[int] = None):
+        self.filename = filename
+        self.line = line
+        location = filename or "<input>"
+        if line is not None:
+            location += f":{line}"
+        super().__init__(f"{location}: {message}")
+
+
+REQUIRED_COLUMNS = ('pid', 'burst_time')
+OPTIONAL_COLUMNS = ('arrival_time', 'priority', 'deadline', 'period')
+
+# CPU/I-O burst workloads: a 'bursts' column replaces burst_time (see load_burst_csv)
+BURST_COLUMNS = ('pid', 'bursts')
+BURST_OPTIONAL_COLUMNS = ('arrival_time', 'priority', 'devices')
+
+
+# Read a CSV workload in fixed-size chunks and yield Workload batches of at most batch_size rows.
+# The header is parsed once; pid and burst_time are required, arrival_time and priority default to 0.
+# deadline and period (real-time tasks) become Workload columns only when the header has them.
+# Unknown columns are ignored. Quoted fields are supported, embedded newlines are not.
+def iter_csv_batches(filename: str, batch_size: int = 65536, chunk_size: int = 1 << 20) -> Iterator[Workload]:
+    with open(filename, 'rb') as file:
+        lines = _iter_lines(file, chunk_size)
+
+        # Header: skip leading blank lines, remove BOM and normalize names
+        line_no, header = 0, b''
+        for line_no, header in lines:
+            if header.strip():
+                break
+        else:
+            raise WorkloadFormatError("empty file, no header found", filename)
+        names = [name.strip() for name in _split(_decode(header, filename, line_no, 'utf-8-sig'))]
+        columns = _map_columns(names, filename, line_no)
+        pid_col, arrival_col, burst_col, priority_col, deadline_col, period_col = columns
+        realtime = deadline_col is not None or period_col is not None
+        width = len(names)
+
+        pids, arrivals, bursts, priorities = array('q'), array('q'), array('q'), array('q')
+        deadlines, periods = array('q'), array('q')
+        for line_no, line in lines:
+            if b'"' in line:
+                fields = [f.encode('utf-8') for f in _split(_decode(line, filename, line_no))]
+            else:
+                fields = line.split(b',')
+            if len(fields) != width:
+                if not line.strip():
+                    continue  # blank lines are skipped, like csv.DictReader does
+                raise WorkloadFormatError(f"expected {width} fields, found {len(fields)}", filename, line_no)
+
+            # Fast path for well-formed rows; _field re-parses a bad row to report exactly what is wrong
+            try:
+                pid = int(fields[pid_col])
+                burst = int(fields[burst_col])
+                arrival = int(fields[arrival_col]) if arrival_col is not None else 0
+                priority = int(fields[priority_col]) if priority_col is not None else 0
+                if burst < 0 or arrival < 0:
+                    raise ValueError
+                if realtime:
+                    deadline = int(fields[deadline_col]) if deadline_col is not None else 0
+                    period = int(fields[period_col]) if period_col is not None else 0
+                    if deadline < 0 or period < 0:
+                        raise ValueError
+            except ValueError:
+                pid = _field(fields, pid_col, 'pid', True, filename, line_no, allow_negative=True)
+                burst = _field(fields, burst_col, 'burst_time', True, filename, line_no)
+                arrival = _field(fields, arrival_col, 'arrival_time', False, filename, line_no)
+                priority = _field(fields, priority_col, 'priority', False, filename, line_no, allow_negative=True)
+                deadline = _field(fields, deadline_col, 'deadline', False, filename, line_no)
+                period = _field(fields, period_col, 'period', False, filename, line_no)
+
+            pids.append(pid)
+            arrivals.append(arrival)
+            bursts.append(burst)
+            priorities.append(priority)
+            if realtime:
+                deadlines.append(deadline)
+                periods.append(period)
+
+            if len(pids) >= batch_size:
+                yield _batch(pids, arrivals, bursts, priorities, deadlines, periods, realtime)
+                pids, arrivals, bursts, priorities = array('q'), array('q'), array('q'), array('q')
+                deadlines, periods = array('q'), array('q')
+
+        if pids:
+            yield _batch(pids, arrivals, bursts, priorities, deadlines, periods, realtime)
+
+
+def _batch(pids, arrivals, bursts, priorities, deadlines, periods, realtime: bool) -> Workload:
+    if realtime:
+        return Workload(pids, arrivals, bursts, priorities, deadlines=deadlines, periods=periods)
+    return Workload(pids, arrivals, bursts, priorities)
+
+
+# Whole CSV file as a single Workload (a CPU/I-O burst workload when the header has a 'bursts' column)
+def load_csv_workload(filename: str, chunk_size: int = 1 << 20) -> Workload:
+    if _has_burst_column(filename):
+        return load_burst_csv(filename)
+    pids, arrivals, bursts, priorities = array('q'), array('q'), array('q'), array('q')
+    deadlines, periods = array('q'), array('q')
+    realtime = False
+    for batch in iter_csv_batches(filename, chunk_size=chunk_size):
+        pids.extend(batch.pids)
+        arrivals.extend(batch.arrivals)
+        bursts.extend(batch.bursts)
+        priorities.extend(batch.priorities)
+        if batch.realtime:
+            realtime = True
+            deadlines.extend(batch.deadlines)
+            periods.extend(batch.periods)
+    return _batch(pids, arrivals, bursts, priorities, deadlines, periods, realtime)
+
+
+# CPU/I-O burst workload: pid and bursts are required, arrival_time, priority and devices optional.
+# bursts alternates CPU and I/O times separated by ';', starting and ending with a CPU burst
+# (e.g. 5;10;3 is 5 CPU, 10 I/O, 3 CPU); devices has one device number per I/O burst, separated
+# by ';' (all device 0 when omitted). burst_time of the workload is each process's CPU total.
+# These files are meant for the I/O simulator and are read whole with the csv module.
+def load_burst_csv(filename: str) -> Workload:
+    pids, arrivals, bursts, priorities = array('q'), array('q'), array('q'), array('q')
+    offsets, durations, devices = array('q', [0]), array('q'), array('q')
+    with open(filename, 'rb') as file:
+        reader = csv.reader(_decode_lines(file, filename))
+        line_no, names = 0, []
+        for names in reader:
+            line_no = reader.line_num
+            if any(name.strip() for name in names):
+                break
+        else:
+            raise WorkloadFormatError("empty file, no header found", filename)
+        positions = {}
+        for i, name in enumerate(name.strip() for name in names):
+            if name in BURST_COLUMNS or name in BURST_OPTIONAL_COLUMNS:
+                if name in positions:
+                    raise WorkloadFormatError(f"duplicate column '{name}' in header", filename, line_no)
+                positions[name] = i
+        for name in BURST_COLUMNS:
+            if name not in positions:
+                raise WorkloadFormatError(f"column '{name}' not found in header", filename, line_no)
+        pid_col, bursts_col = positions['pid'], positions['bursts']
+        arrival_col, priority_col = positions.get('arrival_time'), positions.get('priority')
+        devices_col = positions.get('devices')
+        width = len(names)
+
+        for row in reader:
+            line_no = reader.line_num
+            if len(row) != width:
+                if not any(field.strip() for field in row):
+                    continue
+                raise WorkloadFormatError(f"expected {width} fields, found {len(row)}", filename, line_no)
+            fields = [field.encode('utf-8') for field in row]
+            pids.append(_field(fields, pid_col, 'pid', True, filename, line_no, allow_negative=True))
+            arrivals.append(_field(fields, arrival_col, 'arrival_time', False, filename, line_no))
+            priorities.append(_field(fields, priority_col, 'priority', False, filename, line_no, allow_negative=True))
+
+            sequence = _int_list(row[bursts_col], 'bursts', filename, line_no)
+            if len(sequence) % 2 == 0:
+                raise WorkloadFormatError(f"'bursts' must alternate CPU and I/O and end with a CPU burst, "
+                                          f"got {len(sequence)} values", filename, line_no)
+            io_count = len(sequence) // 2
+            row_devices = _int_list(row[devices_col], 'devices', filename, line_no) if devices_col is not None else []
+            if not row_devices:
+                row_devices = [0] * io_count
+            elif len(row_devices) != io_count:
+                raise WorkloadFormatError(f"'devices' needs one device per I/O burst ({io_count}), "
+                                          f"got {len(row_devices)}", filename, line_no)
+            bursts.append(sum(sequence[0::2]))
+            durations.extend(sequence)
+            devices.append(0)
+            for device in row_devices:
+                devices.extend((device, 0))
+            offsets.append(len(durations))
+
+    io = BurstSequences(offsets, durations, devices)
+    return Workload(pids, arrivals, bursts, priorities, io=io)
+
+
+# Non-negative integers separated by ';'; empty when the field is blank
+def _int_list(raw: str, name: str, filename: str, line_no: int) -> List[int]:
+    if not raw.strip():
+        return []
+    try:
+        values = [int(value) for value in raw.split(';')]
+    except ValueError:
+        raise WorkloadFormatError(f"invalid integer list for '{name}': {raw.strip()!r}", filename, line_no) from None
+    if min(values) < 0:
+        raise WorkloadFormatError(f"'{name}' must not be negative, got {min(values)}", filename, line_no)
+    return values
+
+
+def _has_burst_column(filename: str) -> bool:
+    with open(filename, 'rb') as file:
+        for line_no, line in enumerate(file, 1):
+            if line.strip():
+                return 'bursts' in (name.strip() for name in _split(_decode(line, filename, line_no, 'utf-8-sig')))
+    return False
+
+
+# Binary workload format: a 32-byte header followed by one 32-byte record per process,
+# all little-endian: magic 'OSWL', version (u16), flags (u16), record size (u32), count (u64),
+# then records of pid, arrival_time, burst_time, priority as int64. The header is padded to 32 bytes
+# so the records start 8-byte aligned and load as an int64 view (version 1 files had a 28-byte header).
+BINARY_MAGIC = b'OSWL'
+BINARY_VERSION = 2
+BINARY_HEADER = struct.Struct('<4sHHIQ12x')
+BINARY_RECORD_SIZE = 32
+assert BINARY_HEADER.size == 32
+FLAG_ARRIVAL_SORTED = 1  # records are stored in (arrival_time, pid) order
+
+
+# Write a workload as binary records, sorted by arrival so the loader can skip the sort.
+# The records have no deadline/period fields or burst sequences, so those workloads stay in CSV.
+def write_binary_workload(workload: Workload, filename: str):
+    if workload.realtime:
+        raise ValueError("The binary workload format has no deadline/period columns; keep real-time workloads in CSV")
+    if workload.io is not None:
+        raise ValueError("The binary workload format has no burst sequences; keep CPU/I-O burst workloads in CSV")
+    n = len(workload)
+    order = workload.arrival_order()
+    records = array('q', bytes(BINARY_RECORD_SIZE * n))
+    for field, column in enumerate((workload.pids, workload.arrivals, workload.bursts, workload.priorities)):
+        records[field::4] = array('q', map(column.__getitem__, order))
+    if sys.byteorder != 'little':
+        records.byteswap()
+    with open(filename, 'wb') as file:
+        file.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, FLAG_ARRIVAL_SORTED, BINARY_RECORD_SIZE, n))
+        records.tofile(file)
+
+
+def convert_csv_to_binary(csv_filename: str, binary_filename: str):
+    write_binary_workload(load_csv_workload(csv_filename), binary_filename)
+
+
+# Map a binary workload file into memory; the columns are strided int64 views over the mapping
+def load_binary_workload(filename: str) -> Workload:
+    with open(filename, 'rb') as file:
+        header = file.read(BINARY_HEADER.size)
+        if len(header) < BINARY_HEADER.size:
+            raise WorkloadFormatError("truncated binary header", filename)
+        magic, version, flags, record_size, n = BINARY_HEADER.unpack(header)
+        if magic != BINARY_MAGIC:
+            raise WorkloadFormatError("not a binary workload file", filename)
+        if version != BINARY_VERSION or record_size != BINARY_RECORD_SIZE:
+            raise WorkloadFormatError(f"unsupported binary workload version {version}", filename)
+        size = BINARY_HEADER.size + n * BINARY_RECORD_SIZE
+        file.seek(0, 2)
+        if file.tell() < size:
+            raise WorkloadFormatError(f"truncated file, expected {n} records", filename)
+        if n == 0:
+            return Workload(array('q'), array('q'), array('q'))
+        buffer = mmap.mmap(file.fileno(), size, access=mmap.ACCESS_READ)
+
+    records = memoryview(buffer)[BINARY_HEADER.size:].cast('q')
+    if sys.byteorder != 'little':
+        # Big-endian host: no zero-copy view is possible, swap into native arrays
+        records = array('q', records)
+        records.byteswap()
+    arrival_order = range(n) if flags & FLAG_ARRIVAL_SORTED else None
+    return Workload(records[0::4], records[1::4], records[2::4], records[3::4], arrival_order=arrival_order)
+
+
+# Load a workload from either format, detected by the binary magic
+def load_workload(filename: str) -> Workload:
+    with open(filename, 'rb') as file:
+        is_binary = file.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+    return load_binary_workload(filename) if is_binary else load_csv_workload(filename)
+
+
+# True for a CSV workload with CPU/I-O burst sequences (a 'bursts' column), read from the header only
+def is_burst_workload(filename: str) -> bool:
+    with open(filename, 'rb') as file:
+        if file.read(len(BINARY_MAGIC)) == BINARY_MAGIC:
+            return False
+    return _has_burst_column(filename)
+
+
+# (line number, raw line) pairs read chunk by chunk; a partial last line is carried to the next chunk
+def _iter_lines(file, chunk_size: int) -> Iterator[Tuple[int, bytes]]:
+    line_no = 0
+    carry = b''
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        lines = (carry + chunk).split(b'\n')
+        carry = lines.pop()
+        for line in lines:
+            line_no += 1
+            yield line_no, line
+    if carry:
+        yield line_no + 1, carry
+
+
+# A line as text; invalid UTF-8 is reported with its line number instead of a bare UnicodeDecodeError
+def _decode(line: bytes, filename: str, line_no: int, encoding: str = 'utf-8') -> str:
+    try:
+        return line.decode(encoding)
+    except UnicodeDecodeError as e:
+        raise WorkloadFormatError(f"invalid UTF-8 at byte {e.start + 1} of the line", filename, line_no) from None
+
+
+# Lines of a file opened in binary mode, decoded (a BOM on the first line is removed)
+def _decode_lines(file, filename: str) -> Iterator[str]:
+    for line_no, line in enumerate(file, 1):
+        yield _decode(line, filename, line_no, 'utf-8-sig' if line_no == 1 else 'utf-8')
+
+
+def _split(line: str) -> List[str]:
+    return next(csv.reader([line]), [])
+
+
+# Column positions of (pid, arrival_time, burst_time, priority, deadline, period); optional ones are None when absent
+def _map_columns(names: List[str], filename: str,
+                 line_no: int) -> Tuple[int, Optional[int], int, Optional[int], Optional[int], Optional[int]]:
+    positions = {}
+    for i, name in enumerate(names):
+        if name in REQUIRED_COLUMNS or name in OPTIONAL_COLUMNS:
+            if name in positions:
+                raise WorkloadFormatError(f"duplicate column '{name}' in header", filename, line_no)
+            positions[name] = i
+    for name in REQUIRED_COLUMNS:
+        if name not in positions:
+            raise WorkloadFormatError(f"column '{name}' not found in header", filename, line_no)
+    return (positions['pid'], positions.get('arrival_time'), positions['burst_time'], positions.get('priority'),
+            positions.get('deadline'), positions.get('period'))
+
+
+def _field(fields: List[bytes], col: Optional[int], name: str, required: bool,
+           filename: str, line_no: int, allow_negative: bool = False) -> int:
+    if col is None:
+        return 0
+    raw = fields[col]
+    try:
+        value = int(raw)
+    except ValueError:
+        if not raw.strip():
+            if not required:
+                return 0
+            raise WorkloadFormatError(f"missing value for '{name}'", filename, line_no) from None
+        raise WorkloadFormatError(f"invalid integer for '{name}': {raw.strip().decode('utf-8', 'replace')!r}",
+                                  filename, line_no) from None
+    if value < 0 and not allow_negative:
+        raise WorkloadFormatError(f"'{name}' must not be negative, got {value}", filename, line_no)
+    return value
+
+
+# Usage: python -m algorithms.workload_io input.csv output.bin
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python -m algorithms.workload_io input.csv output.bin")
+        sys.exit(1)
+    try:
+        convert_csv_to_binary(sys.argv[1], sys.argv[2])
+    except (OSError, ValueError) as e:
+        print("Conversion error:", e)
+        sys.exit(1)
@@ -0,0 +1,73 @@
+# Batch mode: run every workload file matched by the given globs against an algorithm matrix.
+# Files are read once, run largest first across a bounded pool of worker processes, and the
+# metrics of every (file, algorithm) run are streamed into a single CSV or JSON Lines file.
+#
+#   python batch_scheduler.py "traces/**/*.csv" -a FCFS -a SJF -a "RR q=2" -a "RR q=4" -o results.csv
+#   python batch_scheduler.py "traces/**/*.csv" -o results.jsonl --resume    # continue an interrupted batch
+
+import argparse
+import sys
+from algorithms.batch import (run_batch, parse_spec, default_specs, completed_runs, expand_inputs, applicable_specs,
+                              ResultSink)
+from algorithms.cache import ResultCache
+
+
+# Main function to run the batch
+# Options: -a/--algorithm SPEC  algorithm and parameters as on the scheduler.py command line (repeatable,
+#                               every algorithm with its defaults when omitted)
+#          -o/--output FILE     .csv, or .jsonl/.ndjson for JSON Lines (default batch_results.csv)
+#          -j/--workers N       worker processes (default: one per CPU)
+#          --resume             keep the rows already in the output and skip those runs
+#          --cache DIR          reuses results of earlier identical runs stored in DIR
+def main():
+    parser = argparse.ArgumentParser(description="Run a directory of workloads against every scheduling algorithm")
+    parser.add_argument('inputs', nargs='+', help="workload files or glob patterns ('**' matches subdirectories)")
+    parser.add_argument('-a', '--algorithm', action='append', dest='algorithms', metavar='SPEC',
+                        help="e.g. FCFS, 'RR q=2', 'MLFQ q=8,16,32 boost=100'")
+    parser.add_argument('-o', '--output', default='batch_results.csv', help="CSV or JSON Lines results file")
+    parser.add_argument('-j', '--workers', type=int, help="number of worker processes")
+    parser.add_argument('--resume', action='store_true', help="skip runs already present in the output")
+    parser.add_argument('--cache', help="result cache directory")
+    args = parser.parse_args()
+
+    try:
+        specs = [parse_spec(spec) for spec in args.algorithms] if args.algorithms else default_specs()
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        print("Error: No workload files match the given inputs.")
+        sys.exit(1)
+    done = completed_runs(args.output) if args.resume else set()
+    cache = ResultCache(args.cache) if args.cache else None
+
+    runs = [(path, spec) for path in paths for spec in applicable_specs(path, specs)]
+    total = len(runs)
+    remaining = sum(1 for path, spec in runs if (path, spec[0]) not in done)
+    print(f"{len(paths)} files x {len(specs)} algorithms = {total} runs"
+          + (f" ({total - remaining} already done)" if done else ""))
+
+    failed = 0
+    written = 0
+    with ResultSink(args.output, append=args.resume) as sink:
+        try:
+            for path, rows, error in run_batch(paths, specs, args.workers, cache, done):
+                sink.write(rows)
+                written += len(rows)
+                if error is not None:
+                    failed += 1
+                    print(f"  ✗ {path}: {error}", file=sys.stderr)
+                else:
+                    print(f"  ✓ {path} ({len(rows)} runs, {written}/{remaining})")
+        except KeyboardInterrupt:
+            print(f"\nInterrupted after {written} runs; continue with --resume")
+            sys.exit(130)
+
+    print(f"Results saved to: {args.output}" + (f" ({failed} files failed)" if failed else ""))
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
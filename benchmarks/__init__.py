@@ -0,0 +1,11 @@
+"""
+Scaling benchmarks for the CPU scheduling algorithms.
+Run with: python -m benchmarks.run --help
+"""
+
+from .generators import generate_workload, generate_processes
+
+__all__ = [
+    'generate_workload',
+    'generate_processes'
+]
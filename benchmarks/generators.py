@@ -0,0 +1,71 @@
+# Seeded synthetic workload generator for benchmarks.
+# Arrivals follow a Poisson process, bursts a heavy-tailed distribution and
+# priorities one of a few skewed distributions. Same seed -> same workload.
+from typing import List
+from array import array
+import math
+import random
+from algorithms.models import Process, Workload
+
+BURST_DISTRIBUTIONS = ('pareto', 'lognormal', 'exponential', 'uniform')
+PRIORITY_DISTRIBUTIONS = ('uniform', 'zipf', 'bimodal', 'constant')
+
+
+# n processes with pids 1..n in arrival order.
+# utilization is the offered load (mean burst / mean inter-arrival time); above 1 the queue keeps growing.
+def generate_workload(n: int, seed: int = 0, mean_burst: float = 100.0, utilization: float = 0.9,
+                      burst: str = 'pareto', priority: str = 'uniform', priority_levels: int = 8,
+                      pareto_alpha: float = 1.5, lognormal_sigma: float = 1.0) -> Workload:
+    if burst not in BURST_DISTRIBUTIONS:
+        raise ValueError(f"Unknown burst distribution '{burst}', expected one of {BURST_DISTRIBUTIONS}")
+    if priority not in PRIORITY_DISTRIBUTIONS:
+        raise ValueError(f"Unknown priority distribution '{priority}', expected one of {PRIORITY_DISTRIBUTIONS}")
+    if mean_burst <= 0 or utilization <= 0 or priority_levels <= 0:
+        raise ValueError("mean_burst, utilization and priority_levels must be positive")
+
+    rng = random.Random(seed)
+
+    # Poisson arrivals: exponential inter-arrival times with mean mean_burst / utilization
+    rate = utilization / mean_burst
+    arrivals = array('q')
+    clock = 0.0
+    for _ in range(n):
+        arrivals.append(int(clock))
+        clock += rng.expovariate(rate)
+
+    bursts = array('q', (max(1, round(x)) for x in _bursts(rng, n, burst, mean_burst, pareto_alpha, lognormal_sigma)))
+    priorities = array('q', _priorities(rng, n, priority, priority_levels))
+    return Workload(array('q', range(1, n + 1)), arrivals, bursts, priorities, arrival_order=range(n))
+
+
+# Same workload as a list of Process objects, for the list based entry points
+def generate_processes(n: int, seed: int = 0, **options) -> List[Process]:
+    return generate_workload(n, seed, **options).processes()
+
+
+def _bursts(rng: random.Random, n: int, kind: str, mean: float, alpha: float, sigma: float):
+    if kind == 'pareto':
+        # Pareto with the requested mean: x_m = mean * (alpha - 1) / alpha (needs alpha > 1)
+        if alpha <= 1:
+            raise ValueError("pareto_alpha must be greater than 1 for a finite mean")
+        scale = mean * (alpha - 1) / alpha
+        return (scale * rng.paretovariate(alpha) for _ in range(n))
+    if kind == 'lognormal':
+        mu = math.log(mean) - sigma * sigma / 2
+        return (rng.lognormvariate(mu, sigma) for _ in range(n))
+    if kind == 'exponential':
+        return (rng.expovariate(1 / mean) for _ in range(n))
+    return (rng.uniform(1, 2 * mean - 1) for _ in range(n))
+
+
+def _priorities(rng: random.Random, n: int, kind: str, levels: int):
+    if kind == 'uniform':
+        return (rng.randrange(levels) for _ in range(n))
+    if kind == 'zipf':
+        # P(level k) proportional to 1 / (k + 1): most processes get a high priority (small number)
+        weights = [1 / (k + 1) for k in range(levels)]
+        return iter(rng.choices(range(levels), weights=weights, k=n))
+    if kind == 'bimodal':
+        # Interactive (highest) vs batch (lowest) jobs, 30% interactive
+        return ((0 if rng.random() < 0.3 else levels - 1) for _ in range(n))
+    return (0 for _ in range(n))
@@ -0,0 +1,208 @@
+# Scaling benchmark: runs every scheduler entry point exported by `algorithms`
+# on synthetic workloads of growing size and writes the measurements as JSON.
+#
+#   python -m benchmarks.run --sizes 100,1000,10000 --out bench_results.json
+#
+# Each measurement runs in a fresh child process, so peak memory is not polluted
+# by earlier runs and a run that exceeds --max-seconds can be killed. Once an
+# entry point times out, larger sizes are skipped for it.
+from typing import Any, Callable, Dict, List, Optional, Tuple, get_args, get_origin
+import argparse
+import inspect
+import json
+import multiprocessing
+import platform
+import subprocess
+import sys
+import time
+import algorithms
+from algorithms.models import Process, ScheduleResult
+from .generators import generate_workload, BURST_DISTRIBUTIONS, PRIORITY_DISTRIBUTIONS
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+DEFAULT_SIZES = [10**2, 10**3, 10**4, 10**5, 10**6, 10**7]
+
+
+# Entry points exported by algorithms.__all__: name -> (input kind, extra arguments it needs)
+# The input kind is 'processes' (List[Process]) or 'workload' (Workload). Only schedulers are
+# kept: functions returning a ScheduleResult or the scheduled processes, not helpers that also
+# take a workload (e.g. the schedulability tests).
+def discover_entry_points() -> Dict[str, Tuple[str, Tuple[str, ...]]]:
+    entry_points = {}
+    for name in algorithms.__all__:
+        obj = getattr(algorithms, name)
+        if not inspect.isfunction(obj):
+            continue
+        signature = inspect.signature(obj)
+        params = list(signature.parameters.values())
+        if not params or params[0].name not in ('processes', 'workload'):
+            continue
+        if not _is_schedule(signature.return_annotation):
+            continue
+        required = tuple(p.name for p in params[1:] if p.default is inspect.Parameter.empty)
+        if any(r != 'quantum' for r in required):
+            continue  # needs arguments the benchmark cannot supply
+        entry_points[name] = (params[0].name, required)
+    return entry_points
+
+
+# ScheduleResult, List[Process], or a tuple starting with the List[Process] (e.g. round_robin_stats)
+def _is_schedule(annotation: Any) -> bool:
+    if get_origin(annotation) is tuple:
+        annotation = get_args(annotation)[0]
+    return annotation is ScheduleResult or annotation == List[Process]
+
+
+# Number of scheduling events of a run: dispatches when the engine counts them, otherwise one per process
+def _count_events(output: Any, n: int) -> int:
+    stats = getattr(output, 'stats', None)
+    if isinstance(output, tuple) and len(output) == 2:
+        stats = output[1]
+    return getattr(stats, 'dispatches', None) or n
+
+
+def _peak_rss_kib() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak  # bytes on macOS, KiB elsewhere
+
+
+def measure(name: str, size: int, seed: int, quantum: int, workload_options: Dict[str, Any]) -> Dict[str, Any]:
+    kind, required = discover_entry_points()[name]
+    function: Callable = getattr(algorithms, name)
+    workload = generate_workload(size, seed, **workload_options)
+    workload.arrival_order()
+    data = workload if kind == 'workload' else workload.processes()
+    kwargs = {'quantum': quantum} if 'quantum' in required else {}
+
+    # Warm-up on a tiny input so lazy imports (e.g. NumPy) are not timed
+    tiny = generate_workload(2, seed, **workload_options)
+    function(tiny if kind == 'workload' else tiny.processes(), **kwargs)
+
+    baseline = _peak_rss_kib()
+    started = time.perf_counter()
+    output = function(data, **kwargs)
+    wall = time.perf_counter() - started
+    peak = _peak_rss_kib()
+
+    events = _count_events(output, size)
+    return {
+        'entry_point': name,
+        'size': size,
+        'status': 'ok',
+        'wall_seconds': wall,
+        'peak_memory_kib': None if peak is None else max(0, peak - baseline),
+        'events': events,
+        'events_per_second': events / wall if wall > 0 else None,
+    }
+
+
+def _child(conn, args):
+    try:
+        conn.send(measure(*args))
+    except BaseException as e:
+        conn.send({'entry_point': args[0], 'size': args[1], 'status': 'error', 'error': repr(e)})
+    finally:
+        conn.close()
+
+
+# Run one measurement in a child process, killing it after max_seconds
+def measure_isolated(name: str, size: int, seed: int, quantum: int, workload_options: Dict[str, Any],
+                     max_seconds: float) -> Dict[str, Any]:
+    ctx = multiprocessing.get_context()
+    receiver, sender = ctx.Pipe(duplex=False)
+    child = ctx.Process(target=_child, args=(sender, (name, size, seed, quantum, workload_options)))
+    child.start()
+    sender.close()
+    if receiver.poll(max_seconds):
+        record = receiver.recv()
+    else:
+        record = {'entry_point': name, 'size': size, 'status': 'timeout', 'max_seconds': max_seconds}
+    child.terminate()
+    child.join()
+    return record
+
+
+def run_benchmarks(sizes: List[int], names: Optional[List[str]] = None, seed: int = 0, quantum: int = 50,
+                   max_seconds: float = 60.0, workload_options: Optional[Dict[str, Any]] = None,
+                   progress: Callable[[Dict[str, Any]], None] = None) -> List[Dict[str, Any]]:
+    entry_points = discover_entry_points()
+    names = names or sorted(entry_points)
+    for name in names:
+        if name not in entry_points:
+            raise ValueError(f"Unknown entry point '{name}', expected one of {sorted(entry_points)}")
+
+    records = []
+    for name in names:
+        stopped = False
+        for size in sorted(sizes):
+            if stopped:
+                record = {'entry_point': name, 'size': size, 'status': 'skipped'}
+            else:
+                record = measure_isolated(name, size, seed, quantum, workload_options or {}, max_seconds)
+                stopped = record['status'] != 'ok'
+            records.append(record)
+            if progress:
+                progress(record)
+    return records
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _print_record(record: Dict[str, Any]):
+    if record['status'] == 'ok':
+        memory = record['peak_memory_kib']
+        memory = '-' if memory is None else f"{memory / 1024:.1f} MiB"
+        print(f"{record['entry_point']:<28}{record['size']:>10}  {record['wall_seconds']:>10.4f} s"
+              f"  {memory:>12}  {record['events_per_second']:>14.0f} ev/s")
+    else:
+        print(f"{record['entry_point']:<28}{record['size']:>10}  {record['status']}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Scaling benchmark for the scheduling algorithms")
+    parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES),
+                        help="comma separated workload sizes")
+    parser.add_argument('--only', default='', help="comma separated entry points (default: all)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--quantum', type=int, default=50, help="quantum for Round Robin entry points")
+    parser.add_argument('--max-seconds', type=float, default=60.0,
+                        help="time limit per run; larger sizes are skipped after a timeout")
+    parser.add_argument('--burst', choices=BURST_DISTRIBUTIONS, default='pareto')
+    parser.add_argument('--priority', choices=PRIORITY_DISTRIBUTIONS, default='uniform')
+    parser.add_argument('--utilization', type=float, default=0.9)
+    parser.add_argument('--out', default='bench_results.json')
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(',') if s]
+    names = [s for s in args.only.split(',') if s] or None
+    options = {'burst': args.burst, 'priority': args.priority, 'utilization': args.utilization}
+
+    records = run_benchmarks(sizes, names, args.seed, args.quantum, args.max_seconds, options, _print_record)
+    report = {
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'config': {'sizes': sizes, 'seed': args.seed, 'quantum': args.quantum,
+                   'max_seconds': args.max_seconds, 'workload': options},
+        'results': records,
+    }
+    with open(args.out, 'w') as file:
+        json.dump(report, file, indent=2, sort_keys=True)
+    print(f"Results saved to: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
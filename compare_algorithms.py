@@ -1,125 +1,90 @@
 # Visual comparison of all scheduling algorithms.
 # Shows side-by-side comparison of metrics for the same input.
+# Each dataset is loaded once and the algorithms run in parallel worker processes.
 
-import subprocess
-import csv
+import argparse
 import os
+from algorithms.cache import ResultCache
+from algorithms.compare import compare_algorithms
+from algorithms.workload_io import load_workload
+from algorithms.export import FORMATS
 
-# Function to run algorithm and extract average metrics
-def run_and_get_metrics(input_file, algorithm, quantum=None):
-    cmd = ['python', 'scheduler.py', input_file, algorithm]
-    if quantum:
-        cmd.append(f'q={quantum}')
-    
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    
-    # Determine output file
-    output_files = {
-        'FCFS': 'output_fcfs.csv',
-        'SJF': 'output_sjf.csv',
-        'SJF_P': 'output_sjf_preemptive.csv',
-        'PS': 'output_priority.csv',
-        'RR': 'output_rr.csv'
-    }
-    
-    output_file = output_files.get(algorithm)
-    if not output_file or not os.path.exists(output_file):
-        return None
-    
-    # Read metrics
-    with open(output_file, 'r') as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
-    
-    if not rows:
-        return None
-    
-    avg_turnaround = sum(int(row['turnaround_time']) for row in rows) / len(rows)
-    avg_waiting = sum(int(row['waiting_time']) for row in rows) / len(rows)
-    
-    return {
-        'algorithm': algorithm + (f' (q={quantum})' if quantum else ''),
-        'avg_turnaround': avg_turnaround,
-        'avg_waiting': avg_waiting,
-        'processes': len(rows)
-    }
 
+# Function to run every algorithm on one dataset and print the comparison table.
+# With output_dir, each run's results are saved in output_dir/<dataset name>/.
+def compare_dataset(input_file, specs, cache=None, output_dir=None, output_format='csv'):
+    workload = load_workload(input_file)
 
-# Main function to run the comparison
-def main():
-    print("\n" + "="*100)
-    print("CPU SCHEDULING ALGORITHMS - PERFORMANCE COMPARISON")
-    print("="*100)
-    
-    # Test with sample_input.csv
-    print(f"\n{'Dataset: sample_input.csv (5 processes)'}")
+    print(f"\nDataset: {input_file} ({len(workload)} processes)")
     print("-"*100)
-    
-    algorithms = [
-        ('sample_input.csv', 'FCFS', None),
-        ('sample_input.csv', 'SJF', None),
-        ('sample_input.csv', 'SJF_P', None),
-        ('sample_input.csv', 'RR', 2),
-        ('sample_input.csv', 'RR', 4),
-    ]
-    
-    results = []
-    for input_file, algorithm, quantum in algorithms:
-        metrics = run_and_get_metrics(input_file, algorithm, quantum)
-        if metrics:
-            results.append(metrics)
-    
+
+    if output_dir is not None:
+        output_dir = os.path.join(output_dir, os.path.splitext(os.path.basename(input_file))[0])
+    results = compare_algorithms(workload, specs, cache=cache, output_dir=output_dir, output_format=output_format)
+
     # Display results
-    print(f"\n{'Algorithm':<30} {'Avg Turnaround (ms)':<25} {'Avg Waiting (ms)':<25}")
+    print(f"\n{'Algorithm':<30} {'Avg Turnaround (ms)':<22} {'Avg Waiting (ms)':<20} {'P95 Waiting':<14} {'Max Waiting':<14} {'CPU Util':<10}")
     print("-"*100)
     for r in results:
-        print(f"{r['algorithm']:<30} {r['avg_turnaround']:<25.2f} {r['avg_waiting']:<25.2f}")
-    
+        print(f"{r['algorithm']:<30} {r['avg_turnaround']:<22.2f} {r['avg_waiting']:<20.2f} {r['p95_waiting']:<14g} "
+              f"{r['max_waiting']:<14g} {r['cpu_utilization'] * 100:<.1f}%")
+
     # Find best algorithms
     best_turnaround = min(results, key=lambda x: x['avg_turnaround'])
     best_waiting = min(results, key=lambda x: x['avg_waiting'])
-    
+
     print("\n" + "="*100)
     print("ANALYSIS")
     print("="*100)
     print(f"✓ Best Average Turnaround Time: {best_turnaround['algorithm']} ({best_turnaround['avg_turnaround']:.2f} ms)")
     print(f"✓ Best Average Waiting Time: {best_waiting['algorithm']} ({best_waiting['avg_waiting']:.2f} ms)")
-    
-    # Test with example_input.csv (more processes)
-    print(f"\n{'='*100}")
-    print(f"{'Dataset: example_input.csv (7 processes)'}")
-    print("-"*100)
-    
-    algorithms2 = [
-        ('example_input.csv', 'FCFS', None),
-        ('example_input.csv', 'SJF', None),
-        ('example_input.csv', 'SJF_P', None),
-        ('example_input.csv', 'PS', None),
-        ('example_input.csv', 'RR', 3),
-        ('example_input.csv', 'RR', 5),
-    ]
-    
-    results2 = []
-    for input_file, algorithm, quantum in algorithms2:
-        metrics = run_and_get_metrics(input_file, algorithm, quantum)
-        if metrics:
-            results2.append(metrics)
-    
-    print(f"\n{'Algorithm':<30} {'Avg Turnaround (ms)':<25} {'Avg Waiting (ms)':<25}")
-    print("-"*100)
-    for r in results2:
-        print(f"{r['algorithm']:<30} {r['avg_turnaround']:<25.2f} {r['avg_waiting']:<25.2f}")
-    
-    # Find best algorithms
-    best_turnaround2 = min(results2, key=lambda x: x['avg_turnaround'])
-    best_waiting2 = min(results2, key=lambda x: x['avg_waiting'])
-    
+    best_tail = min(results, key=lambda x: x['p95_waiting'])
+    print(f"✓ Best P95 Waiting Time: {best_tail['algorithm']} ({best_tail['p95_waiting']:g} ms)")
+    if output_dir is not None:
+        print(f"✓ Results saved to: {output_dir}/")
+    return results
+
+
+# Main function to run the comparison
+# Options: --cache DIR    reuses results of earlier identical runs stored in DIR
+#          --output DIR   saves the results of every run, one subdirectory per dataset
+#          --format FMT   csv (default), jsonl or binary
+def main():
+    parser = argparse.ArgumentParser(description="Compare every scheduling algorithm on the sample inputs")
+    parser.add_argument('--cache', help="result cache directory")
+    parser.add_argument('--output', help="directory for the per-run results files")
+    parser.add_argument('--format', choices=FORMATS, default='csv', help="results file format")
+    args = parser.parse_args()
+    cache = ResultCache(args.cache) if args.cache else None
+    output = {'output_dir': args.output, 'output_format': args.format}
+
     print("\n" + "="*100)
-    print("ANALYSIS")
+    print("CPU SCHEDULING ALGORITHMS - PERFORMANCE COMPARISON")
     print("="*100)
-    print(f"✓ Best Average Turnaround Time: {best_turnaround2['algorithm']} ({best_turnaround2['avg_turnaround']:.2f} ms)")
-    print(f"✓ Best Average Waiting Time: {best_waiting2['algorithm']} ({best_waiting2['avg_waiting']:.2f} ms)")
-    
+
+    # Test with sample_input.csv
+    compare_dataset('inputs/sample_input.csv', [
+        ('FCFS', {}),
+        ('SJF', {}),
+        ('SJF_P', {}),
+        ('RR', {'quantum': 2}),
+        ('RR', {'quantum': 4}),
+        ('MLFQ', {'quanta': (2, 4, 8)}),
+    ], cache, **output)
+
+    # Test with example_input.csv (with priorities)
+    print(f"\n{'='*100}")
+    compare_dataset('inputs/example_input.csv', [
+        ('FCFS', {}),
+        ('SJF', {}),
+        ('SJF_P', {}),
+        ('PS', {}),
+        ('RR', {'quantum': 3}),
+        ('RR', {'quantum': 5}),
+        ('MLFQ', {'quanta': (2, 4, 8), 'boost_interval': 20}),
+        ('CFS', {}),
+    ], cache, **output)
+
     print("\n" + "="*100)
     print("KEY INSIGHTS")
     print("="*100)
@@ -128,6 +93,8 @@ def main():
     print("• Round Robin provides fairness but may have higher average times")
     print("• Priority Scheduling is effective when process priorities are well-defined")
     print("• Preemptive algorithms (SJF_P, RR) are better for interactive systems")
+    print("• MLFQ favors short interactive jobs without knowing burst times in advance")
+    print("• CFS shares the CPU in proportion to priority weights instead of running strictly by priority")
     print("="*100 + "\n")
 
 if __name__ == "__main__":
@@ -0,0 +1,82 @@
+# Monte Carlo mode: burst and arrival times are estimates, so instead of one deterministic run the
+# algorithm is run on many seeded replications of the workload with the times drawn around the
+# trace values, and every metric is reported with its confidence interval.
+#
+#   python montecarlo_scheduler.py inputs/sample_input.csv RR q=2 -n 1000 --burst lognormal:0.3 --arrival jitter:2
+#   python montecarlo_scheduler.py traza.bin SJF_P -n 5000 --burst empirical -o resumen.json
+
+import argparse
+import json
+import sys
+from algorithms.montecarlo import run_replications, parse_distribution
+from algorithms.workload_io import load_workload
+from algorithms import registry
+
+# Metrics shown in the console table, in order
+SHOWN = ('avg_turnaround', 'avg_waiting', 'avg_response', 'p95_turnaround', 'p95_waiting',
+         'max_waiting', 'makespan', 'cpu_utilization', 'throughput')
+
+
+# Main function to run the replications
+# Options: -n/--replications N   number of replications (default 1000)
+#          --burst DIST          fixed, jitter:MS, lognormal:SIGMA, empirical or empirical:FILE (default lognormal:0.25)
+#          --arrival DIST        same distributions, over the gaps between arrivals for lognormal/empirical (default fixed)
+#          --seed S              replications are reproducible for a given seed, whatever the number of workers
+#          --confidence C        confidence level of the intervals (default 0.95)
+#          -j/--workers N        worker processes (default: one per CPU)
+#          -o/--output FILE      also save the full summary as JSON
+def main():
+    parser = argparse.ArgumentParser(description="Run a scheduling algorithm on seeded random replications of a workload")
+    parser.add_argument('input', help="workload file (CSV or binary)")
+    parser.add_argument('algorithm', help="algorithm name, e.g. RR")
+    parser.add_argument('params', nargs='*', help="algorithm parameters, e.g. q=2")
+    parser.add_argument('-n', '--replications', type=int, default=1000, help="number of replications")
+    parser.add_argument('--burst', default='lognormal:0.25', help="burst time distribution")
+    parser.add_argument('--arrival', default='fixed', help="arrival time distribution")
+    parser.add_argument('--seed', default='0', help="random seed")
+    parser.add_argument('--confidence', type=float, default=0.95, help="confidence level")
+    parser.add_argument('-j', '--workers', type=int, help="number of worker processes")
+    parser.add_argument('-o', '--output', help="JSON summary file")
+    args = parser.parse_args()
+
+    try:
+        algorithm = registry.get(args.algorithm.upper())
+        if not algorithm.cli:
+            raise ValueError(f"Unknown algorithm '{algorithm.name}'")
+        params = algorithm.parse_args(args.params)
+        burst = parse_distribution(args.burst)
+        arrival = parse_distribution(args.arrival)
+        workload = load_workload(args.input)
+        summary = run_replications(workload, algorithm.name, params, args.replications, arrival, burst,
+                                   args.seed, args.workers, args.confidence)
+    except FileNotFoundError as e:
+        print(f"Error: File '{e.filename}' not found.")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    print(f"\n{algorithm.describe(params)}")
+    print(f"{summary['replications']} replications of {args.input} ({len(workload)} processes), "
+          f"burst {summary['burst']}, arrival {summary['arrival']}, seed {args.seed}")
+    level = f"{args.confidence * 100:g}% CI"
+    print("-" * 96)
+    print(f"{'Metric':<18} {'Mean':>12} {level:>26} {'Std':>10} {'P5':>12} {'P95':>12}")
+    print("-" * 96)
+    for name in SHOWN:
+        m = summary['metrics'][name]
+        interval = f"[{m['ci_low']:.4g}, {m['ci_high']:.4g}]"
+        print(f"{name:<18} {m['mean']:>12.4g} {interval:>26} {m['std']:>10.4g} {m['p5']:>12.4g} {m['p95']:>12.4g}")
+    pooled = summary['pooled']
+    print(f"\nAll processes, all replications: P50/P95/P99 waiting = {pooled['p50_waiting']:.4g} / "
+          f"{pooled['p95_waiting']:.4g} / {pooled['p99_waiting']:.4g} ms, max waiting = {pooled['max_waiting']:g} ms")
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(summary, file, indent=2)
+            file.write('\n')
+        print(f"Summary saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
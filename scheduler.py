@@ -1,75 +1,38 @@
 # CPU Scheduling
+import os
 import sys
-import csv
-from typing import List, Dict
-from algorithms import (
-    Process,
-    fcfs_scheduler,
-    sjf_non_preemptive,
-    sjf_preemptive,
-    priority_scheduler,
-    round_robin_scheduler,
-    priority_preemptive
-
-)
+from typing import Any, List, Dict, Tuple
+import dataclasses
+from contextlib import nullcontext
+from algorithms import registry
+from algorithms.models import Process, Workload, ScheduleResult
+from algorithms.workload_io import load_csv_workload, load_workload, WorkloadFormatError
+from algorithms.timeline import open_timeline
+from algorithms.profiler import Profiler
+from algorithms.export import export_result, FORMATS, EXTENSIONS
+from algorithms.metrics import MetricsAggregator
 
+# Read processes from a CSV file; raises WorkloadFormatError with the line number on malformed rows
 def read_processes_from_csv(filename: str) -> List[Process]:
-    processes = []
-    try:
-        with open(filename, 'r', encoding="utf-8") as file:
-            # Remove BOM and normalize
-            reader = csv.DictReader((line.replace('\ufeff','') for line in file))
-
-            for row in reader:
-                # Normalize column names and values
-                row = {k.strip(): v.strip() for k, v in row.items()}
-
-                # PID obligatorio
-                if "pid" not in row:
-                    raise KeyError("Column 'pid' not found in CSV (BOM or spaces detected).")
-
-                pid = int(row["pid"])
-
-                # arrival_time opcional
-                arrival_time = int(row.get("arrival_time", "0") or 0)
-
-                # burst_time obligatorio
-                if "burst_time" not in row:
-                    raise KeyError("Column 'burst_time' not found.")
-
-                burst_time = int(row["burst_time"])
+    return load_csv_workload(filename).processes()
 
-                # priority opcional
-                priority = int(row.get("priority", "0") or 0)
 
-                processes.append(Process(
-                    pid=pid,
-                    arrival_time=arrival_time,
-                    burst_time=burst_time,
-                    priority=priority
-                ))
+# Summary metrics in one streaming pass (averages, tail percentiles, utilization, ...)
+def calculate_metrics(processes: List[Process], cpus: int = 1) -> Dict[str, Any]:
+    return MetricsAggregator(cpus=cpus).add_processes(processes).summary()
 
-        return processes
 
-    except Exception as e:
-        print("CSV read error:", e)
-        sys.exit(1)
-
-
-# Function to calculate average turnaround time and waiting time
+# Function to calculate average turnaround time and waiting time (0 for an empty list)
 def calculate_averages(processes: List[Process]) -> Dict[str, float]:
-    n = len(processes)
-    avg_turnaround = sum(p.turnaround_time for p in processes) / n
-    avg_waiting = sum(p.waiting_time for p in processes) / n
-    
+    metrics = calculate_metrics(processes)
     return {
-        'avg_turnaround_time': avg_turnaround,
-        'avg_waiting_time': avg_waiting
+        'avg_turnaround_time': metrics['avg_turnaround'],
+        'avg_waiting_time': metrics['avg_waiting']
     }
 
 
 # Function to print scheduling results in a formatted table
-def print_results(processes: List[Process], algorithm: str, has_priority: bool = False):
+def print_results(processes: List[Process], algorithm: str, has_priority: bool = False, cpus: int = 1):
     print(f"\n{'='*100}")
     print(f"CPU Scheduling Algorithm: {algorithm}")
     print(f"{'='*100}")
@@ -94,120 +57,280 @@ def print_results(processes: List[Process], algorithm: str, has_priority: bool =
             row = f"{p.pid:<8}{p.arrival_time:<12}{p.burst_time:<12}{p.completion_time:<15}{p.turnaround_time:<15}{p.waiting_time:<12}"
         print(row)
     
-    # Averages
-    averages = calculate_averages(processes)
+    # Averages, tail latency and CPU usage
+    metrics = calculate_metrics(processes, cpus)
     print('-' * 100)
-    print(f"Average Turnaround Time: {averages['avg_turnaround_time']:.2f} ms")
-    print(f"Average Waiting Time: {averages['avg_waiting_time']:.2f} ms")
+    print(f"Average Turnaround Time: {metrics['avg_turnaround']:.2f} ms")
+    print(f"Average Waiting Time: {metrics['avg_waiting']:.2f} ms")
+    for name in ('turnaround', 'waiting'):
+        print(f"{name.capitalize() + ' P50/P95/P99/Max:':<32}{metrics[f'p50_{name}']:g} / {metrics[f'p95_{name}']:g} / "
+              f"{metrics[f'p99_{name}']:g} / {metrics[f'max_{name}']:g} ms")
+    print(f"CPU Utilization: {metrics['cpu_utilization'] * 100:.2f}%   Idle Time: {metrics['idle_time']} ms   "
+          f"Throughput: {metrics['throughput']:.4f} processes/ms")
+    if has_priority and len(metrics['by_priority']) > 1:
+        print('-' * 100)
+        print(f"{'Priority':<12}{'Processes':<12}{'Avg Turnaround':<18}{'Avg Waiting':<15}{'P95 Waiting':<15}{'Max Waiting':<12}")
+        for priority, group in metrics['by_priority'].items():
+            print(f"{priority:<12}{group['processes']:<12}{group['avg_turnaround']:<18.2f}{group['avg_waiting']:<15.2f}"
+                  f"{group['p95_waiting']:<15g}{group['max_waiting']:<12g}")
     print(f"{'='*100}\n")
 
 
 
-# Function to save scheduling results to a CSV file
-# def save_to_csv(processes: List[Process], filename: str, has_priority: bool = False):
-#     # Sort by PID for output
-#     sorted_processes = sorted(processes, key=lambda p: p.pid)
-    
-#     with open(filename, 'w', newline='') as file:
-#         if has_priority:
-#             fieldnames = ['pid', 'arrival_time', 'burst_time', 'priority', 
-#                          'completion_time', 'turnaround_time', 'waiting_time']
-#         else:
-#             fieldnames = ['pid', 'arrival_time', 'burst_time', 
-#                          'completion_time', 'turnaround_time', 'waiting_time']
-        
-#         writer = csv.DictWriter(file, fieldnames=fieldnames)
-#         writer.writeheader()
-        
-#         for p in sorted_processes:
-#             row = {
-#                 'pid': p.pid,
-#                 'arrival_time': p.arrival_time,
-#                 'burst_time': p.burst_time,
-#                 'completion_time': p.completion_time,
-#                 'turnaround_time': p.turnaround_time,
-#                 'waiting_time': p.waiting_time
-#             }
-#             if has_priority:
-#                 row['priority'] = p.priority
-            
-#             writer.writerow(row)
-    
-#     print(f"Results saved to: {filename}")
+# Function to save scheduling results to a CSV file (rows sorted by PID)
+def save_to_csv(processes: List[Process], filename: str, has_priority: bool = False):
+    result = ScheduleResult(Workload.from_processes(processes), [p.start_time for p in processes],
+                            [p.completion_time for p in processes])
+    export_result(result, filename, 'csv', has_priority)
+    print(f"Results saved to: {filename}")
 
 
+# Options that take no value
+FLAGS = ('check',)
+
+
+# Split "--name value" / "--name=value" options (and "--flag" FLAGS) from the positional arguments
+def parse_options(args: List[str]) -> Tuple[List[str], Dict[str, str]]:
+    positional, options = [], {}
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg.startswith('--'):
+            name, sep, value = arg[2:].partition('=')
+            if not sep and name in FLAGS:
+                value = ''
+            elif not sep:
+                if i + 1 >= len(args):
+                    print(f"Error: Option '--{name}' requires a value")
+                    sys.exit(1)
+                i += 1
+                value = args[i]
+            options[name] = value
+        else:
+            positional.append(arg)
+        i += 1
+    return positional, options
+
+
+# Print the counters of the run's stats dataclass, plus the per-core table of a multi-core run
+def print_stats(stats: Any):
+    if stats is None or not dataclasses.is_dataclass(stats):
+        return
+    cores = getattr(stats, 'cores', None)
+    if cores:
+        print(f"{'Core':<8}{'Busy':<12}{'Utilization':<14}{'Dispatches':<13}{'Completed':<12}{'Migrations in':<14}")
+        for core, core_stats in enumerate(cores):
+            print(f"{core:<8}{core_stats.busy_time:<12}{core_stats.utilization * 100:<14.2f}"
+                  f"{core_stats.dispatches:<13}{core_stats.completed:<12}{core_stats.migrations_in:<14}")
+    counters = [(f.name, getattr(stats, f.name)) for f in dataclasses.fields(stats)
+                if type(getattr(stats, f.name)) is int]
+    if counters:
+        print('  '.join(f"{name.replace('_', ' ').capitalize()}: {value}" for name, value in counters) + "\n")
+
+
+# Deadline misses and lateness of the jobs with a deadline, for any algorithm
+def print_deadlines(result: ScheduleResult):
+    from algorithms.realtime import deadline_report
+    report = deadline_report(result)
+    if not report['jobs']:
+        return
+    print(f"Deadline misses: {report['deadline_misses']}/{report['jobs']} ({report['miss_ratio'] * 100:.2f}%)   "
+          f"Lateness avg/max: {report['avg_lateness']:.2f} / {report['max_lateness']} ms   "
+          f"Tardiness P50/P95/P99: {report['p50_tardiness']:g} / {report['p95_tardiness']:g} / "
+          f"{report['p99_tardiness']:g} ms\n")
+
+
+# Response time and CPU/device utilization of an I/O simulator run
+def print_io(result: ScheduleResult):
+    from algorithms.iosim import io_report
+    report = io_report(result)
+    devices = '  '.join(f"{device}: {utilization * 100:.2f}%"
+                        for device, utilization in enumerate(report['device_utilization']))
+    print(f"Avg Response Time (per CPU burst): {report['avg_response']:.2f} ms   "
+          f"Avg Ready Queue Wait: {report['avg_ready_wait']:.2f} ms   Avg Device Queue Wait: {report['avg_device_wait']:.2f} ms")
+    print(f"CPU Utilization: {report['cpu_utilization'] * 100:.2f}%   Device Utilization: {devices or '-'}\n")
+
+
+def usage() -> str:
+    return ("Usage: python scheduler.py input_file [" + '|'.join(registry.names(cli_only=True)) + "] "
+            "[q=time_quantum] [boost=interval] [latency=L granularity=G] [--timeline FILE] [--cache DIR] [--cores N] "
+            "[--profile FILE] [--output FILE] [--format csv|jsonl|binary] [horizon=H] [--check]")
 
 
 # Main Function to parse arguments and run the scheduler
-def main():  
-    input_file = sys.argv[1]
-    algorithm = sys.argv[2].upper()
+# The algorithm and its key=value parameters come from algorithms.registry; only its engine is imported.
+# Options: --timeline FILE  writes the Gantt segments (pid,start,end) as CSV, or JSON Lines for .jsonl
+#          --cache DIR      reuses results of earlier identical runs stored in DIR (--cache-size MiB, default 1024)
+#          --cores N        simulates N cores with per-core queues (--balance steal|rebalance|affinity|none)
+#          --profile FILE   writes engine counters (decisions, preemptions, idle jumps, ready queue sizes)
+#                           and the time of each phase as JSON
+#          --output FILE    results file (default output_<algorithm>.csv), in pid order
+#          --format FORMAT  csv, jsonl or binary (default: from the --output extension)
+#          --check          real-time algorithms (EDF, RM): stop after the schedulability test when it is conclusive
+# Workloads with a 'bursts' column (alternating CPU and I/O bursts) run on the I/O simulator with the
+# algorithm (FCFS, SJF, SJF_P, PS, PS_P or RR) as the CPU discipline.
+def main():
+    args, options = parse_options(sys.argv[1:])
+    if len(args) < 2:
+        print(usage())
+        sys.exit(1)
+    input_file = args[0]
+    
+    # Select the algorithm and parse its parameters
+    try:
+        algorithm = registry.get(args[1].upper())
+        if not algorithm.cli:
+            raise ValueError(f"Unknown algorithm '{algorithm.name}'")
+    except ValueError as e:
+        print(f"Error: {e}")
+        print("Valid algorithms: " + ', '.join(registry.names(cli_only=True)))
+        sys.exit(1)
+    try:
+        params = algorithm.parse_args(args[2:])
+    except ValueError as e:
+        print(f"Error: Invalid {algorithm.name} parameters: {e}")
+        if algorithm.example:
+            print(f"Example: python scheduler.py input.csv {algorithm.example}")
+        sys.exit(1)
     
-    # Read processes from csv
-    processes = read_processes_from_csv(input_file)
+    # Results file: --output, or the algorithm's default name with the extension of --format
+    output_format = options.get('format')
+    if output_format is not None and output_format not in FORMATS:
+        print(f"Error: Unknown output format '{output_format}'. Valid: {', '.join(FORMATS)}")
+        sys.exit(1)
+    output_file = options.get('output')
+    if not output_file:
+        output_file = algorithm.output_file or f"output_{algorithm.name.lower()}.csv"
+        if output_format is not None:
+            output_file = os.path.splitext(output_file)[0] + EXTENSIONS[output_format]
+    
+    profiler = Profiler() if 'profile' in options else None
+    if profiler is not None and not algorithm.profile:
+        print(f"Error: {algorithm.name} does not support --profile")
+        sys.exit(1)
     
-    if not processes:
+    # Read the workload (CSV or binary, detected from the file contents)
+    try:
+        with profiler.phase('read') if profiler else nullcontext():
+            workload = load_workload(input_file)
+    except (OSError, WorkloadFormatError) as e:
+        print("Workload read error:", e)
+        sys.exit(1)
+    
+    if len(workload) == 0:
         print("Error: No processes found in input file.")
         sys.exit(1)
     
-    # Run the selected algorithm
-    result_processes = None
-    algorithm_name = ""
-    has_priority = False
-    
-    if algorithm == "FCFS":
-        result_processes = fcfs_scheduler(processes)
-        algorithm_name = "First Come First Serve (FCFS)"
-        output_file = "output_fcfs.csv"
-    
-    elif algorithm == "SJF":
-        result_processes = sjf_non_preemptive(processes)
-        algorithm_name = "Shortest Job First (Non-Preemptive)"
-        output_file = "output_sjf.csv"
-    
-    elif algorithm == "SJF_P":
-        result_processes = sjf_preemptive(processes)
-        algorithm_name = "Shortest Job First (Preemptive/SRTF)"
-        output_file = "output_sjf_preemptive.csv"
-    
-    elif algorithm == "PS":
-        result_processes = priority_scheduler(processes)
-        algorithm_name = "Priority Scheduling"
-        has_priority = True
-        output_file = "output_priority.csv"
-    elif algorithm == "PS_P":
-        result_processes = priority_preemptive(processes)
-        algorithm_name = "Priority Scheduling (Preemptive)"
-        has_priority = True
-
-    
-    elif algorithm == "RR":
-        # Parse quantum
-        if len(sys.argv) < 4 or not sys.argv[3].startswith('q='):
-            print("Error: Round Robin requires time quantum parameter (q=value)")
-            print("Example: python scheduler.py input.csv RR q=2")
-            sys.exit(1)
-        
+    # Real-time algorithms: the O(n) utilization test, which may make the simulation unnecessary
+    if 'check' in options and not algorithm.realtime:
+        print("Error: --check is only available for real-time algorithms")
+        sys.exit(1)
+    if algorithm.realtime:
+        from algorithms.realtime import schedulability, UNKNOWN
+        test = schedulability(workload, algorithm.name)
+        print(f"Schedulability test ({algorithm.name}): {test.verdict}, {test.reason}")
+        if 'check' in options and test.verdict != UNKNOWN:
+            sys.exit(0)
+    
+    name, algorithm_name = algorithm.name, algorithm.describe(params)
+    engine = algorithm.load()
+    supports_timeline = algorithm.timeline
+    runner = algorithm.name  # what runs the workload, named in the --timeline error
+    
+    # --cores N runs the selected policy on N cores with per-core ready queues
+    cores = 1
+    if 'cores' in options:
         try:
-            quantum = int(sys.argv[3].split('=')[1])
-            if quantum <= 0:
-                raise ValueError("Quantum must be positive")
-        except (ValueError, IndexError):
-            print("Error: Invalid quantum value. Must be a positive integer.")
+            cores = int(options['cores'])
+            if cores <= 0:
+                raise ValueError("Number of cores must be positive")
+        except ValueError:
+            print("Error: Invalid number of cores. Must be a positive integer.")
+            sys.exit(1)
+        if not algorithm.smp:
+            print(f"Error: {algorithm.name} is not supported together with --cores")
             sys.exit(1)
-        
-        result_processes = round_robin_scheduler(processes, quantum)
-        algorithm_name = f"Round Robin (Quantum = {quantum} ms)"
-        output_file = "output_rr.csv"
+        smp = registry.get('SMP')
+        balance = options.get('balance', 'steal')
+        engine, supports_timeline = smp.load(), smp.timeline
+        runner = f"{algorithm.name} together with --cores"
+        if profiler is not None and not smp.profile:
+            print("Error: --profile is not supported together with --cores")
+            sys.exit(1)
+        params = {'cores': cores, 'policy': algorithm.name, 'params': params, 'balancer': balance}
+        name, algorithm_name = smp.name, f"{algorithm_name} on {cores} cores ({balance})"
     
-    else:
-        print(f"Error: Unknown algorithm '{algorithm}'")
-        print("Valid algorithms: FCFS, SJF, SJF_P, PS, RR, PS_P")
-        sys.exit(1)
+    # Workloads with CPU/I-O burst sequences run on the I/O simulator, with the algorithm as the CPU discipline
+    if workload.io is not None:
+        from algorithms.iosim import DISCIPLINES
+        if algorithm.name not in DISCIPLINES:
+            print(f"Error: {algorithm.name} is not available for CPU/I-O burst workloads "
+                  f"(use {', '.join(DISCIPLINES)})")
+            sys.exit(1)
+        if 'cores' in options:
+            print("Error: CPU/I-O burst workloads run on a single core, --cores is not supported")
+            sys.exit(1)
+        io = registry.get('IO')
+        engine, supports_timeline = io.load(), io.timeline
+        runner = f"{algorithm.name} on CPU/I-O burst workloads"
+        params = {'policy': algorithm.name, 'params': params}
+        name, algorithm_name = io.name, f"{algorithm_name} with I/O bursts"
+    
+    timeline = None
+    if 'timeline' in options:
+        if not supports_timeline:
+            print(f"Error: --timeline is not supported for {runner}")
+            sys.exit(1)
+        timeline = open_timeline(options['timeline'])
+    
+    # Run it, through the result cache when one is configured (a Gantt timeline or a profile always needs a real run)
+    def run():
+        extra = {}
+        if timeline is not None:
+            extra['timeline'] = timeline
+        if profiler is not None:
+            extra['profiler'] = profiler
+            with profiler.phase('sort'):
+                workload.arrival_order()
+            with profiler.phase('schedule'):
+                return engine(workload, **params, **extra)
+        return engine(workload, **params, **extra)
+
+    # The timeline is closed (and its buffered segments written) however the run ends
+    with timeline if timeline is not None else nullcontext():
+        try:
+            if 'cache' in options and timeline is None and profiler is None:
+                from algorithms.cache import ResultCache, DEFAULT_MAX_BYTES
+                try:
+                    max_bytes = int(float(options.get('cache-size', DEFAULT_MAX_BYTES >> 20)) * (1 << 20))
+                except ValueError:
+                    print("Error: Invalid cache size. Must be a number of MiB.")
+                    sys.exit(1)
+                cache = ResultCache(options['cache'], max_bytes)
+                result = cache.run(workload, name, params, run)
+                print(f"Result cache: {'hit' if cache.hits else 'miss'} ({options['cache']})")
+            else:
+                result = run()
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
     
-    # Display and save results
-    print_results(result_processes, algorithm_name, has_priority)
-    #save_to_csv(result_processes, output_file, has_priority)
+        # Display and save results
+        with profiler.phase('report') if profiler else nullcontext():
+            print_results(result.processes(), algorithm_name, algorithm.has_priority, cores)
+            print_stats(result.stats)
+            if result.workload.realtime:
+                print_deadlines(result)
+            if result.workload.io is not None:
+                print_io(result)
+        with profiler.phase('export') if profiler else nullcontext():
+            export_result(result, output_file, output_format, algorithm.has_priority)
+        print(f"Results saved to: {output_file}")
+    if timeline is not None:
+        print(f"Timeline saved to: {options['timeline']} ({len(timeline)} segments)")
+    if profiler is not None:
+        profiler.dump(options['profile'], algorithm=algorithm_name, processes=len(workload))
+        print(f"Profile saved to: {options['profile']}")
 
 
 if __name__ == "__main__":
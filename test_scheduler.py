@@ -1,28 +1,36 @@
 # Test script to verify all scheduling algorithms and compare results.
-import subprocess
-import csv
+# Each input file is loaded once and its algorithms run in parallel in-process workers.
 import os
+import tempfile
+from algorithms.compare import compare_algorithms, run_algorithm
+from algorithms.batch import run_batch, parse_spec, default_specs
+from algorithms.cache import ResultCache
+from algorithms.export import FORMATS, load_binary_result
+from algorithms.models import Process, Workload
+from algorithms.workload_io import load_workload, write_binary_workload, WorkloadFormatError
+from algorithms.realtime import analyze, schedulability, run_edf, expand_periodic, FEASIBLE
+from algorithms.iosim import run_io, io_report, DISCIPLINES
+from algorithms.priority_p import AgingPolicy, run_priority_preemptive
 
-# Function to run a scheduling algorithm and return the output
-def run_algorithm(input_file, algorithm, quantum=None):
-    cmd = ['python', 'scheduler.py', input_file, algorithm]
-    if quantum:
-        cmd.append(f'q={quantum}')
-    
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    return result.stdout, result.returncode
 
+# Function to run the algorithms of every input file and return the metrics in test order.
+# With output_dir, the results of each file are also saved in output_dir/<file name>/.
+def run_tests(tests, output_dir=None, output_format='csv'):
+    by_file = {}
+    for input_file, algorithm, quantum in tests:
+        params = {'quantum': quantum} if quantum else {}
+        by_file.setdefault(input_file, []).append((algorithm, params))
 
-
-# Function to read and display CSV output
-def read_csv_output(filename):
-    if not os.path.exists(filename):
-        return None
-    
-    with open(filename, 'r') as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
-    return rows
+    metrics = {}
+    for input_file, specs in by_file.items():
+        workload = load_workload(input_file)
+        directory = None
+        if output_dir is not None:
+            directory = os.path.join(output_dir, os.path.splitext(os.path.basename(input_file))[0])
+        results = compare_algorithms(workload, specs, output_dir=directory, output_format=output_format)
+        for (algorithm, params), result in zip(specs, results):
+            metrics[(input_file, algorithm, params.get('quantum'))] = result
+    return [metrics[(input_file, algorithm, quantum)] for input_file, algorithm, quantum in tests]
 
 
 # Main function to run the test
@@ -30,63 +38,190 @@ def main():
     print("="*100)
     print("CPU SCHEDULING SIMULATOR - COMPREHENSIVE TEST")
     print("="*100)
-    
+
     tests = [
-        ('inputs/sample_input.csv', 'FCFS', None, 'outputs/output_fcfs.csv'),
-        ('inputs/sample_input.csv', 'SJF', None, 'outputs/output_sjf.csv'),
-        ('inputs/sample_input.csv', 'SJF_P', None, 'outputs/output_sjf_preemptive.csv'),
-        ('inputs/sample_input_priority.csv', 'PS', None, 'outputs/output_priority.csv'),
-        ('inputs/sample_input.csv', 'RR', 2, 'outputs/output_rr.csv'),
+        ('inputs/sample_input.csv', 'FCFS', None),
+        ('inputs/sample_input.csv', 'SJF', None),
+        ('inputs/sample_input.csv', 'SJF_P', None),
+        ('inputs/sample_input_priority.csv', 'PS', None),
+        ('inputs/sample_input_priority.csv', 'PS_P', None),
+        ('inputs/sample_input.csv', 'RR', 2),
+        ('inputs/sample_input.csv', 'MLFQ', None),
     ]
-    
-    for input_file, algorithm, quantum, output_file in tests:
+
+    results = run_tests(tests)
+
+    for (input_file, algorithm, quantum), r in zip(tests, results):
         print(f"\n{'='*100}")
         print(f"Testing: {algorithm}" + (f" (quantum={quantum})" if quantum else ""))
         print(f"{'='*100}")
-        
-        stdout, returncode = run_algorithm(input_file, algorithm, quantum)
-        
-        if returncode == 0:
-            print("✓ Algorithm executed successfully")
-            
-            # Read and verify output file
-            rows = read_csv_output(output_file)
-            if rows:
-                print(f"✓ Output file '{output_file}' created with {len(rows)} processes")
-                
-                # Calculate and display averages
-                avg_turnaround = sum(int(row['turnaround_time']) for row in rows) / len(rows)
-                avg_waiting = sum(int(row['waiting_time']) for row in rows) / len(rows)
-                
-                print(f"  Average Turnaround Time: {avg_turnaround:.2f} ms")
-                print(f"  Average Waiting Time: {avg_waiting:.2f} ms")
-            else:
-                print(f"✗ Failed to read output file '{output_file}'")
-        else:
-            print(f"✗ Algorithm failed with return code {returncode}")
-            print(stdout)
-    
+        print("✓ Algorithm executed successfully")
+        print(f"✓ Scheduled {r['processes']} processes from '{input_file}'")
+        print(f"  Average Turnaround Time: {r['avg_turnaround']:.2f} ms")
+        print(f"  Average Waiting Time: {r['avg_waiting']:.2f} ms")
+
     print(f"\n{'='*100}")
     print("COMPARISON SUMMARY")
     print(f"{'='*100}")
     print(f"{'Algorithm':<30} {'Avg Turnaround':<20} {'Avg Waiting':<20}")
     print("-"*100)
-    
-    for input_file, algorithm, quantum, output_file in tests:
-        rows = read_csv_output(output_file)
-        if rows:
-            avg_turnaround = sum(int(row['turnaround_time']) for row in rows) / len(rows)
-            avg_waiting = sum(int(row['waiting_time']) for row in rows) / len(rows)
-            
-            alg_name = algorithm + (f" (q={quantum})" if quantum else "")
-            print(f"{alg_name:<30} {avg_turnaround:<20.2f} {avg_waiting:<20.2f}")
-    
+
+    for r in results:
+        print(f"{r['algorithm']:<30} {r['avg_turnaround']:<20.2f} {r['avg_waiting']:<20.2f}")
+
     print("="*100)
+
+    # Export every result in each format and check that all the processes were written
+    print("\nEXPORT")
+    print("-"*100)
+    with tempfile.TemporaryDirectory() as output_dir:
+        for output_format in FORMATS:
+            exported = run_tests(tests, os.path.join(output_dir, output_format), output_format)
+            for r in exported:
+                rows = count_rows(r['output_file'], output_format)
+                assert rows == r['processes'], f"{r['output_file']}: {rows} rows, expected {r['processes']}"
+            print(f"✓ {output_format:<8} {len(exported)} result files written and verified")
+
+        # Binary workload: the same rows back from the memory-mapped file, and the same schedule
+        workload = load_workload('inputs/sample_input_priority.csv')
+        binary_file = os.path.join(output_dir, 'workload.bin')
+        write_binary_workload(workload, binary_file)
+        loaded = load_workload(binary_file)
+        rows = lambda w: sorted(zip(w.pids, w.arrivals, w.bursts, w.priorities))
+        assert rows(loaded) == rows(workload)
+        for algorithm in ('FCFS', 'PS_P'):
+            assert (sorted(zip(loaded.pids, run_algorithm(loaded, algorithm).completion))
+                    == sorted(zip(workload.pids, run_algorithm(workload, algorithm).completion))), algorithm
+        print(f"✓ binary   workload round trip, {len(loaded)} processes")
+
+        # Invalid UTF-8 is a format error with the line number, in process and burst CSV files
+        for name, content in (('bad.csv', b'pid,arrival_time,burst_time\n1,0,5\n"2",1,\xff3\n'),
+                              ('bad_bursts.csv', b'pid,bursts\n1,3;2;1\n2,"4;\xff"\n')):
+            bad_file = os.path.join(output_dir, name)
+            with open(bad_file, 'wb') as file:
+                file.write(content)
+            try:
+                load_workload(bad_file)
+                raise AssertionError(f"{name}: invalid UTF-8 was accepted")
+            except WorkloadFormatError as e:
+                assert (e.filename, e.line) == (bad_file, 3), str(e)
+        print("✓ invalid UTF-8 reported with its line number")
+
+    # Multi-core runs: utilization and idle time are over every core. Two 4 ms jobs on 2 cores keep both
+    # busy for the whole span; on the default 4 cores half the CPU time is idle.
+    print("\nMULTI-CORE")
+    print("-"*100)
+    pair = Workload([1, 2], [0, 0], [4, 4])
+    two_cores, four_cores = compare_algorithms(pair, [('SMP', {'cores': 2, 'policy': 'FCFS'}), ('SMP', None)])
+    assert two_cores['cpu_utilization'] == 1.0 and two_cores['idle_time'] == 0, two_cores
+    assert four_cores['cpu_utilization'] == 0.5 and four_cores['idle_time'] == 8, four_cores
+    print("✓ SMP utilization and idle time count every core")
+
+    # Aging raises priorities up to the floor and leaves those already past it alone: with every
+    # priority below the floor the schedule is the same as without aging
+    aging = AgingPolicy(interval=2, floor=0)
+    assert (aging.age(3), aging.age(0), aging.age(-3)) == (2, 0, -3)
+    negative = Workload([1, 2, 3], [0, 1, 2], [6, 4, 2], [-1, -3, -2])
+    assert (list(run_priority_preemptive(negative, aging).completion)
+            == list(run_priority_preemptive(negative).completion))
+    print("✓ aging never lowers a priority already past its floor")
+
+    # Real-time task set: EDF passes the utilization test, RM needs the simulation (and misses a deadline)
+    print("\nREAL-TIME")
+    print("-"*100)
+    tasks = load_workload('inputs/realtime_input.csv')
+    for policy in ('EDF', 'RM'):
+        test = schedulability(tasks, policy)
+        analysis = analyze(tasks, policy)
+        if test.verdict == FEASIBLE:
+            assert analysis['method'] == 'utilization'
+        print(f"✓ {policy:<8} {test.verdict} by the utilization test ({test.reason}); "
+              f"{analysis['verdict']} by {analysis['method']}"
+              + (f", {analysis['deadline_misses']}/{analysis['jobs']} deadline misses" if 'jobs' in analysis else ""))
+
+    # Periodic tasks expand to one job per release up to the hyperperiod (24): 6 + 4 + 3 jobs
+    jobs = expand_periodic(tasks)
+    assert len(jobs) == 13 and sorted(jobs.arrivals[:6]) == [0, 4, 8, 12, 16, 20]
+    result = run_edf(tasks)
+    assert len(result) == 13 and result.workload is not tasks and result.stats.deadline_misses == 0
+    print(f"✓ EDF      {len(tasks)} periodic tasks expanded to {len(result)} jobs, no deadline misses")
+
+    # Result cache: one-shot deadline jobs are cached and hit; expanded periodic results are not stored
+    one_shot = Workload([1, 2, 3], [0, 1, 2], [3, 2, 1], deadlines=[10, 4, 3])
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = ResultCache(cache_dir)
+        first = cache.run(one_shot, 'EDF', {}, lambda: run_edf(one_shot))
+        second = cache.run(one_shot, 'EDF', {}, lambda: run_edf(one_shot))
+        assert (cache.misses, cache.hits) == (1, 1)
+        assert list(second.completion) == list(first.completion) and second.stats == first.stats
+        cache.run(tasks, 'EDF', {}, lambda: run_edf(tasks))
+        cache.run(tasks, 'EDF', {}, lambda: run_edf(tasks))
+        assert (cache.misses, cache.hits) == (3, 1) and len(os.listdir(cache_dir)) == 1
+    print("✓ EDF      result cache: one-shot jobs miss then hit, periodic results are not stored")
+
+    # CPU/I-O bursts: every CPU discipline on the same burst sequences; CPU time is conserved
+    print("\nCPU/I-O BURSTS")
+    print("-"*100)
+
+    # With a single CPU burst per process the simulator schedules exactly like each engine
+    for input_file in ('inputs/sample_input.csv', 'inputs/sample_input_priority.csv'):
+        workload = load_workload(input_file)
+        for policy in DISCIPLINES:
+            params = {'quantum': 2} if policy == 'RR' else {}
+            expected = run_algorithm(workload, policy, params)
+            result = run_io(workload, policy, params)
+            assert list(result.start) == list(expected.start), (input_file, policy)
+            assert list(result.completion) == list(expected.completion), (input_file, policy)
+    print(f"✓ single bursts match the {len(DISCIPLINES)} single-burst engines")
+
+    # Hand-computed schedule. P1 = 3 CPU, 4 I/O, 2 CPU; P2 = 2 CPU, 2 I/O, 1 CPU, both on device 0; P3 = 4 CPU.
+    # FCFS: P1 0-3, P2 3-5, P3 5-9; P1 on the device 3-7, P2 waits for it and does 7-9; P1 9-11, P2 11-12.
+    # RR q=2: P1 0-2, P2 2-4 (to I/O 4-6), P3 4-6, P1 6-7 (to I/O 7-11), P2 7-8, P3 8-10, P1 11-13.
+    hand = Workload.from_processes([Process(1, 0, 0, burst_sequence=[3, 4, 2]),
+                                    Process(2, 1, 0, burst_sequence=[2, 2, 1]),
+                                    Process(3, 2, 4)])
+    for policy, params, completion in (('FCFS', None, [11, 12, 9]), ('RR', {'quantum': 2}, [13, 8, 10])):
+        result = run_io(hand, policy, params)
+        assert list(result.completion) == completion, (policy, list(result.completion))
+    print("✓ FCFS and RR multi-burst schedules match the hand-computed completion times")
+
+    bursty = load_workload('inputs/io_input.csv')
+    for policy in DISCIPLINES:
+        result = run_io(bursty, policy, {'quantum': 2} if policy == 'RR' else None)
+        report = io_report(result)
+        assert result.stats.cpu_busy == sum(bursty.bursts)
+        print(f"✓ {policy:<8} Avg Turnaround: {sum(result.turnaround) / len(result):>7.2f}  "
+              f"Avg Response: {report['avg_response']:>6.2f}  CPU Utilization: {report['cpu_utilization'] * 100:.1f}%")
+
+    # compare and batch run burst workloads on the I/O simulator too, with the same numbers
+    specs = ['FCFS', 'RR q=2', 'SJF_P', 'PS_P']
+    compared = compare_algorithms(bursty, [parse_spec(spec)[1:] for spec in specs])
+    batched = [row for _, rows, error in run_batch(['inputs/io_input.csv'], [parse_spec(spec) for spec in specs])
+               for row in rows]
+    for spec, metrics in zip(specs, compared):
+        _, policy, params = parse_spec(spec)
+        expected = sum(run_io(bursty, policy, params).turnaround) / len(bursty)
+        row = next(row for row in batched if row['algorithm'] == spec)
+        assert metrics['avg_turnaround'] == row['avg_turnaround'] == expected, spec
+    print(f"✓ compare and batch match the I/O simulator on {len(specs)} disciplines")
+
+    # The default batch runs only the CPU disciplines on a burst file, without failing the others
+    (_, rows, error), = run_batch(['inputs/io_input.csv'], default_specs())
+    assert error is None, error
+    assert [row['algorithm'] for row in rows] == [spec for spec, algorithm, _ in default_specs()
+                                                  if algorithm in DISCIPLINES]
+    print(f"✓ default batch specs run {len(rows)} CPU disciplines on a burst workload")
+
     print("\n✓ All tests completed successfully!")
-    print("\nGenerated output files:")
-    for _, _, _, output_file in tests:
-        if os.path.exists(output_file):
-            print(f"  - {output_file}")
+
+
+# Function to count the processes in an exported results file
+def count_rows(filename, output_format):
+    if output_format == 'binary':
+        return len(load_binary_result(filename))
+    with open(filename) as file:
+        rows = sum(1 for line in file if line.strip())
+    return rows - 1 if output_format == 'csv' else rows
 
 if __name__ == "__main__":
     main()